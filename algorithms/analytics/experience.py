@@ -0,0 +1,109 @@
+"""Claims experience analytics: loss ratios of rated policies by rating factor."""
+
+import os
+import polars as pl
+from typing import List, Optional, Union
+
+from algorithms.config import get_primary_id
+from algorithms.pipeline.utils import get_data_directory
+from algorithms.rating.rating_engine import RATING_PLAN
+
+
+# Claim columns used by the experience analytics
+CLAIM_COUNT_COLUMN = "ClaimNb"
+CLAIM_AMOUNT_COLUMN = "ClaimAmount"
+
+
+def get_claims_path() -> str:
+    """
+    Get the path to the claims data shipped with the project.
+    
+    Returns:
+        Path to algorithms/data/additional/claims.parquet
+    """
+    return os.path.join(get_data_directory("additional"), "claims.parquet")
+
+
+def scan_claims(claims_path: Optional[str] = None) -> pl.LazyFrame:
+    """
+    Lazily scan claims data from a Parquet file, glob or partitioned directory.
+    
+    A directory is scanned recursively with Hive partitioning, so filters on the
+    partition columns (for example a year=2024 directory) skip whole partitions.
+    
+    Args:
+        claims_path: Parquet file, glob or directory (default: the project claims file)
+        
+    Returns:
+        LazyFrame over the claims data
+    """
+    claims_path = claims_path or get_claims_path()
+    if os.path.isdir(claims_path):
+        return pl.scan_parquet(os.path.join(claims_path, "**", "*.parquet"), hive_partitioning=True)
+    return pl.scan_parquet(claims_path)
+
+
+def experience_by(
+    rated: Union[pl.DataFrame, pl.LazyFrame],
+    by: List[str],
+    claims: Optional[Union[pl.DataFrame, pl.LazyFrame]] = None,
+    claims_path: Optional[str] = None,
+    claims_filter: Optional[pl.Expr] = None,
+    premium_column: Optional[str] = None
+) -> pl.DataFrame:
+    """
+    Compare rated premium with claims for each combination of rating factors.
+    
+    The query is lazy: only the ID, claim and requested columns are read from the
+    claims and policies, and claims_filter is pushed down into the claims scan.
+    Claims are summed per policy before the join, so a policy may have several
+    claim rows.
+    
+    Args:
+        rated: Rated policies
+        by: Columns to group by (for example ["Area", "DrivAgeBand"]); empty for a total
+        claims: Claims data (default: scan claims_path)
+        claims_path: Parquet file, glob or partitioned directory of claims
+                     (default: the project claims file)
+        claims_filter: Optional filter on the claims, such as a date or partition range
+        premium_column: Premium column to compare (default: the final premium of the rating plan)
+        
+    Returns:
+        DataFrame with one row per combination of the by columns and the policies,
+        premium, claim_count, claim_amount, frequency and loss_ratio columns
+    """
+    primary_id = get_primary_id()
+    premium_column = premium_column or RATING_PLAN[-1]["premium_column"]
+    
+    # Claims per policy, reading only the columns needed
+    claims_lf = claims.lazy() if claims is not None else scan_claims(claims_path)
+    if claims_filter is not None:
+        claims_lf = claims_lf.filter(claims_filter)
+    claims_per_policy = (
+        claims_lf
+        .group_by(primary_id)
+        .agg(
+            pl.col(CLAIM_COUNT_COLUMN).cast(pl.Int64).sum().alias("claim_count"),
+            pl.col(CLAIM_AMOUNT_COLUMN).sum().alias("claim_amount"),
+        )
+    )
+    
+    # Join to the policies and aggregate by the rating factors
+    policies = rated.lazy().select([primary_id, premium_column] + list(by))
+    aggregations = [
+        pl.len().alias("policies"),
+        pl.col(premium_column).sum().alias("premium"),
+        pl.col("claim_count").fill_null(0).sum().alias("claim_count"),
+        pl.col("claim_amount").fill_null(0).sum().alias("claim_amount"),
+    ]
+    joined = policies.join(claims_per_policy, on=primary_id, how="left")
+    experience = joined.group_by(by).agg(aggregations).sort(by, nulls_last=True) if by else joined.select(aggregations)
+    
+    return (
+        experience
+        .with_columns(
+            (pl.col("claim_count") / pl.col("policies")).alias("frequency"),
+            (pl.col("claim_amount") / pl.col("premium")).alias("loss_ratio"),
+        )
+        .collect()
+    )
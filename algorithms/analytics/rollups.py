@@ -0,0 +1,428 @@
+"""Premium rollups: a cube of premium aggregates over the rating factors of a rated book."""
+
+import os
+import json
+import time
+import uuid
+import threading
+import polars as pl
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from algorithms.pipeline.utils import load_transformation_configs, build_filter_expression, Filters
+from algorithms.rating.rating_engine import RATING_PLAN
+
+
+# Environment variable with the path of the cube served by the API and the Streamlit app
+ROLLUP_PATH_ENV = "PYPRICER_ROLLUP_PATH"
+
+# Key of the cube's manifest in the Parquet file metadata
+MANIFEST_KEY = b"pypricer.rollup"
+
+# Measures stored per cell; all of them can be merged across cells and runs
+MEASURE_COLUMNS = ["policies", "premium", "premium_squares", "premium_min", "premium_max"]
+
+# Cubes of the API and Streamlit app, reloaded when the file changes
+_ROLLUP_CACHE: Dict[str, Tuple[Tuple[int, int], pl.DataFrame]] = {}
+_ROLLUP_CACHE_LOCK = threading.Lock()
+
+
+def get_rollup_path() -> Optional[str]:
+    """
+    Get the path of the configured cube.
+    
+    Returns:
+        Value of PYPRICER_ROLLUP_PATH, or None if it is not set
+    """
+    return os.environ.get(ROLLUP_PATH_ENV) or None
+
+
+def get_rollup_dimensions(config_dir: Optional[str] = None) -> Dict[str, List[str]]:
+    """
+    Get the rating-factor dimensions of the cube and their levels.
+    
+    The dimensions are the band columns of continuous-banding.json and the
+    categorical columns of category-index.json.
+    
+    Args:
+        config_dir: Directory containing configuration files (default: algorithms/pipeline)
+    
+    Returns:
+        Dictionary mapping each dimension to its levels, in configuration order
+    """
+    category_config, banding_config = load_transformation_configs(config_dir)
+    
+    dimensions = {}
+    for column, config in banding_config.items():
+        dimensions[config.get("column_name", f"{column}Band")] = [band["label"] for band in config.get("bands", [])]
+    for column, mapping in category_config.items():
+        dimensions[column] = list(mapping)
+    return dimensions
+
+
+def _row_aggregations(premium_column: str) -> List[pl.Expr]:
+    """
+    Measures of a cell, from rated rows.
+    """
+    premium = pl.col(premium_column).cast(pl.Float64)
+    return [
+        pl.len().cast(pl.Int64).alias("policies"),
+        premium.sum().alias("premium"),
+        (premium * premium).sum().alias("premium_squares"),
+        premium.min().alias("premium_min"),
+        premium.max().alias("premium_max"),
+    ]
+
+
+def _merge_aggregations() -> List[pl.Expr]:
+    """
+    Measures of a group of cells, from the measures of the cells.
+    """
+    return [
+        pl.col("policies").sum(),
+        pl.col("premium").sum(),
+        pl.col("premium_squares").sum(),
+        pl.col("premium_min").min(),
+        pl.col("premium_max").max(),
+    ]
+
+
+def build_rollup(
+    rated: Union[pl.DataFrame, pl.LazyFrame],
+    premium_column: Optional[str] = None,
+    config_dir: Optional[str] = None
+) -> pl.DataFrame:
+    """
+    Aggregate rated policies to the finest grain of the rating factors.
+    
+    Each row of the cube is one combination of rating-factor levels that occurs in
+    the book, with its policy count and premium sum, sum of squares, minimum and
+    maximum. Dimensions are stored as enums of their configured levels (followed by
+    any unconfigured levels in the data), so a cell takes a few bytes per dimension.
+    Rating factors missing from the rated data are left out of the cube.
+    
+    Args:
+        rated: Rated policies
+        premium_column: Premium column to aggregate (default: the final premium of the rating plan)
+        config_dir: Directory containing configuration files (default: algorithms/pipeline)
+    
+    Returns:
+        Cube DataFrame, sorted by the dimensions
+    """
+    premium_column = premium_column or RATING_PLAN[-1]["premium_column"]
+    rated_lf = rated.lazy()
+    available = rated_lf.collect_schema().names()
+    
+    levels = get_rollup_dimensions(config_dir)
+    dimensions = [dimension for dimension in levels if dimension in available]
+    
+    # Group the raw rows first, so only the cells are cast to enums
+    cube = rated_lf.group_by(dimensions).agg(_row_aggregations(premium_column)).collect()
+    cube = cube.with_columns([
+        pl.col(dimension).cast(pl.String).cast(pl.Enum(_add_levels(levels[dimension], cube[dimension])))
+        for dimension in dimensions
+    ])
+    return cube.sort(_cell_key(cube.schema, dimensions))
+
+
+def _add_levels(levels: List[str], values: pl.Series) -> List[str]:
+    """
+    Append the values that are not configured levels (such as unknown categories,
+    which the pipeline gives a null index) to the levels of a dimension.
+    """
+    known = set(levels)
+    return levels + sorted(value for value in values.drop_nulls().unique().cast(pl.String).to_list() if value not in known)
+
+
+def merge_rollups(cubes: Sequence[pl.DataFrame]) -> pl.DataFrame:
+    """
+    Merge cubes of disjoint sets of policies into one cube.
+    
+    Args:
+        cubes: Cubes with the same dimensions
+    
+    Returns:
+        Cube DataFrame, sorted by the dimensions
+    """
+    dimensions = get_cube_dimensions(cubes[0])
+    
+    # Bring the cubes to the same levels before stacking them
+    levels = {dimension: cubes[0][dimension].dtype.categories.to_list() for dimension in dimensions}
+    for cube in cubes[1:]:
+        for dimension in dimensions:
+            levels[dimension] = _add_levels(levels[dimension], cube[dimension])
+    cubes = [
+        cube.with_columns([
+            pl.col(dimension).cast(pl.String).cast(pl.Enum(levels[dimension]))
+            for dimension in dimensions
+            if cube[dimension].dtype.categories.to_list() != levels[dimension]
+        ])
+        for cube in cubes
+    ]
+    
+    return _aggregate_cells(pl.concat(cubes).lazy(), dimensions, _merge_aggregations())
+
+
+def _cell_key(schema: pl.Schema, dimensions: List[str]) -> pl.Expr:
+    """
+    Pack the enum codes of a cell's levels into one integer, the first dimension most
+    significant, so cells can be grouped and sorted by one column instead of many.
+    """
+    cell_key = pl.lit(0, dtype=pl.UInt64)
+    for dimension in dimensions:
+        size = len(schema[dimension].categories) + 1
+        cell_key = cell_key * size + pl.col(dimension).to_physical().cast(pl.UInt64).fill_null(size - 1)
+    return cell_key
+
+
+def _aggregate_cells(cells: pl.LazyFrame, dimensions: List[str], aggregations: List[pl.Expr]) -> pl.DataFrame:
+    """
+    Aggregate cube rows to one row per cell, sorted by the dimensions.
+    """
+    return (
+        cells
+        .with_columns(_cell_key(cells.collect_schema(), dimensions).alias("_cell"))
+        .group_by("_cell")
+        .agg([pl.col(dimensions).first()] + aggregations)
+        .sort("_cell")
+        .drop("_cell")
+        .collect()
+    )
+
+
+def get_cube_dimensions(cube: pl.DataFrame) -> List[str]:
+    """
+    Get the dimension columns of a cube.
+    """
+    return [column for column in cube.columns if column not in MEASURE_COLUMNS]
+
+
+def query_rollup(
+    cube: pl.DataFrame,
+    by: Sequence[str] = (),
+    filters: Optional[Filters] = None
+) -> pl.DataFrame:
+    """
+    Answer a slice-and-dice query from a cube.
+    
+    Args:
+        cube: Cube from build_rollup or load_rollup
+        by: Dimensions to group by (for example ["Area", "DrivAgeBand"]); empty for a total
+        filters: Expression, or dictionary mapping dimensions to a level or a list of
+                 levels (e.g. {"Region": "Centre"})
+    
+    Returns:
+        DataFrame with one row per combination of the by dimensions and the policies,
+        premium, average_premium, premium_std, premium_min and premium_max columns
+    
+    Raises:
+        ValueError: If a by or filter column is not a dimension of the cube
+    """
+    dimensions = get_cube_dimensions(cube)
+    unknown = [column for column in list(by) + list(filters if isinstance(filters, dict) else []) if column not in dimensions]
+    if unknown:
+        raise ValueError(f"Unknown rollup dimensions {unknown} (use {', '.join(dimensions)})")
+    
+    cells = cube.lazy()
+    predicate = build_filter_expression(filters)
+    if predicate is not None:
+        cells = cells.filter(predicate)
+    
+    by = list(by)
+    result = cells.group_by(by).agg(_merge_aggregations()).sort(by) if by else cells.select(_merge_aggregations())
+    average = pl.col("premium") / pl.col("policies")
+    
+    return (
+        result
+        .with_columns(
+            pl.col("policies").fill_null(0),
+            pl.col("premium").fill_null(0.0),
+            average.alias("average_premium"),
+            (pl.col("premium_squares") / pl.col("policies") - average * average).clip(lower_bound=0).sqrt().alias("premium_std"),
+        )
+        .select(by + ["policies", "premium", "average_premium", "premium_std", "premium_min", "premium_max"])
+        .collect()
+    )
+
+
+def _list_source_files(rated_path: str) -> Dict[str, Tuple[int, int]]:
+    """
+    List the files of a rated output with their size and modification time.
+    
+    Hidden files and directories, such as the writer's staging directories, are skipped.
+    """
+    if os.path.isfile(rated_path):
+        stat = os.stat(rated_path)
+        return {os.path.basename(rated_path): (stat.st_size, stat.st_mtime_ns)}
+    
+    files = {}
+    for root, directories, names in os.walk(rated_path):
+        directories[:] = sorted(directory for directory in directories if not directory.startswith("."))
+        for name in sorted(names):
+            if name.endswith(".parquet") and not name.startswith("."):
+                stat = os.stat(os.path.join(root, name))
+                files[os.path.relpath(os.path.join(root, name), rated_path)] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def _scan_rated(rated_path: str, files: List[str]) -> pl.LazyFrame:
+    """
+    Scan some files of a rated output, with the partition columns of a dataset.
+    """
+    if os.path.isfile(rated_path):
+        if os.path.splitext(rated_path)[1].lower() in (".ndjson", ".jsonl"):
+            return pl.scan_ndjson(rated_path)
+        return pl.scan_parquet(rated_path)
+    return pl.scan_parquet([os.path.join(rated_path, file) for file in files], hive_partitioning=True)
+
+
+def read_rollup_manifest(cube_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the manifest stored in a cube file.
+    
+    Args:
+        cube_path: Cube Parquet file
+    
+    Returns:
+        Manifest with the "source", "premium_column" and "files" of the cube, or
+        None if the file does not exist or has no manifest
+    """
+    import pyarrow.parquet as pq
+    
+    if not os.path.isfile(cube_path):
+        return None
+    metadata = pq.read_schema(cube_path).metadata or {}
+    if MANIFEST_KEY not in metadata:
+        return None
+    return json.loads(metadata[MANIFEST_KEY])
+
+
+def write_rollup(cube: pl.DataFrame, cube_path: str, manifest: Dict[str, Any]) -> int:
+    """
+    Write a cube and its manifest to a Parquet file, atomically.
+    
+    Args:
+        cube: Cube DataFrame
+        cube_path: Cube Parquet file
+        manifest: Manifest stored in the file metadata
+    
+    Returns:
+        Size of the cube file in bytes
+    """
+    import pyarrow.parquet as pq
+    
+    table = cube.to_arrow()
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), MANIFEST_KEY: json.dumps(manifest).encode()})
+    
+    directory = os.path.dirname(os.path.abspath(cube_path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f".{os.path.basename(cube_path)}.tmp-{uuid.uuid4().hex[:12]}")
+    try:
+        pq.write_table(table, temp_path, compression="zstd")
+        os.replace(temp_path, cube_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return os.path.getsize(cube_path)
+
+
+def update_rollup(
+    cube_path: str,
+    rated_path: str,
+    premium_column: Optional[str] = None,
+    rebuild: bool = False,
+    config_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Bring the cube of a rated output up to date.
+    
+    The cube's manifest records the rated files it was built from. Files appended
+    since (for example by pypricer-rate --append) are aggregated on their own and
+    merged into the cube; if any recorded file changed or disappeared (the output
+    was overwritten), or the dimensions or premium column changed, the cube is
+    rebuilt from the whole output.
+    
+    Args:
+        cube_path: Cube Parquet file
+        rated_path: Rated Parquet or NDJSON file, or Parquet dataset directory
+        premium_column: Premium column to aggregate (default: the final premium of the rating plan)
+        rebuild: Rebuild the cube even if it could be updated incrementally
+        config_dir: Directory containing configuration files (default: algorithms/pipeline)
+    
+    Returns:
+        Dictionary with the "files_added", the cube "cells" and "policies", whether
+        the cube was "rebuilt", its "bytes" and the elapsed "seconds"
+    
+    Raises:
+        FileNotFoundError: If the rated output does not exist
+    """
+    if not os.path.exists(rated_path):
+        raise FileNotFoundError(f"Rated output not found: {rated_path}")
+    
+    start = time.perf_counter()
+    premium_column = premium_column or RATING_PLAN[-1]["premium_column"]
+    files = _list_source_files(rated_path)
+    dimensions = list(get_rollup_dimensions(config_dir))
+    
+    # Check whether the existing cube covers a prefix of the same output
+    manifest = None if rebuild else read_rollup_manifest(cube_path)
+    if manifest is not None:
+        recorded = {file: tuple(signature) for file, signature in manifest["files"].items()}
+        same_cube = (
+            manifest["source"] == os.path.abspath(rated_path)
+            and manifest["premium_column"] == premium_column
+            and manifest["dimensions"] == dimensions
+        )
+        if not same_cube or any(files.get(file) != signature for file, signature in recorded.items()):
+            manifest = None
+    
+    # Aggregate the new files, or everything when rebuilding
+    new_files = [file for file in files if manifest is None or file not in manifest["files"]]
+    if manifest is None:
+        cube = build_rollup(_scan_rated(rated_path, new_files), premium_column, config_dir) if files else None
+    elif new_files:
+        cube = merge_rollups([pl.read_parquet(cube_path), build_rollup(_scan_rated(rated_path, new_files), premium_column, config_dir)])
+    else:
+        cube = pl.read_parquet(cube_path)
+    
+    stats = {"files_added": len(new_files), "rebuilt": manifest is None, "cells": 0, "policies": 0, "bytes": 0}
+    if cube is not None:
+        if manifest is None or new_files:
+            stats["bytes"] = write_rollup(cube, cube_path, {
+                "source": os.path.abspath(rated_path),
+                "premium_column": premium_column,
+                "dimensions": dimensions,
+                "files": files,
+            })
+        else:
+            stats["bytes"] = os.path.getsize(cube_path)
+        stats["cells"] = cube.height
+        stats["policies"] = int(cube["policies"].sum())
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def load_rollup(cube_path: str) -> pl.DataFrame:
+    """
+    Load a cube, reusing the loaded copy until the file changes.
+    
+    Args:
+        cube_path: Cube Parquet file
+    
+    Returns:
+        Cube DataFrame
+    
+    Raises:
+        FileNotFoundError: If the cube file does not exist
+    """
+    stat = os.stat(cube_path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    
+    with _ROLLUP_CACHE_LOCK:
+        entry = _ROLLUP_CACHE.get(cube_path)
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+    
+    cube = pl.read_parquet(cube_path)
+    with _ROLLUP_CACHE_LOCK:
+        _ROLLUP_CACHE[cube_path] = (signature, cube)
+    return cube
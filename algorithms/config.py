@@ -17,4 +17,23 @@ def get_primary_id():
     Returns:
         String containing the primary ID field name
     """
-    return DATA_CONFIG["primary_id"] 
\ No newline at end of file
+    return DATA_CONFIG["primary_id"]
+
+# Rating configuration
+RATING_CONFIG = {
+    # Precompute the premium for every cell of the rating space and answer single
+    # quotes from the lookup cube (falls back to the rating engine when needed).
+    # Cube lookups skip the pipeline, so the cube is only used when TRANSFORM_INPUTS
+    # in additional_transforms.py is declared and lists no rating input, and no
+    # custom stage may change one.
+    "precompute_cube": False
+}
+
+def get_rating_config():
+    """
+    Get the rating configuration.
+    
+    Returns:
+        Dictionary containing the rating configuration
+    """
+    return RATING_CONFIG
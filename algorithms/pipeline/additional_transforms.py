@@ -1,8 +1,23 @@
 import polars as pl
 
+from algorithms.pipeline.stages import register_stage
+
+# Raw columns read by transform_data. Loaders read only the columns the pipeline
+# declares, so list every column transform_data reads here when you edit it. Set
+# it to None if transform_data may read any column: loaders then read every column
+# and the pipeline runs every stage.
+TRANSFORM_INPUTS = []
+
 
 def transform_data(df: pl.DataFrame) -> pl.DataFrame:
 
 
     return df
 
+
+# Derived features can also be added as registered stages. Declaring the input
+# and output columns lets the pipeline skip, cache and time each stage, e.g.:
+#
+# @register_stage("vehicle_age_squared", inputs=["VehAge"], outputs=["VehAgeSquared"])
+# def add_vehicle_age_squared(df: pl.DataFrame) -> pl.DataFrame:
+#     return df.with_columns((pl.col("VehAge") ** 2).alias("VehAgeSquared"))
@@ -7,36 +7,121 @@ from JSON files and custom transformation functions.
 
 import os
 import polars as pl
-from typing import Optional
+from typing import List, Optional
 
-from algorithms.pipeline.utils import (
-    load_transformation_configs,
-    apply_category_mapping,
-    apply_continuous_banding
-)
-from algorithms.pipeline.additional_transforms import transform_data
+from algorithms.pipeline.utils import load_transformation_configs
+from algorithms.config import get_primary_id
+from algorithms.pipeline.stages import get_pipeline_stages, select_stages, run_stages
+from algorithms.pipeline.profiling import profile_to
+from algorithms.pipeline.additional_transforms import transform_data, TRANSFORM_INPUTS
+from algorithms.rating.rating_engine import get_rating_key_columns
 
-def process_data(df: pl.DataFrame, config_dir: Optional[str] = None) -> pl.DataFrame:
+def process_data(
+    df: pl.DataFrame,
+    config_dir: Optional[str] = None,
+    track_allocations: Optional[bool] = None,
+    required_columns: Optional[List[str]] = None,
+    use_cache: bool = False,
+    profile: Optional[str] = None
+) -> pl.DataFrame:
     """
     Process data by applying all transformations.
     
+    The stages are, in order: the transform_data hook and custom stages from
+    additional_transforms.py, continuous banding, then category mapping.
+    
     Args:
         df: Input DataFrame
         config_dir: Directory containing configuration files (default: algorithms/pipeline)
+        track_allocations: Report how many bytes each stage allocates, as the
+                           "stage_allocations" metric and on stdout. Defaults to
+                           the PYPRICER_TRACK_ALLOCATIONS environment variable.
+        required_columns: Only run the stages needed to produce these columns
+                          (default: run all stages)
+        use_cache: Reuse stage outputs cached by a hash of the stage inputs, for
+                   repeated runs over the same data
+        profile: Write a sampling profile of the run to this file (.json for
+                 speedscope, .folded for flame graphs); see pipeline/profiling.py
         
     Returns:
         Processed DataFrame with all transformations applied
     """
+    if track_allocations is None:
+        track_allocations = os.environ.get("PYPRICER_TRACK_ALLOCATIONS", "") not in ("", "0")
+    
     # Load configuration files
     category_config, banding_config = load_transformation_configs(config_dir)
     
-    # 1. Apply custom transformations from additional_transforms.py
-    df = transform_data(df)
+    # Build the stages and run the ones needed for the required columns
+    stages = get_pipeline_stages(
+        category_config,
+        banding_config,
+        transform_hook=transform_data,
+        transform_inputs=TRANSFORM_INPUTS
+    )
+    with profile_to(profile):
+        return run_stages(
+            df,
+            stages,
+            required_columns=required_columns,
+            use_cache=use_cache,
+            track_allocations=track_allocations
+        )
+
+def get_rating_columns(config_dir: Optional[str] = None) -> List[str]:
+    """
+    Get the pipeline columns rated outputs need.
+    
+    These are the join columns of the rating plan plus the band column of every
+    banded variable, which rated datasets keep for rollups and reporting. Category
+    index columns are not used by the rating plan, so category mapping is skipped.
+    
+    Args:
+        config_dir: Directory containing configuration files (default: algorithms/pipeline)
+        
+    Returns:
+        List of the columns to pass as required_columns to process_data
+    """
+    _, banding_config = load_transformation_configs(config_dir)
+    columns = get_rating_key_columns()
+    for column, config in banding_config.items():
+        band_column = config.get("column_name", f"{column}Band")
+        if band_column not in columns:
+            columns.append(band_column)
+    return columns
+
+def get_input_columns(
+    config_dir: Optional[str] = None,
+    required_columns: Optional[List[str]] = None
+) -> Optional[List[str]]:
+    """
+    Get the raw columns the pipeline reads, so loaders can read only those.
+    
+    Columns produced by an earlier stage are not raw inputs and are left out.
     
-    # 2. Apply continuous banding
-    df = apply_continuous_banding(df, banding_config)
+    Args:
+        config_dir: Directory containing configuration files (default: algorithms/pipeline)
+        required_columns: Only count the stages needed to produce these columns
+                          (default: all stages)
+        
+    Returns:
+        The primary ID followed by the input columns of the stages, or None if a
+        stage may read any column
+    """
+    category_config, banding_config = load_transformation_configs(config_dir)
+    stages = get_pipeline_stages(
+        category_config,
+        banding_config,
+        transform_hook=transform_data,
+        transform_inputs=TRANSFORM_INPUTS
+    )
     
-    # 3. Apply category mapping
-    df = apply_category_mapping(df, category_config)
+    columns = [get_primary_id()]
+    produced = set()
+    for stage in select_stages(stages, required_columns):
+        if stage["inputs"] is None:
+            return None
+        columns.extend(column for column in stage["inputs"] if column not in produced and column not in columns)
+        produced.update(stage["outputs"] or [])
     
-    return df 
\ No newline at end of file
+    return columns
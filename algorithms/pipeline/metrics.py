@@ -0,0 +1,52 @@
+"""
+Metrics hooks for the data processing pipeline.
+
+This module lets callers register functions that receive pipeline metrics, such as
+the number of unseen category levels per column. Metrics that cost anything to
+compute are only computed while at least one hook is registered.
+"""
+
+from typing import Any, Callable, Dict, List
+
+# Registered hooks, called with the metric name and a dictionary of values
+_METRICS_HOOKS: List[Callable[[str, Dict[str, Any]], None]] = []
+
+def register_metrics_hook(hook: Callable[[str, Dict[str, Any]], None]) -> None:
+    """
+    Register a function to receive pipeline metrics.
+    
+    Args:
+        hook: Function called with the metric name and a dictionary of values
+    """
+    if hook not in _METRICS_HOOKS:
+        _METRICS_HOOKS.append(hook)
+
+def unregister_metrics_hook(hook: Callable[[str, Dict[str, Any]], None]) -> None:
+    """
+    Unregister a previously registered metrics hook.
+    
+    Args:
+        hook: Function passed to register_metrics_hook
+    """
+    if hook in _METRICS_HOOKS:
+        _METRICS_HOOKS.remove(hook)
+
+def has_metrics_hooks() -> bool:
+    """
+    Check whether any metrics hook is registered.
+    
+    Returns:
+        True if metrics should be computed and emitted
+    """
+    return bool(_METRICS_HOOKS)
+
+def emit_metric(name: str, values: Dict[str, Any]) -> None:
+    """
+    Send a metric to all registered hooks.
+    
+    Args:
+        name: Name of the metric (for example "unknown_category_levels")
+        values: Dictionary of metric values
+    """
+    for hook in list(_METRICS_HOOKS):
+        hook(name, values)
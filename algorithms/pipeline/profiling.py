@@ -0,0 +1,270 @@
+"""
+Sampling profiler for the pricing pipeline, the batch rating command and the API.
+
+A background thread samples the Python stacks of every other thread at a fixed
+interval (sys._current_frames(), the same approach as py-spy, without a native
+dependency) and counts identical stacks. Work done inside Polars, pydantic or json
+is attributed to the Python frames that called it, so a profile shows which of
+them, or the event loop, the time goes to. Profiles are written in speedscope's
+JSON format (open them at https://www.speedscope.app) or as folded stacks for
+flamegraph.pl.
+
+Nothing runs unless a profiler is started: there is no tracing hook and no
+sampling thread, so leaving profiling compiled in costs nothing.
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Default sampling interval: 100 samples per second per thread
+DEFAULT_INTERVAL = 0.01
+
+# Profile formats, by file extension
+PROFILE_FORMATS = {".json": "speedscope", ".folded": "folded", ".txt": "folded"}
+
+# Functions that threads block in while they wait for work; samples ending in
+# them are idle time and are left out unless idle samples are requested
+IDLE_FUNCTIONS = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("thread.py", "_worker"),
+    ("socket.py", "accept"),
+}
+
+# Frame of a stack: function name, file and first line
+Frame = Tuple[str, str, int]
+
+
+class SamplingProfiler:
+    """
+    Sample the stacks of all other threads of the process.
+    
+        with SamplingProfiler() as profiler:
+            rate_file("quotes.ndjson", "rated.parquet")
+        profiler.write("profile.json")
+    
+    Samples are aggregated in memory as counts per distinct stack, so memory use
+    depends on the variety of the stacks, not on the duration.
+    """
+    
+    def __init__(self, interval: float = DEFAULT_INTERVAL, idle: bool = False):
+        """
+        Initialize the profiler.
+        
+        Args:
+            interval: Seconds between samples
+            idle: Keep samples of threads that are waiting for work
+        """
+        self.interval = interval
+        self.idle = idle
+        self.samples = 0
+        self.duration = 0.0
+        self._counts: Dict[Tuple[str, Tuple[Frame, ...]], int] = {}
+        self._frames: Dict[Any, Frame] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started = 0.0
+    
+    def __enter__(self) -> "SamplingProfiler":
+        self.start()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+    
+    def start(self) -> None:
+        """
+        Start sampling in a background thread.
+        """
+        if self._thread is not None:
+            raise RuntimeError("Profiler is already running")
+        self._stop.clear()
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="pypricer-profiler", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """
+        Stop sampling and wait for the sampling thread to finish.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.duration += time.perf_counter() - self._started
+    
+    def _run(self) -> None:
+        """
+        Take a sample every interval until stopped.
+        """
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = self._stack(frame)
+                if not self.idle and stack and _is_idle(stack[-1]):
+                    continue
+                key = (names.get(thread_id, str(thread_id)), stack)
+                self._counts[key] = self._counts.get(key, 0) + 1
+            self.samples += 1
+    
+    def _stack(self, frame: Any) -> Tuple[Frame, ...]:
+        """
+        Get the stack of a frame, outermost call first.
+        """
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            entry = self._frames.get(code)
+            if entry is None:
+                # co_qualname (Python 3.11+) includes the class of methods
+                name = getattr(code, "co_qualname", code.co_name)
+                entry = self._frames[code] = (name, _short_path(code.co_filename), code.co_firstlineno)
+            stack.append(entry)
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+    
+    def get_stacks(self) -> List[Tuple[str, Tuple[Frame, ...], int]]:
+        """
+        Get the sampled stacks.
+        
+        Returns:
+            List of (thread name, stack, sample count), most sampled first
+        """
+        return sorted(((thread, stack, count) for (thread, stack), count in self._counts.items()), key=lambda item: -item[2])
+    
+    def to_folded(self) -> str:
+        """
+        Render the samples as folded stacks ("thread;outer;...;inner count" lines),
+        the input format of flamegraph.pl and most flame graph viewers.
+        """
+        lines = []
+        for thread, stack, count in self.get_stacks():
+            frames = [thread] + [f"{name} ({path}:{line})" for name, path, line in stack]
+            lines.append(f"{';'.join(frame.replace(';', ':') for frame in frames)} {count}")
+        return "\n".join(lines) + "\n"
+    
+    def to_speedscope(self, name: str = "py-pricer") -> Dict[str, Any]:
+        """
+        Render the samples as a speedscope profile, one sampled profile per thread.
+        """
+        frame_index: Dict[Frame, int] = {}
+        profiles: Dict[str, Dict[str, Any]] = {}
+        
+        for thread, stack, count in self.get_stacks():
+            profile = profiles.setdefault(thread, {
+                "type": "sampled",
+                "name": thread,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": self.duration,
+                "samples": [],
+                "weights": [],
+            })
+            profile["samples"].append([frame_index.setdefault(frame, len(frame_index)) for frame in stack])
+            profile["weights"].append(count * self.interval)
+        
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": [{"name": function, "file": path, "line": line} for function, path, line in frame_index]},
+            "profiles": list(profiles.values()),
+            "name": name,
+            "exporter": "py-pricer",
+        }
+    
+    def render(self, profile_format: str = "speedscope") -> str:
+        """
+        Render the samples in a profile format.
+        
+        Args:
+            profile_format: "speedscope" or "folded"
+        
+        Returns:
+            Profile text
+        
+        Raises:
+            ValueError: If the format is unknown
+        """
+        if profile_format == "speedscope":
+            return json.dumps(self.to_speedscope())
+        if profile_format == "folded":
+            return self.to_folded()
+        raise ValueError(f"Unknown profile format {profile_format!r} (use speedscope or folded)")
+    
+    def write(self, path: str) -> None:
+        """
+        Write the profile to a file, as folded stacks for .folded and .txt files and
+        as speedscope JSON otherwise.
+        
+        Args:
+            path: Output file
+        """
+        profile_format = PROFILE_FORMATS.get(os.path.splitext(path)[1].lower(), "speedscope")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(self.render(profile_format))
+
+
+def _is_idle(frame: Frame) -> bool:
+    """
+    Check whether a thread's innermost frame is a function it waits for work in.
+    """
+    name, path, _ = frame
+    return (os.path.basename(path), name.rsplit(".", 1)[-1]) in IDLE_FUNCTIONS
+
+
+def _short_path(path: str) -> str:
+    """
+    Shorten a source path to its module path, relative to the longest sys.path entry.
+    """
+    best = ""
+    for entry in sys.path:
+        if entry and path.startswith(entry.rstrip(os.sep) + os.sep) and len(entry) > len(best):
+            best = entry.rstrip(os.sep) + os.sep
+    return path[len(best):] if best else path
+
+
+@contextmanager
+def _profile_to(path: str, interval: float) -> Iterator[SamplingProfiler]:
+    """
+    Run a profiler around a block and write its profile, even if the block fails.
+    """
+    profiler = SamplingProfiler(interval)
+    try:
+        with profiler:
+            yield profiler
+    finally:
+        profiler.write(path)
+
+
+def profile_to(path: Optional[str], interval: float = DEFAULT_INTERVAL):
+    """
+    Profile a block of code and write the profile to a file when it ends.
+    
+        with profile_to(args.profile):
+            rate_file(...)
+    
+    Args:
+        path: Profile file (.json for speedscope, .folded or .txt for folded
+              stacks), or None to not profile
+        interval: Seconds between samples
+    
+    Returns:
+        Context manager; a no-op when path is None
+    """
+    if path is None:
+        return nullcontext()
+    return _profile_to(path, interval)
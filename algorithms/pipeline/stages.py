@@ -0,0 +1,308 @@
+"""
+Transform stage registry for the insurance pricing library.
+
+Each pipeline stage is a function that takes and returns a DataFrame, and declares
+the columns it reads (inputs) and the columns it adds or changes (outputs). With
+these declarations the stage runner can skip stages whose outputs are not needed,
+cache stage outputs by a hash of their inputs, and time each stage.
+
+Custom stages are registered in additional_transforms.py with the register_stage
+decorator. Stages that do not declare their inputs or outputs are always run and
+never cached.
+"""
+
+import hashlib
+import time
+import polars as pl
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+from algorithms.pipeline.utils import (
+    apply_category_mapping,
+    apply_continuous_banding,
+    measure_stage_allocation,
+    config_hash
+)
+from algorithms.pipeline.metrics import has_metrics_hooks, emit_metric
+
+# Custom stages registered with register_stage, in registration order
+_REGISTERED_STAGES: List[Dict[str, Any]] = []
+
+# Cached stage outputs keyed by stage, configuration and input hash
+_STAGE_CACHE: "OrderedDict[tuple, pl.DataFrame]" = OrderedDict()
+STAGE_CACHE_SIZE = 32
+# Upper bound on the memory held by cached stage outputs, so that caching the stages
+# of a streamed file does not keep every chunk alive
+STAGE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+def register_stage(
+    name: str,
+    inputs: Optional[List[str]] = None,
+    outputs: Optional[List[str]] = None,
+    after_builtin: bool = False
+) -> Callable:
+    """
+    Decorator registering a custom transform stage.
+    
+    Example (in additional_transforms.py):
+    
+        @register_stage("vehicle_age_squared", inputs=["VehAge"], outputs=["VehAgeSquared"])
+        def add_vehicle_age_squared(df):
+            return df.with_columns((pl.col("VehAge") ** 2).alias("VehAgeSquared"))
+    
+    Args:
+        name: Unique name of the stage (registering a name again replaces the stage)
+        inputs: Columns read by the stage (None means the stage may read any column)
+        outputs: Columns added or changed by the stage (None means unknown, so the
+                 stage is never skipped)
+        after_builtin: Run the stage after banding and category mapping instead of before
+        
+    Returns:
+        Decorator that registers the function and returns it unchanged
+    """
+    def decorator(func: Callable[[pl.DataFrame], pl.DataFrame]) -> Callable[[pl.DataFrame], pl.DataFrame]:
+        _REGISTERED_STAGES[:] = [stage for stage in _REGISTERED_STAGES if stage["name"] != name]
+        _REGISTERED_STAGES.append({
+            "name": name,
+            "func": func,
+            "inputs": inputs,
+            "outputs": outputs,
+            "after_builtin": after_builtin,
+            "config_key": f"{func.__module__}.{func.__qualname__}",
+        })
+        return func
+    
+    return decorator
+
+def _banding_stage(banding_config: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the continuous banding stage for a banding configuration.
+    
+    Args:
+        banding_config: Dictionary with banding configuration for continuous variables
+        
+    Returns:
+        Stage dictionary that can be narrowed to the band columns actually needed
+    """
+    return {
+        "name": "continuous_banding",
+        "func": lambda df: apply_continuous_banding(df, banding_config),
+        "inputs": list(banding_config.keys()),
+        "outputs": [config.get("column_name", f"{column}Band") for column, config in banding_config.items()],
+        "config_key": config_hash(banding_config),
+        "narrow": lambda needed: _banding_stage({
+            column: config for column, config in banding_config.items()
+            if config.get("column_name", f"{column}Band") in needed
+        }),
+    }
+
+def _category_stage(category_config: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+    """
+    Build the category mapping stage for a category index configuration.
+    
+    Args:
+        category_config: Dictionary mapping column names to their category-index mappings
+        
+    Returns:
+        Stage dictionary that can be narrowed to the index columns actually needed
+    """
+    return {
+        "name": "category_mapping",
+        "func": lambda df: apply_category_mapping(df, category_config),
+        "inputs": list(category_config.keys()),
+        "outputs": [f"{column}_Index" for column in category_config],
+        "config_key": config_hash(category_config),
+        "narrow": lambda needed: _category_stage({
+            column: mapping for column, mapping in category_config.items()
+            if f"{column}_Index" in needed
+        }),
+    }
+
+def get_pipeline_stages(
+    category_config: Dict[str, Dict[str, int]],
+    banding_config: Dict[str, Dict[str, Any]],
+    transform_hook: Optional[Callable[[pl.DataFrame], pl.DataFrame]] = None,
+    transform_inputs: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Build the ordered list of pipeline stages.
+    
+    The order is: the transform_data hook, custom stages, continuous banding,
+    category mapping, then custom stages registered with after_builtin=True.
+    
+    Args:
+        category_config: Dictionary mapping column names to their category-index mappings
+        banding_config: Dictionary with banding configuration for continuous variables
+        transform_hook: The transform_data(df) function from additional_transforms.py
+        transform_inputs: Columns read by the transform hook (None means any column)
+        
+    Returns:
+        List of stage dictionaries with "name", "func", "inputs", "outputs", "config_key"
+        and, for stages that can produce a subset of their outputs, "narrow"
+    """
+    stages = []
+    
+    if transform_hook is not None:
+        stages.append({
+            "name": "additional_transforms",
+            "func": transform_hook,
+            "inputs": transform_inputs,
+            "outputs": None,
+            "config_key": f"{transform_hook.__module__}.{transform_hook.__qualname__}",
+        })
+    
+    stages.extend(stage for stage in _REGISTERED_STAGES if not stage["after_builtin"])
+    
+    stages.append(_banding_stage(banding_config))
+    stages.append(_category_stage(category_config))
+    
+    stages.extend(stage for stage in _REGISTERED_STAGES if stage["after_builtin"])
+    return stages
+
+def select_stages(stages: List[Dict[str, Any]], required_columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Select the stages needed to produce a set of columns.
+    
+    Walks the stages backwards from the required columns, keeping every stage that
+    produces a needed column (or has unknown outputs) and adding its inputs to the
+    needed columns. Stages that can be narrowed (banding and category mapping) are
+    restricted to the columns that are needed.
+    
+    Args:
+        stages: Ordered list of stages from get_pipeline_stages
+        required_columns: Columns the caller needs (None keeps all stages)
+        
+    Returns:
+        Ordered list of the stages to run
+    """
+    if required_columns is None:
+        return list(stages)
+    
+    needed = set(required_columns)
+    needs_everything = False
+    selected = []
+    
+    for stage in reversed(stages):
+        outputs = stage["outputs"]
+        if not needs_everything and outputs is not None and not needed.intersection(outputs):
+            continue
+        
+        if not needs_everything and "narrow" in stage:
+            stage = stage["narrow"](needed)
+        
+        selected.append(stage)
+        if stage["inputs"] is None:
+            needs_everything = True
+        else:
+            needed.update(stage["inputs"])
+    
+    return list(reversed(selected))
+
+def hash_frame(df: pl.DataFrame) -> str:
+    """
+    Compute an order-sensitive content hash of a DataFrame.
+    
+    Args:
+        df: DataFrame to hash
+        
+    Returns:
+        Hex digest identifying the schema and contents of the frame
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(df.schema).encode())
+    digest.update(str(df.height).encode())
+    if df.width and df.height:
+        row_hashes = df.hash_rows(seed=0).to_arrow()
+        digest.update(memoryview(row_hashes.buffers()[1])[row_hashes.offset * 8:(row_hashes.offset + len(row_hashes)) * 8])
+    return digest.hexdigest()
+
+def clear_stage_cache() -> None:
+    """
+    Remove all cached stage outputs.
+    """
+    _STAGE_CACHE.clear()
+
+def _run_cached(stage: Dict[str, Any], df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Run a stage, reusing its cached output if its inputs were seen before.
+    
+    Args:
+        stage: Stage dictionary
+        df: Input DataFrame
+        
+    Returns:
+        DataFrame returned by the stage
+    """
+    inputs = stage["inputs"]
+    outputs = stage["outputs"]
+    
+    # Only stages that declare both their inputs and outputs are cached: a stage with
+    # unknown outputs may change any column, so its result depends on more than its
+    # inputs. Stages with missing inputs are cheap no-ops.
+    if inputs is None or outputs is None or not all(column in df.columns for column in inputs):
+        return stage["func"](df)
+    
+    key = (stage["name"], stage["config_key"], hash_frame(df.select(inputs)))
+    
+    cached = _STAGE_CACHE.get(key)
+    if cached is None:
+        result = stage["func"](df)
+        # Only the declared outputs are cached
+        _STAGE_CACHE[key] = result.select([col for col in outputs if col in result.columns])
+        while len(_STAGE_CACHE) > STAGE_CACHE_SIZE or (
+            len(_STAGE_CACHE) > 1
+            and sum(frame.estimated_size() for frame in _STAGE_CACHE.values()) > STAGE_CACHE_MAX_BYTES
+        ):
+            _STAGE_CACHE.popitem(last=False)
+        return result
+    
+    # Attach the cached outputs to the current frame, which keeps its other columns
+    _STAGE_CACHE.move_to_end(key)
+    return df.with_columns(cached.get_columns()) if cached.width else df
+
+def run_stages(
+    df: pl.DataFrame,
+    stages: List[Dict[str, Any]],
+    required_columns: Optional[List[str]] = None,
+    use_cache: bool = False,
+    track_allocations: bool = False
+) -> pl.DataFrame:
+    """
+    Run pipeline stages, skipping the ones whose outputs are not needed.
+    
+    Per-stage timings are emitted as the "stage_timings" metric while a metrics hook
+    is registered.
+    
+    Args:
+        df: Input DataFrame
+        stages: Ordered list of stages from get_pipeline_stages
+        required_columns: Columns the caller needs (None runs all stages)
+        use_cache: Reuse stage outputs cached by a hash of the stage inputs
+        track_allocations: Report how many bytes each stage allocates, as the
+                           "stage_allocations" metric and on stdout
+        
+    Returns:
+        DataFrame with the selected stages applied
+    """
+    timings = {}
+    allocations = {}
+    
+    for stage in select_stages(stages, required_columns):
+        start = time.perf_counter()
+        result = _run_cached(stage, df) if use_cache else stage["func"](df)
+        timings[stage["name"]] = time.perf_counter() - start
+        
+        if track_allocations:
+            allocations[stage["name"]] = measure_stage_allocation(df, result)
+        df = result
+    
+    if has_metrics_hooks():
+        emit_metric("stage_timings", timings)
+    
+    # Report the allocations of each stage
+    if track_allocations:
+        for name, allocated in allocations.items():
+            print(f"Stage {name} allocated {allocated:,} bytes")
+        emit_metric("stage_allocations", allocations)
+    
+    return df
@@ -0,0 +1,290 @@
+"""
+Synthetic portfolio generator for the insurance pricing library.
+
+Generates quote portfolios of any size, with marginal distributions resembling a
+French motor book, for scale testing and benchmarks. The columns and their levels
+and ranges come from category-index.json and continuous-banding.json, so generated
+quotes always pass validation. Levels missing from a rating table (such as a new
+Area) are generated too, as they would appear in a real book.
+
+Rows are generated in fixed blocks, each with its own random stream derived from
+the seed and the block number, so a seed always produces the same portfolio,
+whatever the chunk size and however many rows are generated at a time.
+"""
+
+import os
+import time
+import shutil
+import numpy as np
+import polars as pl
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from algorithms.config import get_primary_id
+from algorithms.pipeline.utils import load_transformation_configs, hive_partition_path
+
+# Rows per random stream; the unit of reproducibility
+BLOCK_ROWS = 100_000
+
+# Relative frequencies of the categorical levels; configured levels that are not
+# listed here get the average weight of the listed levels of their column
+LEVEL_WEIGHTS = {
+    "Area": {"A": 15.0, "B": 11.0, "C": 28.0, "D": 22.0, "E": 21.0, "F": 3.0},
+    "VehGas": {"Regular": 51.0, "Diesel": 49.0},
+    "VehBrand": {
+        "B12": 24.0, "B1": 24.0, "B2": 24.0, "B3": 8.0, "B5": 5.0, "B6": 4.0,
+        "B4": 4.0, "B10": 3.0, "B11": 2.0, "B13": 2.0, "B14": 0.6,
+    },
+    "Region": {
+        "Centre": 39.0, "Rhone-Alpes": 12.0, "Provence-Alpes-Cotes-D'Azur": 12.0,
+        "Ile-de-France": 8.0, "Bretagne": 7.0, "Aquitaine": 7.5, "Pays-de-la-Loire": 6.3,
+        "Nord-Pas-de-Calais": 4.0, "Languedoc-Roussillon": 3.0, "Midi-Pyrenees": 2.5,
+        "Poitou-Charentes": 2.0, "Basse-Normandie": 1.6, "Bourgogne": 1.2,
+        "Haute-Normandie": 1.1, "Auvergne": 0.8, "Picardie": 0.8, "Limousin": 0.7,
+        "Alsace": 0.6, "Franche-Comte": 0.4, "Champagne-Ardenne": 0.4, "Corse": 0.3,
+    },
+}
+
+# Vehicle power classes and their relative frequencies
+VEH_POWER_WEIGHTS = {4: 17.0, 5: 18.0, 6: 22.0, 7: 21.0, 8: 7.0, 9: 4.5, 10: 4.6, 11: 2.7, 12: 1.3, 13: 0.5, 14: 0.4, 15: 0.4}
+
+
+def _sample_veh_power(rng: np.random.Generator, rows: int) -> np.ndarray:
+    """
+    Sample vehicle power classes from their observed frequencies.
+    """
+    values = np.fromiter(VEH_POWER_WEIGHTS, dtype=np.int64)
+    weights = np.fromiter(VEH_POWER_WEIGHTS.values(), dtype=np.float64)
+    return rng.choice(values, size=rows, p=weights / weights.sum())
+
+
+def _sample_veh_age(rng: np.random.Generator, rows: int) -> np.ndarray:
+    """
+    Sample vehicle ages: right-skewed around 7 years, with a long tail of old vehicles.
+    """
+    return rng.negative_binomial(2, 2 / (2 + 7.0), size=rows)
+
+
+def _sample_driv_age(rng: np.random.Generator, rows: int) -> np.ndarray:
+    """
+    Sample driver ages: 18 and over, with a mean around 45.
+    """
+    return (18 + rng.gamma(4.0, 6.8, size=rows)).astype(np.int64)
+
+
+def _sample_bonus_malus(rng: np.random.Generator, rows: int) -> np.ndarray:
+    """
+    Sample bonus-malus levels: most drivers at the 50 floor, the rest spread above it.
+    """
+    malus = (50 + rng.gamma(1.5, 20.0, size=rows)).astype(np.int64)
+    return np.where(rng.random(rows) < 0.57, 50, malus)
+
+
+def _sample_density(rng: np.random.Generator, rows: int) -> np.ndarray:
+    """
+    Sample population densities (inhabitants per km2): log-normal, median around 400.
+    """
+    return np.maximum(1, rng.lognormal(6.0, 1.6, size=rows)).astype(np.int64)
+
+
+# Samplers of the banded columns; banded columns without a sampler are uniform
+# over their band range
+NUMERIC_SAMPLERS: Dict[str, Callable[[np.random.Generator, int], np.ndarray]] = {
+    "VehPower": _sample_veh_power,
+    "VehAge": _sample_veh_age,
+    "DrivAge": _sample_driv_age,
+    "BonusMalus": _sample_bonus_malus,
+    "Density": _sample_density,
+}
+
+
+def build_portfolio_spec(
+    category_config: Dict[str, Dict[str, int]],
+    banding_config: Dict[str, Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Build the generation specification of each portfolio column.
+    
+    Args:
+        category_config: Dictionary mapping column names to their category-index mappings
+        banding_config: Dictionary with banding configuration for continuous variables
+    
+    Returns:
+        Dictionary mapping banded columns to their "sampler" and integer "low" and
+        "high" bounds (inclusive), and categorical columns to their "levels" and
+        "cumulative" probabilities
+    """
+    spec = {}
+    
+    for column, config in banding_config.items():
+        bands = config.get("bands", [])
+        if not bands:
+            continue
+        low = int(np.ceil(min(band["min"] for band in bands)))
+        high = int(np.floor(max(band["max"] for band in bands)))
+        if not config.get("min_inclusive", True):
+            low += 1
+        if config.get("max_exclusive", True):
+            high -= 1
+        spec[column] = {"sampler": NUMERIC_SAMPLERS.get(column), "low": low, "high": high}
+    
+    for column, mapping in category_config.items():
+        levels = list(mapping)
+        known = LEVEL_WEIGHTS.get(column, {})
+        default = float(np.mean(list(known.values()))) if known else 1.0
+        weights = np.array([known.get(level, default) for level in levels])
+        spec[column] = {"levels": pl.Series(column, levels), "cumulative": np.cumsum(weights / weights.sum())}
+    
+    return spec
+
+
+def generate_block(
+    spec: Dict[str, Dict[str, Any]],
+    block: int,
+    rows: int,
+    seed: int = 0
+) -> pl.DataFrame:
+    """
+    Generate one block of the portfolio.
+    
+    Args:
+        spec: Generation specification from build_portfolio_spec
+        block: Block number; its rows get the IDs following the previous blocks
+        rows: Number of rows (at most BLOCK_ROWS)
+        seed: Portfolio seed
+    
+    Returns:
+        DataFrame with the primary ID and one column per specified column
+    """
+    rng = np.random.default_rng([seed, block])
+    start = block * BLOCK_ROWS + 1
+    columns = {get_primary_id(): np.arange(start, start + rows, dtype=np.int64)}
+    
+    for column, column_spec in spec.items():
+        if "levels" in column_spec:
+            # Inverse-CDF sampling of the level codes, then one gather of the levels
+            cumulative = column_spec["cumulative"]
+            codes = np.minimum(np.searchsorted(cumulative, rng.random(rows), side="right"), len(cumulative) - 1)
+            columns[column] = column_spec["levels"].gather(codes)
+        else:
+            sampler = column_spec["sampler"]
+            if sampler is None:
+                values = rng.integers(column_spec["low"], column_spec["high"], size=rows, endpoint=True)
+            else:
+                values = sampler(rng, rows)
+            columns[column] = np.clip(values, column_spec["low"], column_spec["high"])
+    
+    return pl.DataFrame(columns)
+
+
+def iter_portfolio_batches(
+    rows: int,
+    seed: int = 0,
+    chunk_size: int = 1_000_000,
+    config_dir: Optional[str] = None
+) -> Iterator[pl.DataFrame]:
+    """
+    Generate a portfolio in chunks, holding one chunk in memory at a time.
+    
+    Args:
+        rows: Number of quotes in the portfolio
+        seed: Seed of the portfolio
+        chunk_size: Number of quotes per chunk, rounded up to whole blocks
+        config_dir: Directory containing configuration files (default: algorithms/pipeline)
+    
+    Yields:
+        DataFrame for each chunk of quotes
+    """
+    spec = build_portfolio_spec(*load_transformation_configs(config_dir))
+    blocks_per_chunk = max(1, -(-chunk_size // BLOCK_ROWS))
+    total_blocks = -(-rows // BLOCK_ROWS)
+    
+    for first_block in range(0, total_blocks, blocks_per_chunk):
+        last_block = min(first_block + blocks_per_chunk, total_blocks)
+        yield pl.concat([
+            generate_block(spec, block, min(BLOCK_ROWS, rows - block * BLOCK_ROWS), seed)
+            for block in range(first_block, last_block)
+        ])
+
+
+def generate_portfolio(rows: int, seed: int = 0, config_dir: Optional[str] = None) -> pl.DataFrame:
+    """
+    Generate a portfolio in memory.
+    
+    Args:
+        rows: Number of quotes in the portfolio
+        seed: Seed of the portfolio
+        config_dir: Directory containing configuration files (default: algorithms/pipeline)
+    
+    Returns:
+        DataFrame with one quote per row
+    """
+    return pl.concat(list(iter_portfolio_batches(rows, seed, config_dir=config_dir)))
+
+
+def write_portfolio(
+    output_dir: str,
+    rows: int,
+    seed: int = 0,
+    chunk_size: int = 1_000_000,
+    partition_by: Sequence[str] = ("Region",),
+    compression: str = "zstd",
+    overwrite: bool = False,
+    config_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Generate a portfolio and stream it to a hive-partitioned Parquet dataset.
+    
+    Each chunk is written as soon as it is generated, one file per partition and
+    chunk (e.g. Region=Centre/part-00000.parquet), so memory use is bounded by
+    the chunk size.
+    
+    Args:
+        output_dir: Dataset directory
+        rows: Number of quotes in the portfolio
+        seed: Seed of the portfolio
+        chunk_size: Number of quotes generated and written at a time
+        partition_by: Columns to partition by (empty for unpartitioned files)
+        compression: Parquet compression codec
+        overwrite: Replace an existing non-empty output directory
+        config_dir: Directory containing configuration files (default: algorithms/pipeline)
+    
+    Returns:
+        Dictionary with the "rows" and "chunks" written, the number of "files",
+        the dataset "bytes" and the elapsed "seconds"
+    
+    Raises:
+        FileExistsError: If the output directory is not empty and overwrite is False
+    """
+    if os.path.isdir(output_dir) and os.listdir(output_dir):
+        if not overwrite:
+            raise FileExistsError(f"Output directory is not empty: {output_dir}")
+        shutil.rmtree(output_dir)
+    os.makedirs(output_dir, exist_ok=True)
+    
+    start = time.perf_counter()
+    stats = {"rows": 0, "chunks": 0}
+    
+    for chunk, batch in enumerate(iter_portfolio_batches(rows, seed, chunk_size, config_dir)):
+        file_name = f"part-{chunk:05d}.parquet"
+        if partition_by:
+            for key, part in batch.partition_by(list(partition_by), as_dict=True, include_key=False).items():
+                partition_dir = os.path.join(output_dir, hive_partition_path(partition_by, key))
+                os.makedirs(partition_dir, exist_ok=True)
+                part.write_parquet(os.path.join(partition_dir, file_name), compression=compression)
+        else:
+            batch.write_parquet(os.path.join(output_dir, file_name), compression=compression)
+        stats["rows"] += batch.height
+        stats["chunks"] += 1
+    
+    files = _list_files(output_dir)
+    stats["files"] = len(files)
+    stats["bytes"] = sum(os.path.getsize(path) for path in files)
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def _list_files(directory: str) -> List[str]:
+    """
+    List the files in a directory tree.
+    """
+    return [os.path.join(root, name) for root, _, names in os.walk(directory) for name in names]
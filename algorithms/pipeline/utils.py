@@ -5,11 +5,34 @@ This module contains utility functions that are used across the package,
 including data loading and processing functions.
 """
 
+import io
 import os
 import json
+import hashlib
+import threading
 import polars as pl
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Union, Tuple
+from collections import OrderedDict
+from urllib.parse import quote
+from typing import Optional, Callable, Dict, Any, Iterator, List, Sequence, Union, Tuple
+
+from algorithms.pipeline.metrics import has_metrics_hooks, emit_metric
+
+# Configuration files loaded from disk, keyed by path: the (size, mtime) signature
+# of the file, the loaded configuration and its content hash
+_CONFIG_FILE_CACHE: Dict[str, Tuple[Tuple[int, int], Dict[str, Any], str]] = {}
+
+# Compiled Polars expressions keyed by (kind, configuration content hash), least
+# recently used first. Narrowed stages compile subsets of the configurations, and
+# configurations change while the API runs, so the cache is bounded. The cache is
+# shared by the API's worker threads, so it is only touched under the lock.
+_EXPRESSION_CACHE: "OrderedDict[Tuple[str, str], Dict[str, pl.Expr]]" = OrderedDict()
+_EXPRESSION_CACHE_LOCK = threading.Lock()
+EXPRESSION_CACHE_SIZE = 64
+
+# Row filters accepted by the Parquet loaders: a Polars expression, or a dictionary
+# mapping columns to a value or a list of allowed values
+Filters = Union[pl.Expr, Dict[str, Any]]
 
 def load_json(file_path: str) -> pl.DataFrame:
     """
@@ -30,17 +53,250 @@ def load_json(file_path: str) -> pl.DataFrame:
     else:
         return pl.DataFrame(data)
 
-def load_parquet(file_path: str) -> pl.DataFrame:
+def load_ndjson(file_path: str) -> pl.DataFrame:
     """
-    Load data from a Parquet file.
+    Load data from an NDJSON (JSON lines) file.
     
     Args:
-        file_path: Path to the Parquet file
+        file_path: Path to the NDJSON file
         
     Returns:
         DataFrame containing the data
     """
-    return pl.read_parquet(file_path)
+    return pl.read_ndjson(file_path)
+
+def _read_ndjson_chunk(lines: List[bytes], schema: Optional[Dict[str, pl.DataType]]) -> pl.DataFrame:
+    """
+    Parse a chunk of NDJSON lines, with the given schema where the values fit it.
+    
+    A chunk with values that do not fit the schema (such as text in a numeric
+    field) is parsed with an inferred schema instead, so the bad records reach
+    validation rather than failing the whole read.
+    """
+    data = io.BytesIO(b"".join(lines))
+    if schema is None:
+        return pl.read_ndjson(data)
+    try:
+        return pl.read_ndjson(data, schema=schema)
+    except pl.exceptions.PolarsError:
+        data.seek(0)
+        return pl.read_ndjson(data, infer_schema_length=None)
+
+def iter_ndjson_batches(
+    file_path: str,
+    chunk_size: int = 100_000,
+    schema: Optional[Dict[str, pl.DataType]] = None
+) -> Iterator[pl.DataFrame]:
+    """
+    Read an NDJSON file in chunks of lines, holding one chunk in memory at a time.
+    
+    The schema is inferred from the first chunk (unless given) and reused for the
+    following chunks, so every chunk has the same column types, except chunks
+    whose values do not fit it, which are read with their own inferred schema.
+    
+    Args:
+        file_path: Path to the NDJSON file
+        chunk_size: Number of lines per chunk
+        schema: Schema of the records (default: inferred from the first chunk)
+        
+    Yields:
+        DataFrame for each chunk of lines
+    """
+    with open(file_path, 'rb') as f:
+        lines = []
+        for line in f:
+            if not line.strip():
+                continue
+            lines.append(line)
+            if len(lines) >= chunk_size:
+                df = _read_ndjson_chunk(lines, schema)
+                schema = schema or df.schema
+                lines = []
+                yield df
+        
+        if lines:
+            yield _read_ndjson_chunk(lines, schema)
+
+def build_filter_expression(filters: Optional[Filters]) -> Optional[pl.Expr]:
+    """
+    Build the Polars predicate of a filter specification.
+    
+    Args:
+        filters: Expression, or dictionary mapping columns to a value or a list of
+                 allowed values (e.g. {"Region": "Centre"} or {"Area": ["A", "B"]})
+        
+    Returns:
+        Predicate expression, or None if there is nothing to filter on
+    """
+    if filters is None or isinstance(filters, pl.Expr):
+        return filters
+    
+    expressions = [
+        pl.col(column).is_in(list(value)) if isinstance(value, (list, tuple, set)) else pl.col(column) == value
+        for column, value in filters.items()
+    ]
+    return pl.all_horizontal(expressions) if expressions else None
+
+def _build_arrow_filter(filters: Optional[Dict[str, Any]]) -> Any:
+    """
+    Build the pyarrow dataset expression of a filter dictionary.
+    """
+    import pyarrow.dataset as ds
+    
+    expression = None
+    for column, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            condition = ds.field(column).isin(list(value))
+        else:
+            condition = ds.field(column) == value
+        expression = condition if expression is None else expression & condition
+    return expression
+
+def scan_parquet_dataset(
+    path: str,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Filters] = None
+) -> pl.LazyFrame:
+    """
+    Scan a Parquet file, or a directory of Parquet files, as one lazy frame.
+    
+    Directories are read as a single dataset, with hive partitions (such as
+    Region=Centre/) turned into columns. The column selection and filters are
+    pushed down into the scan: only the selected column chunks are read, and
+    partitions and row groups whose statistics exclude the filters are skipped.
+    
+    Args:
+        path: Parquet file, directory of Parquet files or glob pattern
+        columns: Columns to read (default: all); columns the data does not have are ignored
+        filters: Rows to keep, see build_filter_expression
+        
+    Returns:
+        LazyFrame over the dataset
+    """
+    if os.path.isdir(path):
+        lazy_df = pl.scan_parquet(path, hive_partitioning=True)
+    else:
+        lazy_df = pl.scan_parquet(path)
+    
+    predicate = build_filter_expression(filters)
+    if predicate is not None:
+        lazy_df = lazy_df.filter(predicate)
+    
+    if columns is not None:
+        available = lazy_df.collect_schema().names()
+        lazy_df = lazy_df.select([column for column in columns if column in available])
+    
+    return lazy_df
+
+def iter_parquet_batches(
+    file_path: str,
+    chunk_size: int = 100_000,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Dict[str, Any]] = None
+) -> Iterator[pl.DataFrame]:
+    """
+    Read a Parquet file, or a directory of Parquet files, in chunks of rows,
+    holding one chunk in memory at a time.
+    
+    Only the selected columns are read, and partitions and row groups whose
+    statistics exclude the filters are skipped. Directories are read as one
+    hive-partitioned dataset.
+    
+    Args:
+        file_path: Path to the Parquet file or dataset directory
+        chunk_size: Number of rows per chunk
+        columns: Columns to read (default: all); columns the data does not have are ignored
+        filters: Dictionary mapping columns to a value or a list of allowed values
+        
+    Yields:
+        DataFrame for each chunk of rows
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    
+    dataset = ds.dataset(file_path, format="parquet", partitioning="hive" if os.path.isdir(file_path) else None)
+    if columns is not None:
+        columns = [column for column in columns if column in dataset.schema.names]
+    
+    # Files and row groups do not line up with chunks; regroup their rows into chunks
+    pending = []
+    pending_rows = 0
+    for batch in dataset.to_batches(columns=columns, filter=_build_arrow_filter(filters), batch_size=chunk_size):
+        if batch.num_rows == 0:
+            continue
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        if pending_rows >= chunk_size:
+            table = pa.Table.from_batches(pending)
+            yield pl.from_arrow(table.slice(0, chunk_size))
+            pending = table.slice(chunk_size).to_batches()
+            pending_rows -= chunk_size
+    
+    if pending_rows:
+        yield pl.from_arrow(pa.Table.from_batches(pending))
+
+def _select_frame(
+    df: pl.DataFrame,
+    columns: Optional[List[str]],
+    filters: Optional[Filters]
+) -> pl.DataFrame:
+    """
+    Apply a column selection and filters to data read without pushdown.
+    """
+    predicate = build_filter_expression(filters)
+    if predicate is not None:
+        df = df.filter(predicate)
+    if columns is not None:
+        df = df.select([column for column in columns if column in df.columns])
+    return df
+
+def iter_data_batches(
+    file_path: str,
+    chunk_size: int = 100_000,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Dict[str, Any]] = None
+) -> Iterator[pl.DataFrame]:
+    """
+    Read a data file in chunks based on its extension.
+    
+    Args:
+        file_path: Path to an NDJSON (.ndjson, .jsonl) or Parquet file, or a
+                   directory of Parquet files
+        chunk_size: Number of rows per chunk
+        columns: Columns to read (default: all); columns the data does not have are ignored
+        filters: Dictionary mapping columns to a value or a list of allowed values
+        
+    Yields:
+        DataFrame for each chunk of rows
+        
+    Raises:
+        ValueError: If the format cannot be read in chunks
+    """
+    file_extension = os.path.splitext(file_path)[1].lower()
+    
+    if os.path.isdir(file_path) or file_extension == '.parquet':
+        return iter_parquet_batches(file_path, chunk_size, columns, filters)
+    if file_extension in ('.ndjson', '.jsonl'):
+        return (_select_frame(batch, columns, filters) for batch in iter_ndjson_batches(file_path, chunk_size))
+    raise ValueError(f"Unsupported format for chunked reading: {file_extension} (use .ndjson, .jsonl or .parquet)")
+
+def load_parquet(
+    file_path: str,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Filters] = None
+) -> pl.DataFrame:
+    """
+    Load data from a Parquet file or a directory of Parquet files.
+    
+    Args:
+        file_path: Path to the Parquet file or dataset directory
+        columns: Columns to read (default: all); columns the data does not have are ignored
+        filters: Rows to keep, see build_filter_expression
+        
+    Returns:
+        DataFrame containing the data
+    """
+    return scan_parquet_dataset(file_path, columns, filters).collect()
 
 def load_data(file_path: str) -> Optional[pl.DataFrame]:
     """
@@ -57,6 +313,8 @@ def load_data(file_path: str) -> Optional[pl.DataFrame]:
     # Map file extensions to loader functions
     loaders = {
         '.json': load_json,
+        '.ndjson': load_ndjson,
+        '.jsonl': load_ndjson,
         '.parquet': load_parquet
     }
     
@@ -86,10 +344,57 @@ def load_config_json(file_path: str) -> Optional[Dict[str, Any]]:
     except Exception:
         return None
 
+def config_hash(config: Dict[str, Any]) -> str:
+    """
+    Compute the content hash of a configuration dictionary.
+    
+    Configurations returned by load_transformation_configs have their hash stored
+    with them in the configuration file cache, so hashing them is a lookup.
+    
+    Args:
+        config: Configuration dictionary
+        
+    Returns:
+        SHA-256 hex digest of the configuration's canonical JSON form
+    """
+    for _, cached_config, digest in list(_CONFIG_FILE_CACHE.values()):
+        if cached_config is config:
+            return digest
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+def _load_cached_config(file_path: str) -> Dict[str, Any]:
+    """
+    Load a configuration file, reusing the previous result while the file is unchanged.
+    
+    Args:
+        file_path: Path to the JSON configuration file
+        
+    Returns:
+        Loaded configuration or empty dict if loading failed
+    """
+    try:
+        stat = os.stat(file_path)
+        signature = (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        signature = None
+    
+    cached = _CONFIG_FILE_CACHE.get(file_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    config = load_config_json(file_path) or {}
+    digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+    _CONFIG_FILE_CACHE[file_path] = (signature, config, digest)
+    return config
+
 def load_transformation_configs(config_dir: Optional[str] = None) -> Tuple[Dict[str, Dict[str, int]], Dict[str, Dict[str, Any]]]:
     """
     Load category index and continuous banding configuration files.
     
+    The files are only re-read when their size or modification time changes, and
+    the same configuration objects are returned until then, so callers must treat
+    them as read-only.
+    
     Args:
         config_dir: Directory containing configuration files (default: algorithms/pipeline)
         
@@ -105,57 +410,259 @@ def load_transformation_configs(config_dir: Optional[str] = None) -> Tuple[Dict[
     category_index_path = os.path.join(config_dir, "category-index.json")
     continuous_banding_path = os.path.join(config_dir, "continuous-banding.json")
     
-    category_config = load_config_json(category_index_path) or {}
-    banding_config = load_config_json(continuous_banding_path) or {}
+    category_config = _load_cached_config(category_index_path)
+    banding_config = _load_cached_config(continuous_banding_path)
     
     return category_config, banding_config
 
-def apply_category_mapping(df: pl.DataFrame, category_config: Dict[str, Dict[str, int]]) -> pl.DataFrame:
+def validate_category_config(category_config: Dict[str, Dict[str, int]]) -> None:
     """
-    Apply category mapping to convert categorical values to their numeric indices.
+    Validate a category index configuration.
+    
+    Args:
+        category_config: Dictionary mapping column names to their category-index mappings
+        
+    Raises:
+        ValueError: If any mapping is not a dictionary of string levels to integer indices
+    """
+    errors = []
+    for column, mapping in category_config.items():
+        if not isinstance(mapping, dict):
+            errors.append(f"{column}: mapping must be a dictionary of levels to indices")
+            continue
+        
+        bad_levels = [
+            level for level, index in mapping.items()
+            if not isinstance(index, int) or isinstance(index, bool)
+        ]
+        if bad_levels:
+            errors.append(f"{column}: non-integer indices for levels {bad_levels}")
+    
+    if errors:
+        raise ValueError("Invalid category index configuration: " + "; ".join(errors))
+
+def validate_banding_config(banding_config: Dict[str, Dict[str, Any]]) -> None:
+    """
+    Validate a continuous banding configuration.
+    
+    All bands of all columns are checked at once in a single Polars frame, for
+    missing labels, empty bands and overlapping bands.
+    
+    Args:
+        banding_config: Dictionary with banding configuration for continuous variables
+        
+    Raises:
+        ValueError: If any band is invalid
+    """
+    rows = []
+    for column, config in banding_config.items():
+        both_inclusive = config.get("min_inclusive", True) and not config.get("max_exclusive", True)
+        for band in config.get("bands", []):
+            rows.append((column, band.get("min"), band.get("max"), band.get("label"), both_inclusive))
+    
+    # Early return if there are no bands to check
+    if not rows:
+        return
+    
+    try:
+        bands = pl.DataFrame(
+            rows,
+            schema={"column": pl.String, "min": pl.Float64, "max": pl.Float64, "label": pl.String, "both_inclusive": pl.Boolean},
+            orient="row"
+        )
+    except (TypeError, pl.exceptions.PolarsError) as e:
+        raise ValueError(f"Invalid banding configuration: band bounds must be numbers ({e})")
+    
+    next_min = pl.col("min").shift(-1).over("column")
+    problems = (
+        bands.sort("column", "min")
+        .with_columns(
+            pl.when(pl.col("min").is_null() | pl.col("max").is_null()).then(pl.lit("missing bound"))
+            .when(pl.col("label").is_null()).then(pl.lit("missing label"))
+            .when(pl.col("min") >= pl.col("max")).then(pl.lit("min is not below max"))
+            .when((pl.col("max") > next_min) | ((pl.col("max") == next_min) & pl.col("both_inclusive")))
+            .then(pl.lit("overlaps the next band"))
+            .alias("problem")
+        )
+        .filter(pl.col("problem").is_not_null())
+    )
+    
+    if problems.height:
+        errors = [
+            f"{row['column']} band {row['label']!r} [{row['min']}, {row['max']}]: {row['problem']}"
+            for row in problems.iter_rows(named=True)
+        ]
+        raise ValueError("Invalid banding configuration: " + "; ".join(errors))
+
+def compile_category_mapping(category_config: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Compile a category index configuration into Enum dtypes and dense lookup Series.
+    
+    Mapping a column then becomes a cast to the Enum dtype followed by a gather from the
+    lookup Series by the Enum's physical codes, with no per-call dictionary handling.
     
     Args:
-        df: Input DataFrame
         category_config: Dictionary mapping column names to their category-index mappings
         
     Returns:
-        DataFrame with mapped categorical columns
+        Dictionary mapping column names to their "dtype" (pl.Enum of the known levels)
+        and "lookup" (pl.Series of indices, in the order of the Enum levels)
+        
+    Raises:
+        ValueError: If the configuration is invalid
     """
-    df = df.clone()
+    validate_category_config(category_config)
     
+    compiled = {}
     for column, mapping in category_config.items():
+        levels = list(mapping.keys())
+        compiled[column] = {
+            "dtype": pl.Enum(levels),
+            "lookup": pl.Series(f"{column}_Index", [mapping[level] for level in levels], dtype=pl.Int64),
+        }
+    
+    return compiled
+
+def count_unknown_levels(df: pl.DataFrame, columns: List[str]) -> Dict[str, int]:
+    """
+    Count the values that could not be mapped to a category index.
+    
+    An index is null exactly where its source value is null or unknown, so the
+    count is the difference of the two columns' null counts. Null counts are kept
+    with each column's validity bitmap, so no pass over the data is needed.
+    
+    Args:
+        df: DataFrame after category mapping
+        columns: Mapped source columns (their index columns are named "<column>_Index")
+        
+    Returns:
+        Dictionary mapping column names to the number of non-null values without an index
+    """
+    return {column: df[f"{column}_Index"].null_count() - df[column].null_count() for column in columns}
+
+def build_category_expressions(
+    compiled_mapping: Dict[str, Dict[str, Any]],
+    columns: List[str]
+) -> List[pl.Expr]:
+    """
+    Build the expressions that map categorical columns to their numeric indices.
+    
+    Args:
+        compiled_mapping: Mapping compiled with compile_category_mapping
+        columns: Columns available in the DataFrame (configured columns not in this list are skipped)
+        
+    Returns:
+        List of expressions, one "<column>_Index" column per mapped column
+    """
+    expressions = []
+    for column, mapping in compiled_mapping.items():
         # Skip columns not in the dataframe
-        if column not in df.columns:
+        if column not in columns:
             continue
-            
-        # Create a new column with the mapped values
-        mapped_column = f"{column}_Index"
         
-        # Use replace_strict which is the recommended way to map values in Polars
-        df = df.with_columns(
-            pl.col(column).replace_strict(mapping, default=None).alias(mapped_column)
-        )
+        # Cast to the Enum of known levels (unknown levels become null) and
+        # gather the index of each level by its physical code
+        codes = pl.col(column).cast(pl.String).cast(mapping["dtype"], strict=False).to_physical()
+        expressions.append(pl.lit(mapping["lookup"]).gather(codes).alias(f"{column}_Index"))
     
-    return df
+    return expressions
 
-def apply_continuous_banding(df: pl.DataFrame, banding_config: Dict[str, Dict[str, Any]]) -> pl.DataFrame:
+def _get_cached_expressions(
+    key: Tuple[str, str],
+    compile_expressions: Callable[[], Dict[str, pl.Expr]]
+) -> Dict[str, pl.Expr]:
     """
-    Apply banding to continuous variables based on configuration.
+    Get compiled expressions from the expression cache, compiling them on a miss.
+    
+    Args:
+        key: Cache key, (kind, configuration content hash)
+        compile_expressions: Function compiling the expressions
+        
+    Returns:
+        Dictionary mapping source column names to their expressions
+    """
+    with _EXPRESSION_CACHE_LOCK:
+        expressions = _EXPRESSION_CACHE.get(key)
+        if expressions is not None:
+            _EXPRESSION_CACHE.move_to_end(key)
+            return expressions
+    
+    # Compile outside the lock; a thread racing on the same key compiles the same
+    # expressions
+    expressions = compile_expressions()
+    with _EXPRESSION_CACHE_LOCK:
+        _EXPRESSION_CACHE[key] = expressions
+        while len(_EXPRESSION_CACHE) > EXPRESSION_CACHE_SIZE:
+            _EXPRESSION_CACHE.popitem(last=False)
+    return expressions
+
+def get_category_expressions(category_config: Dict[str, Dict[str, int]]) -> Dict[str, pl.Expr]:
+    """
+    Get the compiled category mapping expressions for a configuration.
+    
+    The configuration is validated and compiled once per content hash; later calls
+    return the cached expressions.
+    
+    Args:
+        category_config: Dictionary mapping column names to their category-index mappings
+        
+    Returns:
+        Dictionary mapping source column names to their "<column>_Index" expression
+    """
+    def compile_expressions() -> Dict[str, pl.Expr]:
+        compiled = compile_category_mapping(category_config)
+        return dict(zip(compiled, build_category_expressions(compiled, list(compiled))))
+    
+    return _get_cached_expressions(("category", config_hash(category_config)), compile_expressions)
+
+def apply_category_mapping(df: pl.DataFrame, category_config: Dict[str, Dict[str, int]]) -> pl.DataFrame:
+    """
+    Apply category mapping to convert categorical values to their numeric indices.
+    
+    Levels that are not in the configuration map to null. While a metrics hook is
+    registered, the number of such unknown levels per column is emitted as the
+    "unknown_category_levels" metric.
     
     Args:
         df: Input DataFrame
+        category_config: Dictionary mapping column names to their category-index mappings,
+                         or a mapping already compiled with compile_category_mapping
+        
+    Returns:
+        DataFrame with mapped categorical columns
+    """
+    if all(isinstance(mapping.get("lookup"), pl.Series) for mapping in category_config.values()):
+        expressions = build_category_expressions(category_config, df.columns)
+    else:
+        expressions = [
+            expr for column, expr in get_category_expressions(category_config).items()
+            if column in df.columns
+        ]
+    
+    # Add all index columns in a single pass
+    if expressions:
+        df = df.with_columns(expressions)
+    
+    # Surface unknown levels to the metrics hooks
+    if has_metrics_hooks():
+        mapped_columns = [column for column in category_config if column in df.columns]
+        emit_metric("unknown_category_levels", count_unknown_levels(df, mapped_columns))
+    
+    return df
+
+def _compile_banding_expressions(banding_config: Dict[str, Dict[str, Any]]) -> Dict[str, pl.Expr]:
+    """
+    Compile the expressions that band continuous variables.
+    
+    Args:
         banding_config: Dictionary with banding configuration for continuous variables
         
     Returns:
-        DataFrame with added band columns
+        Dictionary mapping source column names to their band column expression
     """
-    df = df.clone()
+    expressions = {}
     
     for column, config in banding_config.items():
-        # Skip columns not in the dataframe
-        if column not in df.columns:
-            continue
-        
         bands = config.get("bands", [])
         # Skip if no bands defined
         if not bands:
@@ -186,10 +693,6 @@ def apply_continuous_banding(df: pl.DataFrame, banding_config: Dict[str, Dict[st
             # Use pl.lit() to ensure the label is treated as a literal value, not a column reference
             when_then_exprs.append((condition, pl.lit(label)))
         
-        # Skip if no expressions were created
-        if not when_then_exprs:
-            continue
-            
         # Start with the first condition
         expr = pl.when(when_then_exprs[0][0]).then(when_then_exprs[0][1])
         
@@ -203,11 +706,142 @@ def apply_continuous_banding(df: pl.DataFrame, banding_config: Dict[str, Dict[st
         else:
             expr = expr.otherwise(pl.lit(None))
         
-        # Apply the expression to create the new column
-        df = df.with_columns(expr.alias(output_column))
+        expressions[column] = expr.alias(output_column)
+    
+    return expressions
+
+def get_banding_expressions(banding_config: Dict[str, Dict[str, Any]]) -> Dict[str, pl.Expr]:
+    """
+    Get the compiled banding expressions for a configuration.
+    
+    The configuration is validated and compiled once per content hash; later calls
+    return the cached expressions.
+    
+    Args:
+        banding_config: Dictionary with banding configuration for continuous variables
+        
+    Returns:
+        Dictionary mapping source column names to their band column expression
+        
+    Raises:
+        ValueError: If the banding configuration is invalid
+    """
+    def compile_expressions() -> Dict[str, pl.Expr]:
+        validate_banding_config(banding_config)
+        return _compile_banding_expressions(banding_config)
+    
+    return _get_cached_expressions(("banding", config_hash(banding_config)), compile_expressions)
+
+def build_banding_expressions(
+    banding_config: Dict[str, Dict[str, Any]],
+    columns: List[str]
+) -> List[pl.Expr]:
+    """
+    Build the expressions that band continuous variables.
+    
+    Args:
+        banding_config: Dictionary with banding configuration for continuous variables
+        columns: Columns available in the DataFrame (configured columns not in this list are skipped)
+        
+    Returns:
+        List of expressions, one band column per banded variable
+    """
+    return [
+        expr for column, expr in get_banding_expressions(banding_config).items()
+        if column in columns
+    ]
+
+def clear_expression_cache() -> None:
+    """
+    Remove all compiled expressions and cached configuration files.
+    """
+    with _EXPRESSION_CACHE_LOCK:
+        _EXPRESSION_CACHE.clear()
+    _CONFIG_FILE_CACHE.clear()
+
+def apply_continuous_banding(df: pl.DataFrame, banding_config: Dict[str, Dict[str, Any]]) -> pl.DataFrame:
+    """
+    Apply banding to continuous variables based on configuration.
+    
+    Args:
+        df: Input DataFrame
+        banding_config: Dictionary with banding configuration for continuous variables
+        
+    Returns:
+        DataFrame with added band columns
+        
+    Raises:
+        ValueError: If the banding configuration is invalid
+    """
+    # Add all band columns in a single pass
+    expressions = build_banding_expressions(banding_config, df.columns)
+    if expressions:
+        df = df.with_columns(expressions)
     
     return df
 
+def measure_stage_allocation(before: pl.DataFrame, after: pl.DataFrame) -> int:
+    """
+    Estimate the bytes a pipeline stage allocated for new or modified columns.
+    
+    Columns carried over unchanged share their buffers with the input frame, so only
+    added columns and columns whose values changed are counted.
+    
+    Args:
+        before: DataFrame passed to the stage
+        after: DataFrame returned by the stage
+        
+    Returns:
+        Estimated number of bytes allocated by the stage
+    """
+    allocated = 0
+    for column in after.columns:
+        series = after.get_column(column)
+        if column not in before.columns or not series.equals(before.get_column(column)):
+            allocated += series.estimated_size()
+    return allocated
+
+def hash_files(file_paths: List[str], content: bool = True) -> str:
+    """
+    Compute a single fingerprint for a set of files.
+    
+    Args:
+        file_paths: Paths of the files to fingerprint (missing files are skipped)
+        content: Hash the file contents (True) or only the path, size and
+                 modification time (False, cheap for large data files)
+        
+    Returns:
+        SHA-256 hex digest identifying the current state of the files
+    """
+    digest = hashlib.sha256()
+    for file_path in sorted(file_paths):
+        if not os.path.exists(file_path):
+            continue
+        
+        digest.update(file_path.encode())
+        if content:
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(block)
+        else:
+            stat = os.stat(file_path)
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    
+    return digest.hexdigest()
+
+def hive_partition_path(columns: Sequence[str], values: Sequence[Any]) -> str:
+    """
+    Build the hive-style relative directory of a partition.
+    
+    Args:
+        columns: Partition columns
+        values: Values of the partition columns
+        
+    Returns:
+        Relative path such as "Region=Centre", with the values URL-encoded
+    """
+    return os.path.join(*(f"{column}={quote(str(value), safe='')}" for column, value in zip(columns, values)))
+
 def find_data_files(directory: str, formats: List[str] = None) -> List[str]:
     """
     Find all data files in a directory with specified formats.
@@ -297,14 +931,26 @@ def get_data_directory(data_type: str) -> str:
     base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     return os.path.join(base_dir, "algorithms", "data", data_type)
 
-def load_directory_data(data_type: str, file_extension: str, combine: bool = False) -> Optional[pl.DataFrame]:
+def load_directory_data(
+    data_type: str,
+    file_extension: str,
+    combine: bool = False,
+    columns: Optional[List[str]] = None,
+    filters: Optional[Filters] = None
+) -> Optional[pl.DataFrame]:
     """
     Load data from files in a specific data directory.
     
+    Parquet files are always read together, as one lazy scan of the directory
+    with the column selection and filters pushed down (see scan_parquet_dataset).
+    
     Args:
         data_type: Type of data directory ('batch', 'individual', etc.)
         file_extension: File extension to look for ('.json', '.parquet', etc.)
-        combine: Whether to combine multiple files (True) or just load the first one (False)
+        combine: Whether to combine multiple files (True) or just load the first one
+                 (False); Parquet files are always combined
+        columns: Columns to read (default: all); columns the data does not have are ignored
+        filters: Rows to keep, see build_filter_expression
         
     Returns:
         DataFrame containing the data or None if loading fails
@@ -321,10 +967,13 @@ def load_directory_data(data_type: str, file_extension: str, combine: bool = Fal
             print(f"No {file_extension} files found in the {data_type} directory")
             return None
         
+        # Parquet: one scan over all files, reading only what is needed
+        if file_extension.lower() == '.parquet':
+            return load_parquet(data_dir, columns, filters)
+        
         # Map file extensions to loader functions
         loaders = {
             '.json': load_json,
-            '.parquet': load_parquet,
             '.csv': pl.read_csv
         }
         
@@ -347,23 +996,44 @@ def load_directory_data(data_type: str, file_extension: str, combine: bool = Fal
                 return None
             
             # Combine all dataframes
-            return pl.concat(dfs)
+            df = pl.concat(dfs)
         else:
             # Load just the first file
-            return loader(files[0])
+            if len(files) > 1:
+                print(f"Loading {files[0]} only; {len(files) - 1} other {file_extension} files in the {data_type} directory are skipped")
+            df = loader(files[0])
+        
+        return _select_frame(df, columns, filters)
             
     except Exception as e:
         print(f"Error loading {data_type} data: {e}")
         return None
 
-def load_batch_data() -> Optional[pl.DataFrame]:
+def load_batch_data(
+    columns: Optional[List[str]] = None,
+    filters: Optional[Filters] = None,
+    all_columns: bool = False
+) -> Optional[pl.DataFrame]:
     """
-    Load batch data from the parquet file in the algorithms/data/batch directory.
+    Load batch data from the parquet files in the algorithms/data/batch directory.
     
+    All files (including hive-partitioned datasets) are read as one dataset, and
+    only the columns the pipeline reads are loaded unless other columns are given.
+    
+    Args:
+        columns: Columns to read (default: the pipeline's input columns, or all
+                 columns if the pipeline may read any column)
+        filters: Rows to keep, e.g. {"Region": "Centre"}; see build_filter_expression
+        all_columns: Read every column of the files
+        
     Returns:
         DataFrame containing the batch data or None if loading fails
     """
-    return load_directory_data('batch', '.parquet', combine=False)
+    if columns is None and not all_columns:
+        from algorithms.pipeline.data_processor import get_input_columns
+        columns = get_input_columns()
+    
+    return load_directory_data('batch', '.parquet', columns=columns, filters=filters)
 
 def load_individual_data() -> Optional[pl.DataFrame]:
     """
@@ -0,0 +1,255 @@
+"""
+Quote input validation for the insurance pricing library.
+
+The quote schema is derived from the transformation configurations: banded columns
+must be numbers within the configured bands, and indexed columns must be strings.
+Levels that are not configured are left to the pipeline, which gives them a null
+index. Only the columns the rating plan reads are required. Batches are
+validated with a single vectorized Polars pass that marks every invalid row at
+once, instead of validating quotes one by one.
+"""
+
+import polars as pl
+from typing import Any, Dict, List, Optional, Tuple
+
+from algorithms.pipeline.utils import load_transformation_configs, config_hash
+from algorithms.pipeline.stages import get_pipeline_stages, select_stages
+from algorithms.rating.rating_engine import get_rating_key_columns
+
+# Quote schemas by configuration hashes
+_SCHEMA_CACHE: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+
+# Name of the row position column in validation reports
+ROW_COLUMN = "row"
+
+
+def get_rated_columns(
+    category_config: Dict[str, Dict[str, int]],
+    banding_config: Dict[str, Dict[str, Any]]
+) -> List[str]:
+    """
+    Get the raw quote columns the rating plan reads.
+    
+    The join columns of the rating plan are traced back through the pipeline
+    stages that produce them (for example DrivAgeBand to DrivAge). Stages that do
+    not declare their inputs are left out, so their columns are not required.
+    
+    Args:
+        category_config: Dictionary mapping column names to their category-index mappings
+        banding_config: Dictionary with banding configuration for continuous variables
+    
+    Returns:
+        List of the raw columns, in the order they are first read
+    """
+    key_columns = get_rating_key_columns()
+    stages = [stage for stage in get_pipeline_stages(category_config, banding_config) if stage["inputs"] is not None]
+    
+    columns = []
+    produced = set()
+    for stage in select_stages(stages, key_columns):
+        columns.extend(column for column in stage["inputs"] if column not in produced and column not in columns)
+        produced.update(stage["outputs"] or [])
+    columns.extend(column for column in key_columns if column not in produced and column not in columns)
+    return columns
+
+
+def build_quote_schema(
+    category_config: Dict[str, Dict[str, int]],
+    banding_config: Dict[str, Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Build the quote schema from the transformation configurations.
+    
+    Args:
+        category_config: Dictionary mapping column names to their category-index mappings
+        banding_config: Dictionary with banding configuration for continuous variables
+    
+    Returns:
+        Dictionary mapping each quote column to its specification: numeric columns
+        have "type" "number" with the "min" and "max" of their bands and the
+        "min_inclusive" and "max_exclusive" flags; categorical columns have "type"
+        "category" and their configured "levels". Every column has a "required"
+        flag, set for the columns the rating plan reads
+    """
+    schema = {}
+    rated_columns = set(get_rated_columns(category_config, banding_config))
+    
+    # Banded columns: numbers within the range covered by the bands
+    for column, config in banding_config.items():
+        bands = config.get("bands", [])
+        if not bands:
+            continue
+        schema[column] = {
+            "type": "number",
+            "min": min(band["min"] for band in bands),
+            "max": max(band["max"] for band in bands),
+            "min_inclusive": config.get("min_inclusive", True),
+            "max_exclusive": config.get("max_exclusive", True),
+            "required": column in rated_columns,
+        }
+    
+    # Indexed columns: strings; the pipeline gives unknown levels a null index
+    for column, mapping in category_config.items():
+        schema[column] = {"type": "category", "levels": list(mapping), "required": column in rated_columns}
+    
+    return schema
+
+
+def get_quote_schema(config_dir: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Get the quote schema of the current transformation configurations.
+    
+    The schema is rebuilt only when the configurations change.
+    
+    Args:
+        config_dir: Directory containing configuration files (default: algorithms/pipeline)
+    
+    Returns:
+        Quote schema, see build_quote_schema
+    """
+    category_config, banding_config = load_transformation_configs(config_dir)
+    key = (config_hash(category_config), config_hash(banding_config))
+    
+    schema = _SCHEMA_CACHE.get(key)
+    if schema is None:
+        schema = build_quote_schema(category_config, banding_config)
+        _SCHEMA_CACHE[key] = schema
+    return schema
+
+
+def describe_range(spec: Dict[str, Any]) -> str:
+    """
+    Describe the allowed range of a numeric column in interval notation.
+    
+    Args:
+        spec: Schema specification of a numeric column
+    
+    Returns:
+        Interval such as "[0, 999)"
+    """
+    opening = "[" if spec["min_inclusive"] else "("
+    closing = ")" if spec["max_exclusive"] else "]"
+    return f"{opening}{spec['min']}, {spec['max']}{closing}"
+
+
+def _coerce_number(df: pl.DataFrame, column: str) -> pl.Expr:
+    """
+    Get the expression reading a column as numbers.
+    
+    Numeric columns are used as they are; other columns (such as a column of
+    mixed strings and numbers) are parsed, and values that are not numbers become null.
+    """
+    if df.schema[column].is_numeric():
+        return pl.col(column)
+    return pl.col(column).cast(pl.String).cast(pl.Float64, strict=False)
+
+
+def build_error_expressions(df: pl.DataFrame, schema: Dict[str, Dict[str, Any]]) -> List[pl.Expr]:
+    """
+    Build one expression per schema column giving the error message of each row.
+    
+    Args:
+        df: DataFrame of raw quotes
+        schema: Quote schema
+    
+    Returns:
+        List of String expressions, null where the row's value is valid
+    """
+    expressions = []
+    for column, spec in schema.items():
+        # Missing required columns invalidate every row
+        if column not in df.columns:
+            if spec["required"]:
+                expressions.append(pl.lit(f"{column}: field required"))
+            continue
+        
+        value = pl.col(column)
+        missing = value.is_null() if spec["required"] else pl.lit(False)
+        
+        if spec["type"] == "number":
+            number = _coerce_number(df, column)
+            below = number < spec["min"] if spec["min_inclusive"] else number <= spec["min"]
+            above = number >= spec["max"] if spec["max_exclusive"] else number > spec["max"]
+            error = (
+                pl.when(missing).then(pl.lit(f"{column}: field required"))
+                .when(value.is_not_null() & number.is_null()).then(pl.format(f"{column}: {{}} is not a number", value.cast(pl.String)))
+                .when(below | above).then(pl.format(f"{column}: {{}} is outside {describe_range(spec)}", value.cast(pl.String)))
+            )
+        elif df.schema[column] in (pl.String, pl.Null) or isinstance(df.schema[column], (pl.Categorical, pl.Enum)):
+            error = pl.when(missing).then(pl.lit(f"{column}: field required"))
+        else:
+            error = (
+                pl.when(missing).then(pl.lit(f"{column}: field required"))
+                .when(value.is_not_null()).then(pl.format(f"{column}: {{}} is not a string", value.cast(pl.String)))
+            )
+        
+        expressions.append(error.alias(column))
+    
+    return expressions
+
+
+def validate_quotes(df: pl.DataFrame, schema: Optional[Dict[str, Dict[str, Any]]] = None) -> pl.DataFrame:
+    """
+    Validate a batch of raw quotes against the quote schema.
+    
+    All columns of all rows are checked in a single pass over the frame.
+    
+    Args:
+        df: DataFrame of raw quotes
+        schema: Quote schema (default: the schema of the current configurations)
+    
+    Returns:
+        DataFrame of the invalid rows, with their position in the input ("row")
+        and the list of their error messages ("errors"); empty if all rows are valid
+    """
+    schema = schema if schema is not None else get_quote_schema()
+    
+    expressions = build_error_expressions(df, schema)
+    if not expressions or df.height == 0:
+        return pl.DataFrame(schema={ROW_COLUMN: pl.UInt32, "errors": pl.List(pl.String)})
+    
+    return (
+        df.select(pl.concat_list(expressions).list.drop_nulls().alias("errors"))
+        .with_row_index(ROW_COLUMN)
+        .filter(pl.col("errors").list.len() > 0)
+    )
+
+
+def split_valid_quotes(
+    df: pl.DataFrame,
+    schema: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Tuple[pl.DataFrame, pl.DataFrame]:
+    """
+    Separate the valid quotes of a batch from the invalid ones.
+    
+    Numeric columns that were read as strings (for example because some quotes
+    had text in them) are cast to numbers in the valid quotes, so they can be banded.
+    Columns whose valid values are all whole numbers are cast to integers, the type
+    they are read as when no quote has text in them.
+    
+    Args:
+        df: DataFrame of raw quotes
+        schema: Quote schema (default: the schema of the current configurations)
+    
+    Returns:
+        Tuple of (valid quotes, validation report of the invalid rows as returned
+        by validate_quotes)
+    """
+    schema = schema if schema is not None else get_quote_schema()
+    
+    invalid = validate_quotes(df, schema)
+    if invalid.height:
+        df = df.filter(~pl.int_range(pl.len(), dtype=pl.UInt32).is_in(invalid[ROW_COLUMN].implode()))
+    
+    numbers = [
+        column for column, spec in schema.items()
+        if spec["type"] == "number" and column in df.columns and not df.schema[column].is_numeric()
+    ]
+    if numbers:
+        df = df.with_columns([_coerce_number(df, column) for column in numbers])
+        whole = df.select([(pl.col(column).round() == pl.col(column)).all() for column in numbers]).row(0)
+        integers = [pl.col(column).cast(pl.Int64) for column, is_whole in zip(numbers, whole) if is_whole]
+        if integers:
+            df = df.with_columns(integers)
+    
+    return df, invalid
@@ -0,0 +1,200 @@
+"""Streaming batch rating for files larger than memory."""
+
+import os
+import time
+import uuid
+import polars as pl
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence
+
+from algorithms.pipeline.data_processor import process_data, get_input_columns, get_rating_columns
+from algorithms.pipeline.utils import iter_data_batches
+from algorithms.pipeline.validation import split_valid_quotes
+from algorithms.rating.rating_engine import rate_policies
+from algorithms.rating.output_writer import RatedDatasetWriter, DEFAULT_ROW_GROUP_SIZE, validate_compression
+
+
+# Output formats supported by write_rated_batches, keyed by file extension
+OUTPUT_FORMATS = {
+    ".parquet": "parquet",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+
+
+def rate_batches(batches: Iterable[pl.DataFrame], stats: Optional[Dict[str, Any]] = None) -> Iterator[pl.DataFrame]:
+    """
+    Run the pipeline and rating engine on the valid quotes of each batch of raw quotes.
+    
+    Each batch is validated in one vectorized pass; quotes that fail validation
+    are counted and skipped. Only the pipeline stages that produce the rating keys
+    and band columns are run, and their outputs are cached so that re-rating the
+    same data skips them.
+    
+    Args:
+        batches: Iterable of DataFrames of raw quotes
+        stats: Optional dictionary updated with the "rows_read", "rows_invalid",
+               "rows_rated" and "batches" counts as batches are rated
+        
+    Yields:
+        Rated DataFrame for each batch
+    """
+    required_columns = get_rating_columns()
+    
+    for batch in batches:
+        valid, invalid = split_valid_quotes(batch)
+        transformed = process_data(valid, required_columns=required_columns, use_cache=True)
+        rated = rate_policies(transformed, by_cell=True)
+        
+        if stats is not None:
+            stats["rows_read"] = stats.get("rows_read", 0) + batch.height
+            stats["rows_invalid"] = stats.get("rows_invalid", 0) + invalid.height
+            stats["rows_rated"] = stats.get("rows_rated", 0) + rated.height
+            stats["batches"] = stats.get("batches", 0) + 1
+        
+        yield rated
+
+
+def write_rated_batches(
+    batches: Iterable[pl.DataFrame],
+    output_path: str,
+    partition_by: Sequence[str] = (),
+    compression: str = "zstd",
+    compression_level: Optional[int] = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    append: bool = False
+) -> int:
+    """
+    Stream rated batches to a Parquet or NDJSON file, or to a Parquet dataset directory.
+    
+    Each batch is written as it arrives, so only one batch (per partition, for
+    datasets) is held in memory. Later batches are cast to the schema of the first.
+    The output is written to a temporary path and renamed into place once complete,
+    so an interrupted run never leaves a truncated output behind.
+    
+    Args:
+        batches: Iterable of rated DataFrames
+        output_path: Output file path, whose extension sets the format, or dataset
+                     directory (a path without a file extension)
+        partition_by: Columns to hive-partition the dataset by, e.g. ["Area"]
+        compression: Parquet compression codec
+        compression_level: Parquet compression level (default: the codec's default)
+        row_group_size: Rows per Parquet row group
+        append: Add the rows to an existing dataset instead of replacing it
+        
+    Returns:
+        Number of rows written
+        
+    Raises:
+        ValueError: If the output extension or the compression is not supported, or
+                    partitioning or appending is requested for a single file
+    """
+    extension = os.path.splitext(output_path)[1].lower()
+    if not extension or partition_by or append:
+        if extension:
+            raise ValueError(f"Partitioned and appended outputs are dataset directories, not files: {output_path}")
+        
+        with RatedDatasetWriter(
+            output_path,
+            partition_by=partition_by,
+            compression=compression,
+            compression_level=compression_level,
+            row_group_size=row_group_size,
+            mode="append" if append else "overwrite"
+        ) as writer:
+            for batch in batches:
+                writer.write(batch)
+        return writer.stats["rows"]
+    
+    output_format = OUTPUT_FORMATS.get(extension)
+    if output_format is None:
+        raise ValueError(f"Unsupported output format: {output_path} (use .parquet, .ndjson, .jsonl or a directory)")
+    validate_compression(compression, compression_level)
+    
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    
+    rows = 0
+    schema = None
+    temp_path = os.path.join(output_dir, f".{os.path.basename(output_path)}.tmp-{uuid.uuid4().hex[:12]}")
+    
+    try:
+        if output_format == "parquet":
+            import pyarrow.parquet as pq
+            
+            writer = None
+            try:
+                for batch in batches:
+                    schema = schema or batch.schema
+                    table = batch.cast(schema).to_arrow()
+                    if writer is None:
+                        writer = pq.ParquetWriter(
+                            temp_path,
+                            table.schema,
+                            compression=compression,
+                            compression_level=compression_level
+                        )
+                    writer.write_table(table, row_group_size=row_group_size)
+                    rows += batch.height
+            finally:
+                if writer is not None:
+                    writer.close()
+            if writer is None:
+                # No rated rows: still write a valid (empty) file
+                pl.DataFrame().write_parquet(temp_path)
+        else:
+            with open(temp_path, 'wb') as f:
+                for batch in batches:
+                    schema = schema or batch.schema
+                    batch.cast(schema).write_ndjson(f)
+                    rows += batch.height
+        
+        os.replace(temp_path, output_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    
+    return rows
+
+
+def rate_file(
+    input_path: str,
+    output_path: str,
+    chunk_size: int = 100_000,
+    filters: Optional[Dict[str, Any]] = None,
+    all_columns: bool = False,
+    **write_options: Any
+) -> Dict[str, Any]:
+    """
+    Rate a quote file in chunks and stream the rated rows to an output file.
+    
+    Memory use is bounded by the chunk size, regardless of the input size. Only
+    the columns the pipeline reads are loaded from the input, and for Parquet
+    inputs the filters skip partitions and row groups by their statistics.
+    
+    Args:
+        input_path: NDJSON (.ndjson, .jsonl) or Parquet file of raw quotes, or a
+                    directory of Parquet files
+        output_path: Parquet or NDJSON output file, or Parquet dataset directory
+        chunk_size: Number of quotes rated at a time
+        filters: Dictionary mapping columns to a value or a list of allowed values,
+                 e.g. {"Region": "Centre"}
+        all_columns: Read every input column and pass the extra columns through
+                     to the output
+        **write_options: Output options passed to write_rated_batches
+                         (partition_by, compression, compression_level,
+                         row_group_size, append)
+        
+    Returns:
+        Dictionary with the "rows_read", "rows_invalid", "rows_rated", "rows_written"
+        and "batches" counts and the elapsed "seconds"
+    """
+    start = time.perf_counter()
+    stats = {"rows_read": 0, "rows_invalid": 0, "rows_rated": 0, "batches": 0}
+    
+    columns = None if all_columns else get_input_columns()
+    batches = iter_data_batches(input_path, chunk_size, columns=columns, filters=filters)
+    stats["rows_written"] = write_rated_batches(rate_batches(batches, stats), output_path, **write_options)
+    stats["seconds"] = time.perf_counter() - start
+    
+    return stats
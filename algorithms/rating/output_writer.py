@@ -0,0 +1,327 @@
+"""Rated output writer: partitioned, compressed Parquet datasets with atomic commits."""
+
+import os
+import uuid
+import shutil
+import polars as pl
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from algorithms.pipeline.utils import hive_partition_path
+
+
+# Parquet compression codecs and the range of their compression levels
+# (None when the codec has no levels)
+COMPRESSION_LEVELS = {
+    "zstd": (1, 22),
+    "gzip": (0, 9),
+    "brotli": (0, 11),
+    "lz4": None,
+    "snappy": None,
+    "uncompressed": None,
+}
+
+# Write modes: replace the dataset, add files to it, or refuse to touch an existing one
+WRITE_MODES = ("overwrite", "append", "error")
+
+# Rows per row group: large enough for efficient scans, small enough that
+# row-group statistics can skip parts of a partition
+DEFAULT_ROW_GROUP_SIZE = 128 * 1024
+
+# Rows buffered across all partitions before the largest buffers are flushed early
+DEFAULT_MAX_BUFFERED_ROWS = 1_000_000
+
+
+def validate_compression(compression: str, compression_level: Optional[int] = None) -> None:
+    """
+    Check a compression codec and level.
+    
+    Args:
+        compression: Parquet compression codec
+        compression_level: Compression level, for codecs that have levels
+    
+    Raises:
+        ValueError: If the codec is unknown or the level is not valid for it
+    """
+    if compression not in COMPRESSION_LEVELS:
+        raise ValueError(f"Unknown compression {compression!r} (use one of {', '.join(COMPRESSION_LEVELS)})")
+    
+    levels = COMPRESSION_LEVELS[compression]
+    if compression_level is None:
+        return
+    if levels is None:
+        raise ValueError(f"Compression {compression!r} does not take a level")
+    if not levels[0] <= compression_level <= levels[1]:
+        raise ValueError(f"Compression level for {compression!r} must be between {levels[0]} and {levels[1]}")
+
+
+def read_dataset_schema(output_dir: str, partition_by: Sequence[str] = ()) -> Optional[pl.Schema]:
+    """
+    Read the schema of the files of an existing dataset.
+    
+    Args:
+        output_dir: Dataset directory
+        partition_by: Partition columns, which are not stored in the files
+    
+    Returns:
+        Schema of the data columns, or None if the dataset has no files
+    """
+    for root, _, names in os.walk(output_dir):
+        for name in sorted(names):
+            if name.endswith(".parquet"):
+                schema = pl.read_parquet_schema(os.path.join(root, name))
+                return pl.Schema({column: dtype for column, dtype in schema.items() if column not in partition_by})
+    return None
+
+
+class RatedDatasetWriter:
+    """
+    Write rated batches to a (hive-partitioned) Parquet dataset directory.
+    
+    Rows are buffered per partition and written in full row groups, to one file per
+    partition and run. Files are written to a staging directory next to the dataset
+    and only moved into place on commit, so readers never see a half-written file:
+    
+        with RatedDatasetWriter("rated/", partition_by=["Area"], mode="append") as writer:
+            for batch in rated_batches:
+                writer.write(batch)
+    
+    In overwrite mode the previous dataset is replaced as a whole, in a single rename.
+    In append mode the run's files are moved next to the existing ones one at a time
+    (the batches must have the same columns as the dataset), so a reader listing the
+    dataset during the commit may see some of the run's partitions but not others.
+    Leaving the context with an exception discards the run.
+    """
+    
+    def __init__(
+        self,
+        output_dir: str,
+        partition_by: Sequence[str] = (),
+        compression: str = "zstd",
+        compression_level: Optional[int] = None,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        mode: str = "overwrite",
+        max_buffered_rows: int = DEFAULT_MAX_BUFFERED_ROWS
+    ):
+        """
+        Initialize the writer.
+        
+        Args:
+            output_dir: Dataset directory
+            partition_by: Columns to partition by, e.g. ["Area"] or ["Region"]
+            compression: Parquet compression codec
+            compression_level: Compression level (default: the codec's default)
+            row_group_size: Rows per row group
+            mode: "overwrite", "append" or "error" (fail if the dataset exists)
+            max_buffered_rows: Rows buffered across partitions before flushing early
+        
+        Raises:
+            ValueError: If the mode, compression or row group size is invalid
+            FileExistsError: If mode is "error" and the dataset is not empty
+        """
+        if mode not in WRITE_MODES:
+            raise ValueError(f"Unknown write mode {mode!r} (use one of {', '.join(WRITE_MODES)})")
+        if row_group_size < 1:
+            raise ValueError("row_group_size must be positive")
+        validate_compression(compression, compression_level)
+        
+        self.output_dir = os.path.abspath(output_dir.rstrip(os.sep))
+        self.partition_by = list(partition_by)
+        self.compression = compression
+        self.compression_level = compression_level
+        self.row_group_size = row_group_size
+        self.mode = mode
+        self.max_buffered_rows = max(max_buffered_rows, row_group_size)
+        
+        exists = os.path.isdir(self.output_dir) and bool(os.listdir(self.output_dir))
+        if mode == "error" and exists:
+            raise FileExistsError(f"Output dataset is not empty: {output_dir}")
+        
+        # Appended batches are cast to the schema of the existing files
+        self.schema = read_dataset_schema(self.output_dir, self.partition_by) if mode == "append" and exists else None
+        
+        self.run_id = uuid.uuid4().hex[:12]
+        parent, name = os.path.split(self.output_dir)
+        self.staging_dir = os.path.join(parent, f".{name}.staging-{self.run_id}")
+        os.makedirs(self.staging_dir)
+        
+        self.stats = {"rows": 0, "files": 0, "row_groups": 0, "bytes": 0}
+        self._writers: Dict[Tuple[Any, ...], Any] = {}
+        self._buffers: Dict[Tuple[Any, ...], List[pl.DataFrame]] = {}
+        self._buffered_rows: Dict[Tuple[Any, ...], int] = {}
+        self._closed = False
+    
+    def __enter__(self) -> "RatedDatasetWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+    
+    def write(self, df: pl.DataFrame) -> None:
+        """
+        Buffer a batch of rated rows, writing full row groups as they fill up.
+        
+        Args:
+            df: Rated DataFrame; must contain the partition columns
+        
+        Raises:
+            ValueError: If partition columns are missing, or appended rows do not
+                        have the columns of the existing dataset
+        """
+        if self._closed:
+            raise ValueError("Writer is already committed or aborted")
+        if df.height == 0:
+            return
+        
+        missing = [column for column in self.partition_by if column not in df.columns]
+        if missing:
+            raise ValueError(f"Rated rows have no partition columns {missing}")
+        
+        if self.partition_by:
+            partitions = df.partition_by(self.partition_by, as_dict=True, include_key=False)
+        else:
+            partitions = {(): df}
+        
+        for key, part in partitions.items():
+            part = self._conform(part)
+            self._buffers.setdefault(key, []).append(part)
+            self._buffered_rows[key] = self._buffered_rows.get(key, 0) + part.height
+            if self._buffered_rows[key] >= self.row_group_size:
+                self._flush(key, final=False)
+        
+        # Bound memory across many partitions by flushing the largest buffers early
+        while sum(self._buffered_rows.values()) > self.max_buffered_rows:
+            self._flush(max(self._buffered_rows, key=self._buffered_rows.get), final=True)
+    
+    def _conform(self, part: pl.DataFrame) -> pl.DataFrame:
+        """
+        Cast a partition's rows to the dataset schema (the first batch's, or the
+        existing dataset's when appending).
+        """
+        if self.schema is None:
+            self.schema = part.schema
+            return part
+        
+        if set(part.columns) != set(self.schema.names()):
+            raise ValueError(
+                f"Rated rows have columns {sorted(part.columns)}, "
+                f"but the dataset has {sorted(self.schema.names())}"
+            )
+        return part.select(self.schema.names()).cast(dict(self.schema))
+    
+    def _flush(self, key: Tuple[Any, ...], final: bool) -> None:
+        """
+        Write the buffered rows of a partition: full row groups only, or everything
+        when final is set.
+        """
+        buffered = pl.concat(self._buffers.pop(key, []))
+        self._buffered_rows.pop(key, None)
+        
+        full_rows = buffered.height if final else buffered.height - buffered.height % self.row_group_size
+        if full_rows:
+            self._write_rows(key, buffered.slice(0, full_rows))
+        
+        remainder = buffered.slice(full_rows)
+        if remainder.height:
+            self._buffers[key] = [remainder]
+            self._buffered_rows[key] = remainder.height
+    
+    def _write_rows(self, key: Tuple[Any, ...], rows: pl.DataFrame) -> None:
+        """
+        Write rows to the partition's staged file, opening it on first use.
+        """
+        import pyarrow.parquet as pq
+        
+        table = rows.to_arrow()
+        writer = self._writers.get(key)
+        if writer is None:
+            partition_dir = os.path.join(self.staging_dir, hive_partition_path(self.partition_by, key)) if key else self.staging_dir
+            os.makedirs(partition_dir, exist_ok=True)
+            writer = pq.ParquetWriter(
+                os.path.join(partition_dir, f"part-{self.run_id}.parquet"),
+                table.schema,
+                compression=self.compression,
+                compression_level=self.compression_level
+            )
+            self._writers[key] = writer
+            self.stats["files"] += 1
+        
+        writer.write_table(table, row_group_size=self.row_group_size)
+        self.stats["rows"] += rows.height
+        self.stats["row_groups"] += -(-rows.height // self.row_group_size)
+    
+    def _close_files(self) -> None:
+        """
+        Flush all buffers and close the staged files.
+        """
+        for key in list(self._buffers):
+            self._flush(key, final=True)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+    
+    def commit(self) -> Dict[str, int]:
+        """
+        Finish the run and move its files into the dataset.
+        
+        Returns:
+            Dictionary with the "rows", "files", "row_groups" and "bytes" written
+        """
+        if self._closed:
+            raise ValueError("Writer is already committed or aborted")
+        self._closed = True
+        
+        try:
+            self._close_files()
+            self.stats["bytes"] = sum(
+                os.path.getsize(os.path.join(root, name))
+                for root, _, names in os.walk(self.staging_dir) for name in names
+            )
+            
+            if self.mode == "append" and os.path.isdir(self.output_dir):
+                # Move each staged file into place; each file appears atomically, but
+                # the run as a whole does not
+                for root, _, names in os.walk(self.staging_dir):
+                    target_dir = os.path.join(self.output_dir, os.path.relpath(root, self.staging_dir))
+                    for name in names:
+                        os.makedirs(target_dir, exist_ok=True)
+                        os.replace(os.path.join(root, name), os.path.join(target_dir, name))
+                shutil.rmtree(self.staging_dir)
+            else:
+                # Swap the whole dataset directory for the staged one
+                previous_dir = None
+                if os.path.exists(self.output_dir):
+                    previous_dir = f"{self.staging_dir}.previous"
+                    os.replace(self.output_dir, previous_dir)
+                try:
+                    os.replace(self.staging_dir, self.output_dir)
+                except BaseException:
+                    # Put the previous dataset back
+                    if previous_dir is not None:
+                        os.replace(previous_dir, self.output_dir)
+                    raise
+                if previous_dir is not None:
+                    shutil.rmtree(previous_dir, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(self.staging_dir, ignore_errors=True)
+            raise
+        
+        return self.stats
+    
+    def abort(self) -> None:
+        """
+        Discard the run, leaving the dataset as it was.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        
+        for writer in self._writers.values():
+            try:
+                writer.close()
+            except Exception:
+                pass
+        self._writers.clear()
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
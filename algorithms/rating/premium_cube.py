@@ -0,0 +1,256 @@
+"""Precomputed premium lookup cube for constant-time single quotes."""
+
+import bisect
+import itertools
+import polars as pl
+from typing import Any, Dict, List, Optional
+
+from algorithms.pipeline.utils import load_transformation_configs
+from algorithms.pipeline.stages import get_pipeline_stages, select_stages
+from algorithms.pipeline.validation import get_rated_columns
+from algorithms.pipeline.additional_transforms import transform_data, TRANSFORM_INPUTS
+from algorithms.rating.rating_engine import RATING_PLAN, calculate_premium, get_rating_key_columns
+from algorithms.rating.utils.table_loader import load_rating_table
+
+
+def _compile_band_lookup(source_column: str, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compile a banding configuration into a lookup that bands a single value with bisect.
+    
+    Args:
+        source_column: Name of the continuous column being banded
+        config: Banding configuration of the column from continuous-banding.json
+        
+    Returns:
+        Dictionary with the sorted band bounds, labels and inclusivity settings
+    """
+    bands = sorted(config.get("bands", []), key=lambda band: band["min"])
+    return {
+        "source_column": source_column,
+        "mins": [band["min"] for band in bands],
+        "maxs": [band["max"] for band in bands],
+        "labels": [band["label"] for band in bands],
+        "min_inclusive": config.get("min_inclusive", True),
+        "max_exclusive": config.get("max_exclusive", True),
+    }
+
+
+def _band_value(lookup: Dict[str, Any], value: Any) -> Optional[str]:
+    """
+    Find the band label of a single value.
+    
+    Args:
+        lookup: Band lookup from _compile_band_lookup
+        value: Value of the continuous column
+        
+    Returns:
+        Band label or None if the value is not in any band
+    """
+    if value is None:
+        return None
+    
+    # Candidate band: the last band whose lower bound is at or below the value
+    i = bisect.bisect_right(lookup["mins"], value) - 1
+    
+    # With exclusive lower bounds a value equal to a lower bound belongs to the band before
+    if i >= 0 and not lookup["min_inclusive"] and value == lookup["mins"][i]:
+        i -= 1
+    if i < 0:
+        return None
+    
+    max_val = lookup["maxs"][i]
+    in_band = value < max_val if lookup["max_exclusive"] else value <= max_val
+    return lookup["labels"][i] if in_band else None
+
+
+def find_bypassed_stages(config_dir: Optional[str] = None) -> List[str]:
+    """
+    Find the custom pipeline stages that the cube would bypass.
+    
+    The cube bands and indexes the raw quote itself, so a stage that may change a
+    column the rating plan reads would be skipped by a cube lookup. The
+    transform_data hook is taken to change at most the columns in TRANSFORM_INPUTS;
+    custom stages are checked by their declared outputs.
+    
+    Args:
+        config_dir: Directory containing configuration files (default: algorithms/pipeline)
+        
+    Returns:
+        Names of the stages that may change the premium, empty if the cube is
+        equivalent to the pipeline
+    """
+    category_config, banding_config = load_transformation_configs(config_dir)
+    stages = get_pipeline_stages(
+        category_config,
+        banding_config,
+        transform_hook=transform_data,
+        transform_inputs=TRANSFORM_INPUTS
+    )
+    key_columns = get_rating_key_columns()
+    rated_columns = set(get_rated_columns(category_config, banding_config)) | set(key_columns)
+    
+    bypassed = []
+    for stage in select_stages(stages, key_columns):
+        if stage["name"] in ("continuous_banding", "category_mapping"):
+            continue
+        changed = stage["inputs"] if stage["name"] == "additional_transforms" else stage["outputs"]
+        if changed is None or rated_columns.intersection(changed):
+            bypassed.append(stage["name"])
+    return bypassed
+
+
+def build_premium_cube(
+    config_dir: Optional[str] = None,
+    tables_dir: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Precompute the rating output for every cell of the rating space.
+    
+    The rating space is the Cartesian product of the levels of the rating key columns:
+    band labels from continuous-banding.json for banded columns, and the keys of the
+    rating tables for categorical columns. The outputs are stored as dense, flat
+    row-major arrays, one per rating column added by calculate_premium.
+    
+    Args:
+        config_dir: Directory containing the pipeline configuration files (default: algorithms/pipeline)
+        tables_dir: Directory containing the rating tables (default: algorithms/rating/tables)
+        
+    Returns:
+        Premium cube dictionary, or None if the rating plan has a key column that is
+        neither banded nor categorical (a truly continuous term), in which case
+        quotes must go through the normal rating engine
+    """
+    _, banding_config = load_transformation_configs(config_dir)
+    band_configs = {
+        config.get("column_name", f"{column}Band"): (column, config)
+        for column, config in banding_config.items()
+    }
+    
+    dimensions = get_rating_key_columns()
+    levels = {}
+    band_lookups = {}
+    
+    for dimension in dimensions:
+        if dimension in band_configs:
+            source_column, config = band_configs[dimension]
+            band_lookups[dimension] = _compile_band_lookup(source_column, config)
+            levels[dimension] = list(dict.fromkeys(band_lookups[dimension]["labels"]))
+            continue
+        
+        # Categorical dimension: its levels are the keys of the tables that use it
+        dimension_levels = []
+        for step in RATING_PLAN:
+            if dimension not in step["join_columns"]:
+                continue
+            table = load_rating_table(step["table"], tables_dir)
+            if table.schema[dimension] != pl.String:
+                return None
+            dimension_levels.extend(table.get_column(dimension).unique(maintain_order=True).to_list())
+        levels[dimension] = list(dict.fromkeys(dimension_levels))
+    
+    # Rate every cell of the Cartesian product at once
+    cells = pl.DataFrame(
+        list(itertools.product(*(levels[dimension] for dimension in dimensions))),
+        schema=dimensions,
+        orient="row"
+    )
+    rated_cells = calculate_premium(cells)
+    output_columns = [col for col in rated_cells.columns if col not in dimensions]
+    
+    # Position of each cell in the flat row-major arrays
+    positions = {dimension: {level: i for i, level in enumerate(levels[dimension])} for dimension in dimensions}
+    strides = []
+    stride = 1
+    for dimension in reversed(dimensions):
+        strides.insert(0, stride)
+        stride *= len(levels[dimension])
+    
+    offsets = rated_cells.select(
+        pl.sum_horizontal(
+            pl.col(dimension).replace_strict(positions[dimension]) * stride
+            for dimension, stride in zip(dimensions, strides)
+        )
+    ).to_series().to_list()
+    
+    # Unrated cells (no matching row in a rating table) stay None
+    values = {}
+    for column in output_columns:
+        column_values = [None] * stride
+        for offset, value in zip(offsets, rated_cells.get_column(column).to_list()):
+            column_values[offset] = value
+        values[column] = column_values
+    
+    return {
+        "dimensions": dimensions,
+        "levels": levels,
+        "positions": positions,
+        "strides": strides,
+        "band_lookups": band_lookups,
+        "values": values,
+    }
+
+
+def lookup_quote(cube: Dict[str, Any], quote: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Look up the rating outputs of a single raw quote in the premium cube.
+    
+    Args:
+        cube: Premium cube from build_premium_cube
+        quote: Raw quote data (before banding)
+        
+    Returns:
+        Dictionary with the rating columns of the quote's cell, or None if the quote
+        falls outside the cube and must be rated by the normal engine
+    """
+    offset = 0
+    for dimension, stride in zip(cube["dimensions"], cube["strides"]):
+        lookup = cube["band_lookups"].get(dimension)
+        if lookup is not None:
+            level = _band_value(lookup, quote.get(lookup["source_column"]))
+        else:
+            level = quote.get(dimension)
+        
+        position = cube["positions"][dimension].get(level)
+        if position is None:
+            return None
+        offset += position * stride
+    
+    details = {column: values[offset] for column, values in cube["values"].items()}
+    if any(value is None for value in details.values()):
+        return None
+    return details
+
+
+def check_premium_cube(cube: Dict[str, Any], raw_df: pl.DataFrame, rated_df: pl.DataFrame) -> Dict[str, Any]:
+    """
+    Check the premium cube against the normal rating engine.
+    
+    Args:
+        cube: Premium cube from build_premium_cube
+        raw_df: Raw quotes (before process_data)
+        rated_df: Result of rate_policies(process_data(raw_df)) for the same quotes
+        
+    Returns:
+        Dictionary with the number of quotes "checked", the number of quotes that
+        fell "outside" the cube and the "mismatches" (list of rows whose cube
+        lookup differs from the engine)
+    """
+    rating_columns = list(cube["values"].keys())
+    engine_rows = {}
+    for row in rated_df.iter_rows(named=True):
+        key = tuple(row[col] for col in raw_df.columns)
+        engine_rows[key] = {col: row[col] for col in rating_columns}
+    
+    outside = 0
+    mismatches = []
+    for quote in raw_df.iter_rows(named=True):
+        details = lookup_quote(cube, quote)
+        expected = engine_rows.get(tuple(quote[col] for col in raw_df.columns))
+        if details is None:
+            outside += 1
+            if expected is not None:
+                mismatches.append({"quote": quote, "cube": None, "engine": expected})
+        elif details != expected:
+            mismatches.append({"quote": quote, "cube": details, "engine": expected})
+    
+    return {"checked": raw_df.height, "outside": outside, "mismatches": mismatches}
@@ -1,9 +1,78 @@
 """Rating engine for calculating insurance premiums."""
 
 import polars as pl
+from typing import Dict, Iterable, List, Optional, Tuple
 from algorithms.rating.utils.table_loader import load_and_join_rating_table
 
 
+# Rating plan: each step joins a rating table on its key columns and multiplies
+# the running premium by the table's factor column. Steps are applied in order,
+# and the premium column of the last step is the final premium.
+RATING_PLAN = [
+    {
+        "table": "Area",
+        "join_columns": ["Area"],
+        "factor_column": "Area_base",
+        "premium_column": "base_premium",
+    },
+    {
+        "table": "VehAge_rating",
+        "join_columns": ["VehAgeBand"],
+        "factor_column": "VehAge_rating",
+        "premium_column": "premium_after_veh_age",
+    },
+    {
+        "table": "VehPower_x_DrivAge",
+        "join_columns": ["VehPowerBand", "DrivAgeBand"],
+        "factor_column": "VehPower_x_DrivAge_rating",
+        "premium_column": "final_premium",
+    },
+]
+
+
+def get_rating_key_columns() -> List[str]:
+    """
+    Get the columns that premiums depend on according to the rating plan.
+    
+    Returns:
+        List of the join columns of all rating plan steps, in plan order
+    """
+    key_columns = []
+    for step in RATING_PLAN:
+        for column in step["join_columns"]:
+            if column not in key_columns:
+                key_columns.append(column)
+    return key_columns
+
+
+def apply_premium_steps(df: pl.DataFrame, start_step: int = 0) -> pl.DataFrame:
+    """
+    Calculate the premium columns of the rating plan from the joined factor columns.
+    
+    Args:
+        df: DataFrame that already contains the factor columns of the rating plan
+        start_step: Index of the first plan step to recalculate. The premium column
+                    of the previous step must already be present in the DataFrame.
+        
+    Returns:
+        DataFrame with the premium columns from start_step onwards recalculated
+    """
+    previous_column = RATING_PLAN[start_step - 1]["premium_column"] if start_step > 0 else None
+    
+    for step in RATING_PLAN[start_step:]:
+        premium = pl.col(step["factor_column"])
+        if previous_column is not None:
+            premium = pl.col(previous_column) * premium
+        
+        df = df.with_columns(premium.alias(step["premium_column"]))
+        previous_column = step["premium_column"]
+    
+    # Round the final premium to 2 decimal places
+    return df.with_columns(
+        pl.col(previous_column).round(2)
+    )
+
+
 def calculate_premium(df: pl.DataFrame) -> pl.DataFrame:
     """
     Calculate insurance premiums based on rating factors.
@@ -14,51 +83,144 @@ def calculate_premium(df: pl.DataFrame) -> pl.DataFrame:
     Returns:
         DataFrame with premium calculations added
     """
-    # Step 1: Join the Area rating table
-    df = load_and_join_rating_table(df, "Area", ["Area"])
+    # Step 1: Join the rating tables (Area, VehAge_rating, VehPower_x_DrivAge)
+    for step in RATING_PLAN:
+        df = load_and_join_rating_table(df, step["table"], step["join_columns"])
+    
+    # Step 2: Apply the factors in plan order (base premium, vehicle age,
+    # vehicle power and driver age) and round the final premium
+    return apply_premium_steps(df)
+
+
+def _get_changed_steps(changed_tables: Iterable[str]) -> List[int]:
+    """
+    Find the indices of the rating plan steps that use any of the changed tables.
+    
+    Args:
+        changed_tables: Names of the rating tables that changed (with or without .csv)
+        
+    Returns:
+        Sorted list of plan step indices
+    """
+    changed = {name[:-4] if name.endswith(".csv") else name for name in changed_tables}
+    return [i for i, step in enumerate(RATING_PLAN) if step["table"] in changed]
+
+
+def get_affected_columns(changed_tables: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Work out which rated columns depend on a set of changed rating tables.
     
-    # Step 2: Join the VehAge rating table
-    df = load_and_join_rating_table(df, "VehAge_rating", ["VehAgeBand"])
+    Args:
+        changed_tables: Names of the rating tables that changed (with or without .csv)
+        
+    Returns:
+        Dictionary with the "factor_columns" to reload and the "premium_columns"
+        to recalculate. Both lists are empty if no table in the plan changed.
+    """
+    changed_steps = _get_changed_steps(changed_tables)
     
-    # Step 3: Join the VehPower_x_DrivAge rating table
-    df = load_and_join_rating_table(df, "VehPower_x_DrivAge", ["VehPowerBand", "DrivAgeBand"])
+    if not changed_steps:
+        return {"factor_columns": [], "premium_columns": []}
     
-    # Step 4: Calculate the base premium
-    df = df.with_columns(
-        base_premium=pl.col("Area_base")
-    )
+    return {
+        "factor_columns": [RATING_PLAN[i]["factor_column"] for i in changed_steps],
+        "premium_columns": [step["premium_column"] for step in RATING_PLAN[min(changed_steps):]],
+    }
+
+
+def rerate_policies(
+    rated_df: pl.DataFrame,
+    changed_tables: Iterable[str],
+    tables_dir: Optional[str] = None
+) -> pl.DataFrame:
+    """
+    Incrementally re-rate an already rated DataFrame after rating tables changed.
     
-    # Step 5: Apply the vehicle age factor
-    df = df.with_columns(
-        premium_after_veh_age=pl.col("base_premium") * pl.col("VehAge_rating")
-    )
+    Only the factor columns of the changed tables are reloaded, and only the premium
+    columns from the first affected plan step onwards are recalculated. The banded
+    and indexed columns and all other factor columns are kept as they are.
     
-    # Step 6: Apply the vehicle power and driver age factor
-    df = df.with_columns(
-        final_premium=pl.col("premium_after_veh_age") * pl.col("VehPower_x_DrivAge_rating")
-    )
+    Args:
+        rated_df: DataFrame previously returned by rate_policies
+        changed_tables: Names of the rating tables that changed (with or without .csv)
+        tables_dir: Directory containing the rating tables (default: algorithms/rating/tables)
+        
+    Returns:
+        DataFrame with the same columns as rated_df and updated premiums
+    """
+    changed_steps = _get_changed_steps(changed_tables)
     
-    # Round the final premium to 2 decimal places
-    df = df.with_columns(
-        final_premium=pl.col("final_premium").round(2)
+    # Early return if none of the changed tables is used by the rating plan
+    if not changed_steps:
+        return rated_df
+    
+    # Drop the stale factor columns and join the new versions of the tables
+    df = rated_df.drop([RATING_PLAN[i]["factor_column"] for i in changed_steps])
+    for i in changed_steps:
+        step = RATING_PLAN[i]
+        df = load_and_join_rating_table(df, step["table"], step["join_columns"], tables_dir)
+    
+    # Recalculate the premium columns that depend on the changed factors
+    df = apply_premium_steps(df, start_step=min(changed_steps))
+    
+    # Keep the column order of the original rated DataFrame
+    return df.select(rated_df.columns)
+
+
+def rate_cells(df: pl.DataFrame) -> Tuple[pl.DataFrame, pl.Series]:
+    """
+    Rate each unique rating cell of a DataFrame once.
+    
+    The rating cells are the unique combinations of the rating plan's key columns,
+    so even a very large book collapses to a small cell table.
+    
+    Args:
+        df: Transformed DataFrame containing the rating key columns
+        
+    Returns:
+        Tuple of (cell table, cell index). The cell table holds the key columns,
+        a "cell_id" column and the rated factor and premium columns. The cell index
+        gives the cell_id of each row of df, or null if its cell could not be rated.
+    """
+    key_columns = get_rating_key_columns()
+    
+    # Rate the unique cells only
+    cells = df.select(key_columns).unique()
+    rated_cells = calculate_premium(cells).with_row_index("cell_id")
+    
+    # Look up the cell of every row, keeping the original row order
+    cell_index = (
+        df.select(key_columns)
+        .with_row_index("row")
+        .join(rated_cells.select(key_columns + ["cell_id"]), on=key_columns, how="left")
+        .sort("row")
+        .get_column("cell_id")
     )
     
-    return df
+    return rated_cells, cell_index
 
 
-def rate_policies(df: pl.DataFrame) -> pl.DataFrame:
+def rate_policies(df: pl.DataFrame, by_cell: bool = False) -> pl.DataFrame:
     """
     Main entry point for the rating engine.
     
     Args:
         input_df: Input DataFrame containing policy data
+        by_cell: Rate only the unique combinations of the rating key columns and join
+                 the premiums back, instead of joining every rating table to every row.
+                 The result is the same, but much cheaper for large books.
         
     Returns:
         DataFrame with calculated premiums
     """
     
     # Calculate premiums
-    rated_df = calculate_premium(df)
+    if by_cell:
+        key_columns = get_rating_key_columns()
+        rated_cells = calculate_premium(df.select(key_columns).unique())
+        rated_df = df.join(rated_cells, on=key_columns, how="inner")
+    else:
+        rated_df = calculate_premium(df)
     
     # Return the rated DataFrame
     return rated_df
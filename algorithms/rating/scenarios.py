@@ -0,0 +1,144 @@
+"""What-if scenario engine for rating factor sensitivities."""
+
+import polars as pl
+from typing import Any, Dict, List, Optional
+from algorithms.rating.rating_engine import RATING_PLAN, calculate_premium, get_rating_key_columns
+
+
+def build_rating_cells(df: pl.DataFrame, by: Optional[List[str]] = None) -> pl.DataFrame:
+    """
+    Collapse a banded DataFrame to its rating cells and rate each cell once.
+    
+    Premiums only depend on the rating key columns, so a large book collapses to a
+    small number of cells. The result can be cached and reused for any number of
+    scenario evaluations.
+    
+    Args:
+        df: Transformed (banded and indexed) DataFrame
+        by: Extra columns to keep in the cells for breaking down the results
+        
+    Returns:
+        DataFrame with one row per cell, the number of policies in the cell and
+        the rated factor and premium columns
+    """
+    group_columns = get_rating_key_columns()
+    for column in by or []:
+        if column not in group_columns:
+            group_columns.append(column)
+    
+    cells = df.group_by(group_columns).agg(pl.len().alias("policies"))
+    return calculate_premium(cells)
+
+
+def _scenario_premium(cells: pl.DataFrame, adjustments: List[Dict[str, Any]]) -> pl.Expr:
+    """
+    Build the premium expression of a scenario.
+    
+    Each adjustment multiplies the factor of one rating table, optionally only for
+    the cells matching its "where" conditions. The premium is then recalculated in
+    rating plan order and rounded, exactly as calculate_premium would with the
+    adjusted table.
+    
+    Args:
+        cells: Rated cells from build_rating_cells
+        adjustments: List of adjustments with "table", "factor" and optional "where"
+        
+    Returns:
+        Expression for the rounded final premium of each cell under the scenario
+    """
+    table_names = [step["table"] for step in RATING_PLAN]
+    factors = {step["table"]: pl.col(step["factor_column"]) for step in RATING_PLAN}
+    
+    for adjustment in adjustments:
+        table = adjustment["table"]
+        if table not in factors:
+            raise ValueError(f"Unknown rating table in scenario: {table} (expected one of {table_names})")
+        
+        condition = pl.lit(True)
+        for column, levels in adjustment.get("where", {}).items():
+            if column not in cells.columns:
+                raise ValueError(f"Unknown column in scenario condition: {column}")
+            if not isinstance(levels, (list, tuple, set)):
+                levels = [levels]
+            condition = condition & pl.col(column).is_in(list(levels))
+        
+        multiplier = pl.when(condition).then(pl.lit(adjustment["factor"])).otherwise(pl.lit(1.0))
+        factors[table] = factors[table] * multiplier
+    
+    premium = None
+    for step in RATING_PLAN:
+        factor = factors[step["table"]]
+        premium = factor if premium is None else premium * factor
+    
+    return premium.round(2)
+
+
+def evaluate_scenarios(
+    cells: pl.DataFrame,
+    scenarios: List[Dict[str, Any]],
+    by: Optional[List[str]] = None
+) -> pl.DataFrame:
+    """
+    Evaluate a set of rating table perturbations against the book in one pass.
+    
+    Each scenario is a dictionary with a "name" and a list of "adjustments", for example:
+    
+        {
+            "name": "Under25 +10%",
+            "adjustments": [
+                {"table": "VehPower_x_DrivAge", "where": {"DrivAgeBand": ["Under25"]}, "factor": 1.1}
+            ]
+        }
+    
+    Args:
+        cells: Rated cells from build_rating_cells (including any "by" columns)
+        scenarios: List of scenarios to evaluate
+        by: Columns to break the impact down by (default: whole portfolio)
+        
+    Returns:
+        Impact table with one row per scenario (and "by" level) containing the number of
+        policies, the base and scenario total premium, and the absolute and relative change;
+        empty if there are no scenarios
+    """
+    by = by or []
+    
+    # Without scenarios, evaluate a no-op one for the schema of the empty table
+    if not scenarios:
+        return evaluate_scenarios(cells, [{"name": "", "adjustments": []}], by).clear()
+    
+    premium_columns = [f"scenario_{i}" for i in range(len(scenarios))]
+    
+    # Weight every cell premium by its policy count and sum all scenarios at once
+    weighted = [
+        (pl.col("final_premium") * pl.col("policies")).alias("base_total")
+    ] + [
+        (_scenario_premium(cells, scenario.get("adjustments", [])) * pl.col("policies")).alias(column)
+        for scenario, column in zip(scenarios, premium_columns)
+    ]
+    totals = cells.lazy().select(by + ["policies"] + weighted)
+    if by:
+        totals = totals.group_by(by).agg(pl.all().sum())
+    else:
+        totals = totals.select(pl.all().sum())
+    totals = totals.collect()
+    
+    # Reshape into one row per scenario
+    impact = pl.concat([
+        totals.select(
+            pl.lit(i).alias("scenario_index"),
+            pl.lit(scenario.get("name", column)).alias("scenario"),
+            *by,
+            "policies",
+            pl.col("base_total").alias("base_premium"),
+            pl.col(column).alias("scenario_premium"),
+        )
+        for i, (scenario, column) in enumerate(zip(scenarios, premium_columns))
+    ])
+    
+    # Keep the scenarios in the order they were given
+    impact = impact.sort(["scenario_index"] + by).drop("scenario_index")
+    
+    return impact.with_columns(
+        (pl.col("scenario_premium") - pl.col("base_premium")).alias("premium_change"),
+        (pl.col("scenario_premium") / pl.col("base_premium") - 1).alias("pct_change"),
+    )
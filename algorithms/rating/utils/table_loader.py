@@ -1,8 +1,32 @@
-"""Utility function for loading rating tables from CSV files."""
+"""Utility functions for loading rating tables from CSV files."""
 
 import os
+import hashlib
 import polars as pl
-from typing import List, Optional
+from typing import Dict, List, Optional
+
+
+def load_rating_table(table_name: str, tables_dir: Optional[str] = None) -> pl.DataFrame:
+    """
+    Load a rating table from CSV.
+    
+    Args:
+        table_name: Name of the table file with or without the .csv extension
+        tables_dir: Directory containing the rating tables. If None, defaults to 
+                   algorithms/rating/tables
+    
+    Returns:
+        Polars DataFrame containing the rating table
+    """
+    if tables_dir is None:
+        # Default to the standard tables directory
+        tables_dir = os.path.join("algorithms", "rating", "tables")
+    
+    # Ensure the table name has the .csv extension
+    if not table_name.endswith(".csv"):
+        table_name = f"{table_name}.csv"
+    
+    return pl.read_csv(os.path.join(tables_dir, table_name))
 
 
 def load_and_join_rating_table(
@@ -24,18 +48,51 @@ def load_and_join_rating_table(
     Returns:
         Polars DataFrame with the rating table joined
     """
+    # Load the CSV file into a Polars DataFrame
+    rating_table = load_rating_table(table_name, tables_dir)
+    
+    # Join the rating table to the input dataframe
+    return df.join(rating_table, on=join_columns)
+
+
+def get_rating_table_hashes(tables_dir: Optional[str] = None) -> Dict[str, str]:
+    """
+    Compute a content hash for every rating table in the tables directory.
+    
+    Comparing the hashes of two points in time tells which tables changed, so that
+    only the affected columns need to be re-rated.
+    
+    Args:
+        tables_dir: Directory containing the rating tables. If None, defaults to 
+                   algorithms/rating/tables
+    
+    Returns:
+        Dictionary mapping table names (without .csv) to SHA-256 hex digests
+    """
     if tables_dir is None:
         # Default to the standard tables directory
         tables_dir = os.path.join("algorithms", "rating", "tables")
     
-    # Ensure the table name has the .csv extension
-    if not table_name.endswith(".csv"):
-        table_name = f"{table_name}.csv"
+    hashes = {}
+    for file_name in sorted(os.listdir(tables_dir)):
+        if not file_name.endswith(".csv"):
+            continue
+        with open(os.path.join(tables_dir, file_name), "rb") as f:
+            hashes[file_name[:-4]] = hashlib.sha256(f.read()).hexdigest()
     
-    file_path = os.path.join(tables_dir, table_name)
+    return hashes
+
+
+def find_changed_tables(old_hashes: Dict[str, str], new_hashes: Dict[str, str]) -> List[str]:
+    """
+    Compare two sets of rating table hashes and list the tables that changed.
     
-    # Load the CSV file into a Polars DataFrame
-    rating_table = pl.read_csv(file_path)
+    Args:
+        old_hashes: Hashes from an earlier call to get_rating_table_hashes
+        new_hashes: Hashes from a later call to get_rating_table_hashes
     
-    # Join the rating table to the input dataframe
-    return df.join(rating_table, on=join_columns) 
\ No newline at end of file
+    Returns:
+        Sorted list of table names that were added, removed or modified
+    """
+    table_names = set(old_hashes) | set(new_hashes)
+    return sorted(name for name in table_names if old_hashes.get(name) != new_hashes.get(name))
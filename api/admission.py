@@ -0,0 +1,284 @@
+"""
+Admission control for the API.
+
+This module decides which pricing requests are served, queued or rejected:
+
+- A token bucket per client (API key or address) rejects clients that exceed
+  their request rate with 429.
+- Pricing work runs in a limited number of slots. Waiting single quotes are
+  always served before waiting batches, and batches may only use part of the
+  slots, so a batch client cannot starve latency-sensitive quotes.
+- Queue waits are measured, CoDel-style: when even the shortest wait has stayed
+  above the target for a whole interval, the queue is overloaded and requests
+  are shed with 503 until waits drop below the target again.
+
+Settings are read from environment variables (see get_admission_config).
+"""
+
+import os
+import time
+import asyncio
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Any, Deque, Dict, Optional, Tuple
+
+# Priorities of pricing work, highest first
+PRIORITIES = ("single", "batch")
+
+# Settings and the environment variables that override them
+ADMISSION_SETTINGS = {
+    # Requests per second allowed per client; 0 disables rate limiting
+    "rate_limit": ("PYPRICER_RATE_LIMIT", float, 0.0),
+    # Requests a client may burst above its rate (default: one second's worth)
+    "rate_burst": ("PYPRICER_RATE_BURST", float, 0.0),
+    # Concurrent pricing slots; 0 uses the API thread pool size
+    "max_concurrency": ("PYPRICER_MAX_CONCURRENCY", int, 0),
+    # Slots batches may use; 0 uses half of max_concurrency
+    "batch_max_concurrency": ("PYPRICER_BATCH_MAX_CONCURRENCY", int, 0),
+    # Waiting requests per priority before new ones are rejected
+    "max_queue": ("PYPRICER_MAX_QUEUE", int, 100),
+    # Acceptable queue wait and the interval it may be exceeded for
+    "codel_target_ms": ("PYPRICER_CODEL_TARGET_MS", float, 50.0),
+    "codel_interval_ms": ("PYPRICER_CODEL_INTERVAL_MS", float, 500.0),
+}
+
+# Token buckets kept before the least recently used are forgotten
+MAX_CLIENTS = 10_000
+
+
+class AdmissionRejected(Exception):
+    """
+    Raised when a request is rejected by admission control.
+    """
+    
+    def __init__(self, status_code: int, reason: str, retry_after: float = 1.0):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def get_admission_config(default_concurrency: int = 40) -> Dict[str, Any]:
+    """
+    Get the admission control settings.
+    
+    Args:
+        default_concurrency: Pricing slots when PYPRICER_MAX_CONCURRENCY is not set
+        
+    Returns:
+        Dictionary of admission settings
+    """
+    config = {
+        name: cast(os.environ.get(env, default))
+        for name, (env, cast, default) in ADMISSION_SETTINGS.items()
+    }
+    config["max_concurrency"] = config["max_concurrency"] or default_concurrency
+    config["batch_max_concurrency"] = config["batch_max_concurrency"] or max(1, config["max_concurrency"] // 2)
+    config["rate_burst"] = config["rate_burst"] or config["rate_limit"]
+    return config
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter per client.
+    """
+    
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+    
+    def acquire(self, client: str, cost: float = 1.0) -> float:
+        """
+        Take tokens from a client's bucket.
+        
+        Args:
+            client: Client identifier
+            cost: Number of tokens the request costs
+            
+        Returns:
+            0 if the request is allowed, otherwise the seconds until it would be
+        """
+        if self.rate <= 0:
+            return 0.0
+        
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(client, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        
+        wait = 0.0
+        if tokens >= cost:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / self.rate
+        
+        self._buckets[client] = (tokens, now)
+        if len(self._buckets) > MAX_CLIENTS:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class PriorityLimiter:
+    """
+    Limit concurrent pricing work, serving waiting work by priority and shedding
+    load when queue waits stay above the CoDel target.
+    """
+    
+    def __init__(self, max_concurrency: int, batch_max_concurrency: int, max_queue: int,
+                 target_ms: float, interval_ms: float):
+        self.limits = {"single": max_concurrency, "batch": min(batch_max_concurrency, max_concurrency)}
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.target = target_ms / 1000
+        self.interval = interval_ms / 1000
+        
+        self.in_use = {priority: 0 for priority in PRIORITIES}
+        self._waiters: Dict[str, Deque[Tuple[asyncio.Future, float]]] = {p: deque() for p in PRIORITIES}
+        self._first_above: Optional[float] = None
+        self.dropping = False
+    
+    def _has_slot(self, priority: str) -> bool:
+        return (
+            sum(self.in_use.values()) < self.max_concurrency
+            and self.in_use[priority] < self.limits[priority]
+        )
+    
+    def _observe_wait(self, wait: float, now: float) -> None:
+        """
+        Update the CoDel state with the wait of a request leaving the queue.
+        """
+        if wait < self.target:
+            self._first_above = None
+            self.dropping = False
+        elif self._first_above is None:
+            self._first_above = now + self.interval
+        elif now >= self._first_above:
+            self.dropping = True
+    
+    async def acquire(self, priority: str) -> None:
+        """
+        Wait for a pricing slot.
+        
+        Raises:
+            AdmissionRejected: If the queue is full or overloaded
+        """
+        # Take a free slot unless work of the same or a higher priority is waiting
+        ahead = PRIORITIES[:PRIORITIES.index(priority) + 1]
+        if not any(self._waiters[p] for p in ahead) and self._has_slot(priority):
+            self.in_use[priority] += 1
+            self._observe_wait(0.0, time.monotonic())
+            return
+        
+        if self.dropping:
+            raise AdmissionRejected(503, "Server overloaded", retry_after=self.interval)
+        if len(self._waiters[priority]) >= self.max_queue:
+            raise AdmissionRejected(503, "Too many queued requests", retry_after=self.interval)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append((future, time.monotonic()))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Pass on a slot that was granted just as the request was cancelled
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.release(priority)
+            raise
+    
+    def release(self, priority: str) -> None:
+        """
+        Free a pricing slot and hand slots to waiting work, highest priority first.
+        
+        Waiters that waited longer than the target while the queue is overloaded
+        are rejected instead of served.
+        """
+        self.in_use[priority] -= 1
+        now = time.monotonic()
+        
+        for waiting_priority in PRIORITIES:
+            waiters = self._waiters[waiting_priority]
+            while waiters and self._has_slot(waiting_priority):
+                future, enqueued = waiters.popleft()
+                if future.done():
+                    continue
+                
+                wait = now - enqueued
+                self._observe_wait(wait, now)
+                if self.dropping and wait >= self.target:
+                    future.set_exception(AdmissionRejected(503, "Server overloaded", retry_after=self.interval))
+                    continue
+                
+                self.in_use[waiting_priority] += 1
+                future.set_result(None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "in_use": dict(self.in_use),
+            "queued": {priority: len(waiters) for priority, waiters in self._waiters.items()},
+            "dropping": self.dropping,
+        }
+
+
+class AdmissionController:
+    """
+    Apply rate limiting, priority scheduling and load shedding to pricing work.
+    
+    Example:
+    
+        admission.check_rate(get_client_id(http_request))
+        async with admission.slot("single"):
+            result = await run_in_threadpool(process_quote, data)
+    """
+    
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.rate_limiter = RateLimiter(config["rate_limit"], config["rate_burst"])
+        self.limiter = PriorityLimiter(
+            config["max_concurrency"],
+            config["batch_max_concurrency"],
+            config["max_queue"],
+            config["codel_target_ms"],
+            config["codel_interval_ms"],
+        )
+        self.counters = {"admitted": 0, "rate_limited": 0, "shed": 0}
+    
+    def check_rate(self, client: str, cost: float = 1.0) -> None:
+        """
+        Charge a client for a request.
+        
+        Args:
+            client: Client identifier
+            cost: Number of tokens the request costs
+            
+        Raises:
+            AdmissionRejected: With 429 if the client exceeds its rate
+        """
+        wait = self.rate_limiter.acquire(client, cost)
+        if wait > 0:
+            self.counters["rate_limited"] += 1
+            raise AdmissionRejected(429, "Rate limit exceeded", retry_after=wait)
+    
+    @asynccontextmanager
+    async def slot(self, priority: str):
+        """
+        Hold a pricing slot of the given priority.
+        
+        Raises:
+            AdmissionRejected: With 503 if the request is shed
+        """
+        try:
+            await self.limiter.acquire(priority)
+        except AdmissionRejected:
+            self.counters["shed"] += 1
+            raise
+        
+        self.counters["admitted"] += 1
+        try:
+            yield
+        finally:
+            self.limiter.release(priority)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the admission counters and queue state.
+        """
+        return {**self.counters, **self.limiter.get_stats()}
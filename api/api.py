@@ -4,9 +4,15 @@ FastAPI application for the insurance pricing library.
 This module provides a REST API for processing insurance quotes.
 """
 
-from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi import FastAPI, HTTPException, Request, Query
+from fastapi.responses import JSONResponse, RedirectResponse, StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool, iterate_in_threadpool
+from contextlib import asynccontextmanager
+import anyio
+import hmac
+import math
+import time
 import logging
 import traceback
 import sys
@@ -16,8 +22,16 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Import models and utilities
-from api.models import QuoteRequest, QuoteResponse, ErrorResponse
-from api.utils import process_quote
+from api.models import QuoteRequest, QuoteResponse, QuoteBatchRequest, QuoteBatchResponse, QuoteRejection, RollupQuery, RollupResponse, ErrorResponse
+from api.utils import process_quote, rate_quote_list, rated_frame_to_results, iter_ndjson_results, iter_arrow_results, warm_up
+from api.compression import CompressionMiddleware
+from api.admission import AdmissionController, AdmissionRejected, get_admission_config
+from api.audit import start_audit_sink, stop_audit_sink, audit_quote, is_audit_enabled
+from api.single_flight import SingleFlight, canonical_key
+from algorithms.config import get_primary_id
+from algorithms.analytics.rollups import get_rollup_path, load_rollup, query_rollup
+from algorithms.pipeline.profiling import SamplingProfiler
+from py_pricer.concurrency import get_api_threads
 
 # Configure logging
 logging.basicConfig(
@@ -30,11 +44,88 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Identical concurrent quotes share one pricing computation
+quote_flights = SingleFlight()
+
+# Rate limiting, priority scheduling and load shedding of pricing work
+admission = AdmissionController(get_admission_config(get_api_threads()))
+
+# Admin endpoints are disabled unless this environment variable holds a token
+ADMIN_TOKEN_ENV = "PYPRICER_ADMIN_TOKEN"
+
+# Longest profile the admin endpoint records
+MAX_PROFILE_SECONDS = 300
+
+# Only one profile runs at a time in a worker
+profile_lock = anyio.Lock()
+
+def get_client_id(request: Request) -> str:
+    """
+    Identify the client of a request by its API key, or by its address.
+    
+    Args:
+        request: The incoming request
+        
+    Returns:
+        Client identifier used for rate limiting
+    """
+    api_key = request.headers.get("x-api-key")
+    if api_key:
+        return f"key:{api_key}"
+    return f"addr:{request.client.host if request.client else 'unknown'}"
+
+def check_admin_token(request: Request) -> None:
+    """
+    Allow a request only if it carries the admin token in the X-Admin-Token header.
+    
+    Args:
+        request: The incoming request
+        
+    Raises:
+        HTTPException: 404 if admin endpoints are disabled (PYPRICER_ADMIN_TOKEN
+                       is not set), 403 if the token is missing or wrong
+    """
+    token = os.environ.get(ADMIN_TOKEN_ENV)
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(request.headers.get("x-admin-token", "").encode(), token.encode()):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+async def price_quote(data):
+    """
+    Price a single quote in a high-priority pricing slot.
+    """
+    async with admission.slot("single"):
+        return await run_in_threadpool(process_quote, data)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Configure the worker on startup.
+    
+    Quotes are processed in the thread pool so the event loop stays responsive;
+    its size is set by the launcher's --threads option. The pricing pipeline is
+    loaded here so the first quote does not pay for the imports, and so is the
+    rollup cube if PYPRICER_ROLLUP_PATH is set. The audit trail is started if
+    PYPRICER_AUDIT_DIR is set and flushed on shutdown.
+    """
+    anyio.to_thread.current_default_thread_limiter().total_tokens = get_api_threads()
+    await run_in_threadpool(warm_up)
+    cube_path = get_rollup_path()
+    if cube_path and os.path.isfile(cube_path):
+        await run_in_threadpool(load_rollup, cube_path)
+    start_audit_sink()
+    try:
+        yield
+    finally:
+        stop_audit_sink()
+
 # Create the FastAPI application
 app = FastAPI(
     title="Insurance Pricing API",
     description="API for processing insurance quotes and calculating premiums",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -46,6 +137,9 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Compress large responses with the best encoding the client accepts (zstd or gzip)
+app.add_middleware(CompressionMiddleware)
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -70,6 +164,25 @@ async def global_exception_handler(request: Request, exc: Exception):
         ).dict()
     )
 
+# Admission control rejections
+@app.exception_handler(AdmissionRejected)
+async def admission_rejected_handler(request: Request, exc: AdmissionRejected):
+    """
+    Return rejected requests quickly with 429 or 503 and a Retry-After header.
+    
+    Args:
+        request: The rejected request
+        exc: The rejection
+        
+    Returns:
+        JSONResponse with error details
+    """
+    return JSONResponse(
+        status_code=exc.status_code,
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+        content=ErrorResponse(error=exc.reason).dict()
+    )
+
 # Root endpoint
 @app.get("/", tags=["Documentation"])
 async def root():
@@ -92,31 +205,221 @@ async def health_check():
     """
     return {"status": "healthy"}
 
+# Metrics endpoint
+@app.get("/metrics", tags=["Health"])
+async def metrics():
+    """
+    Metrics endpoint.
+    
+    Counters are per worker process.
+    
+    Returns:
+        Dictionary with the single-flight and admission counters of this worker
+    """
+    return {
+        "single_flight": quote_flights.get_stats(),
+        "admission": admission.get_stats()
+    }
+
 # Quote processing endpoint
 @app.post("/quote", response_model=QuoteResponse, tags=["Quotes"])
-async def process_quote_request(request: QuoteRequest):
+async def process_quote_request(request: QuoteRequest, http_request: Request):
     """
     Process a quote request.
     
     Args:
         request: QuoteRequest object containing quote data
+        http_request: The incoming HTTP request, used to identify the client
         
     Returns:
         QuoteResponse object with premium details
     """
+    # Reject clients over their rate limit before doing any work
+    admission.check_rate(get_client_id(http_request))
+    
+    # The quote data has been validated against the quote schema
+    data = request.data.model_dump(exclude_unset=True)
+    
     try:
-        # Process the quote
-        result = process_quote(request.data)
+        # Process the quote in the thread pool, sharing the computation with
+        # identical quotes that are already being priced
+        result = await quote_flights.run(canonical_key(data), price_quote, data)
+        
+        # Record the quote in the audit trail (queued, written off the request path)
+        audit_quote(data, result)
         
         # Return the response
         return QuoteResponse(
-            quote_id=result["quote_id"],
+            quote_id=result[get_primary_id()],
             premium_details=result["premium_details"]
         )
+    except AdmissionRejected:
+        raise
     except Exception as e:
         logger.error(f"Error processing quote: {str(e)}")
         logger.error(traceback.format_exc())
         raise HTTPException(
             status_code=400,
             detail=f"Error processing quote: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+# Media types of the streaming batch responses
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARROW_STREAM_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Batch quote processing endpoint
+@app.post(
+    "/quotes/batch",
+    response_model=QuoteBatchResponse,
+    tags=["Quotes"],
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}, ARROW_STREAM_MEDIA_TYPE: {}}}}
+)
+async def process_quote_batch_request(request: QuoteBatchRequest, http_request: Request):
+    """
+    Process a batch of quotes.
+    
+    Batches run at a lower priority than single quotes and may only use part of
+    the pricing capacity. The quotes are validated in one vectorized pass and
+    only valid quotes are rated; invalid quotes are listed in the rejected field
+    with their errors. The response is JSON by default; clients sending
+    `Accept: application/x-ndjson` or `Accept: application/vnd.apache.arrow.stream`
+    receive a streamed (chunked) NDJSON or Arrow IPC response instead, with the
+    number of rejected quotes in the X-Quotes-Rejected header.
+    
+    Args:
+        request: QuoteBatchRequest object containing the quotes
+        http_request: The incoming HTTP request, used to identify the client
+        
+    Returns:
+        QuoteBatchResponse object, or a streaming response, with the premium
+        details of each rated quote
+    """
+    # Reject clients over their rate limit before doing any work
+    admission.check_rate(get_client_id(http_request))
+    
+    try:
+        # Process the batch in a low-priority pricing slot
+        rejected = []
+        async with admission.slot("batch"):
+            rated_df = await run_in_threadpool(rate_quote_list, request.data, rejected)
+        
+        # Record the quotes in the audit trail
+        primary_id = get_primary_id()
+        results = None
+        if is_audit_enabled():
+            results = rated_frame_to_results(rated_df)
+            quotes_by_id = {str(quote.get(primary_id)): quote for quote in request.data}
+            for result in results:
+                audit_quote(quotes_by_id.get(result[primary_id], {}), result)
+        
+        # Stream the response if the client asked for a streaming format
+        accept = http_request.headers.get("accept", "")
+        headers = {"X-Quotes-Rejected": str(len(rejected))}
+        if NDJSON_MEDIA_TYPE in accept:
+            return StreamingResponse(iterate_in_threadpool(iter_ndjson_results(rated_df)), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+        if ARROW_STREAM_MEDIA_TYPE in accept:
+            return StreamingResponse(iterate_in_threadpool(iter_arrow_results(rated_df)), media_type=ARROW_STREAM_MEDIA_TYPE, headers=headers)
+        
+        # Return the response
+        results = results if results is not None else rated_frame_to_results(rated_df)
+        return QuoteBatchResponse(
+            quotes=[
+                QuoteResponse(quote_id=result[primary_id], premium_details=result["premium_details"])
+                for result in results
+            ],
+            rejected=[QuoteRejection(**rejection) for rejection in rejected]
+        )
+    except AdmissionRejected:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing quote batch: {str(e)}")
+        logger.error(traceback.format_exc())
+        raise HTTPException(
+            status_code=400,
+            detail=f"Error processing quote batch: {str(e)}"
+        )
+
+# Premium rollup endpoint
+@app.post("/rollups/query", response_model=RollupResponse, tags=["Analytics"])
+async def query_rollup_request(request: RollupQuery, http_request: Request):
+    """
+    Aggregate premium by rating factors from the precomputed rollup cube.
+    
+    The cube is built by `pypricer-rate --rollup` and served from the file set in
+    PYPRICER_ROLLUP_PATH; it is reloaded when the file changes. Queries only read
+    the cube, not the rated book, so they take milliseconds.
+    
+    Args:
+        request: RollupQuery object with the rating factors to group and filter by
+        http_request: The incoming HTTP request, used to identify the client
+        
+    Returns:
+        RollupResponse object with one row per combination of the by factors
+    """
+    # Reject clients over their rate limit before doing any work
+    admission.check_rate(get_client_id(http_request))
+    
+    cube_path = get_rollup_path()
+    if cube_path is None or not os.path.isfile(cube_path):
+        raise HTTPException(status_code=404, detail="No rollup cube is available (set PYPRICER_ROLLUP_PATH)")
+    
+    def run_query():
+        cube = load_rollup(cube_path)
+        return query_rollup(cube, request.by, request.filters), cube.height
+    
+    try:
+        result, cells = await run_in_threadpool(run_query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return RollupResponse(rows=result.to_dicts(), cells=cells)
+
+# Profiling endpoint
+@app.post("/admin/profile", tags=["Admin"], responses={200: {"content": {"application/json": {}, "text/plain": {}}}})
+async def profile_request(
+    http_request: Request,
+    seconds: float = Query(10.0, gt=0, le=MAX_PROFILE_SECONDS, description="How long to sample"),
+    format: str = Query("speedscope", pattern="^(speedscope|folded)$", description="speedscope JSON or folded stacks"),
+    interval_ms: float = Query(10.0, ge=1, le=1000, description="Milliseconds between samples"),
+    idle: bool = Query(False, description="Keep samples of threads waiting for work")
+):
+    """
+    Sample the stacks of this worker while it serves live traffic.
+    
+    A sampling thread records the Python stacks of the event loop and the pricing
+    threads every interval_ms for the given number of seconds, then the profile is
+    returned as speedscope JSON (open it at https://www.speedscope.app) or as folded
+    stacks for flame graphs. Only the worker that receives this request is sampled.
+    Requires the X-Admin-Token header to match PYPRICER_ADMIN_TOKEN; without that
+    variable the endpoint does not exist. Nothing is sampled outside these requests.
+    
+    Args:
+        http_request: The incoming HTTP request, checked for the admin token
+        seconds: How long to sample
+        format: "speedscope" or "folded"
+        interval_ms: Milliseconds between samples
+        idle: Keep samples of threads waiting for work
+        
+    Returns:
+        The profile, as an attachment
+    """
+    check_admin_token(http_request)
+    if profile_lock.locked():
+        raise HTTPException(status_code=409, detail="A profile is already being recorded")
+    
+    async with profile_lock:
+        profiler = SamplingProfiler(interval_ms / 1000, idle=idle)
+        profiler.start()
+        try:
+            await anyio.sleep(seconds)
+        finally:
+            await run_in_threadpool(profiler.stop)
+    
+    logger.info(f"Recorded a {seconds:g}s profile ({profiler.samples} samples)")
+    extension, media_type = ("speedscope.json", "application/json") if format == "speedscope" else ("folded", "text/plain")
+    file_name = f"pypricer-{os.getpid()}-{time.strftime('%Y%m%d-%H%M%S')}.{extension}"
+    return Response(
+        content=profiler.render(format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'}
+    )
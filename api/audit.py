@@ -0,0 +1,337 @@
+"""
+Audit trail for production quotes.
+
+This module records every quote's inputs, rating factors and premium together with
+the version of the rating configuration that produced it. Quotes are queued on the
+request path, then built into records and written by a background thread as
+compressed Parquet files when a row count or time limit is reached, so recording a
+quote costs a queue put (plus, at most once a second, a check of the rating files
+for the rating version).
+
+The audit trail is enabled by setting the PYPRICER_AUDIT_DIR environment variable.
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import hashlib
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.config import get_primary_id
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Files that determine how a quote is rated
+RATING_VERSION_DIRS = [
+    (os.path.join(PROJECT_ROOT, 'algorithms', 'pipeline'), ('.json', '.py')),
+    (os.path.join(PROJECT_ROOT, 'algorithms', 'rating'), ('.py',)),
+    (os.path.join(PROJECT_ROOT, 'algorithms', 'rating', 'tables'), ('.csv',)),
+]
+
+# Environment variables configuring the audit trail
+AUDIT_DIR_ENV = "PYPRICER_AUDIT_DIR"
+AUDIT_MAX_ROWS_ENV = "PYPRICER_AUDIT_MAX_ROWS"
+AUDIT_MAX_SECONDS_ENV = "PYPRICER_AUDIT_MAX_SECONDS"
+
+# Rating versions keyed by the (path, size, mtime) signature of the rating files
+_RATING_VERSIONS: Dict[tuple, str] = {}
+
+# The last rating version computed and the monotonic time it was computed
+_last_rating_version = {"state": (None, 0.0)}
+
+# Seconds the version recorded with a quote may lag behind a change to the rating
+# files; checking the files costs a stat per file, too much to do for every quote
+RECORD_VERSION_CHECK_SECONDS = 1.0
+
+# The audit sink of this process, if the audit trail is enabled
+_audit_sink = {"sink": None}
+
+# Queued by AuditSink.close() to stop the background thread
+_STOP = object()
+
+
+def _rating_files() -> List[str]:
+    """
+    List the files that determine how a quote is rated.
+    """
+    files = []
+    for directory, extensions in RATING_VERSION_DIRS:
+        if os.path.isdir(directory):
+            files.extend(
+                os.path.join(directory, name)
+                for name in sorted(os.listdir(directory))
+                if name.endswith(extensions)
+            )
+    return files
+
+
+def get_rating_version(max_age: float = 0.0) -> str:
+    """
+    Get the version of the rating configuration.
+    
+    The version is a content hash of the pipeline configuration, rating engine and
+    rating tables. It is only recomputed when one of the files changes on disk.
+    
+    Args:
+        max_age: Return the last version without checking the files if it was
+                 computed less than this many seconds ago
+    
+    Returns:
+        16-character hex digest identifying the rating configuration
+    """
+    now = time.monotonic()
+    last_version, checked_at = _last_rating_version["state"]
+    if last_version is not None and now - checked_at < max_age:
+        return last_version
+    
+    files = _rating_files()
+    signature = tuple((path, os.stat(path).st_size, os.stat(path).st_mtime_ns) for path in files)
+    
+    version = _RATING_VERSIONS.get(signature)
+    if version is None:
+        digest = hashlib.sha256()
+        for path in files:
+            digest.update(os.path.relpath(path, PROJECT_ROOT).encode())
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        version = digest.hexdigest()[:16]
+        _RATING_VERSIONS.clear()
+        _RATING_VERSIONS[signature] = version
+    
+    _last_rating_version["state"] = (version, now)
+    return version
+
+
+class AuditSink:
+    """
+    Buffer audit records and write them to Parquet files from a background thread.
+    
+    A file is written when max_rows records are buffered or max_seconds have passed
+    since the first buffered record, and on close(). Files are written under a
+    temporary name and renamed, so readers never see partial files.
+    """
+    
+    def __init__(
+        self,
+        directory: str,
+        max_rows: int = 10_000,
+        max_seconds: float = 60.0,
+        compression: str = "zstd"
+    ):
+        self.directory = directory
+        self.max_rows = max_rows
+        self.max_seconds = max_seconds
+        self.compression = compression
+        self.files_written = 0
+        
+        os.makedirs(directory, exist_ok=True)
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="audit-sink", daemon=True)
+        self._thread.start()
+    
+    def record(self, quote: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """
+        Queue a rated quote without blocking; the record is built in the background.
+        
+        The rating version is taken now, with the timestamp, so records flushed
+        after a change to the rating files keep the version that rated them.
+        
+        Args:
+            quote: Raw quote data as received
+            result: Result of process_quote
+        """
+        audited_at = datetime.now(timezone.utc)
+        rating_version = get_rating_version(max_age=RECORD_VERSION_CHECK_SECONDS)
+        self._queue.put((quote, result, audited_at, rating_version))
+    
+    def close(self) -> None:
+        """
+        Write the buffered records and stop the background thread.
+        """
+        self._queue.put(_STOP)
+        self._thread.join()
+    
+    def _run(self) -> None:
+        """
+        Collect records and flush them on the size or time trigger.
+        """
+        buffer = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                record = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                record = None
+            
+            if record is _STOP:
+                self._flush(buffer)
+                return
+            
+            if record is not None:
+                buffer.append(build_audit_record(*record))
+                if deadline is None:
+                    deadline = time.monotonic() + self.max_seconds
+            
+            if len(buffer) >= self.max_rows or (deadline is not None and time.monotonic() >= deadline):
+                self._flush(buffer)
+                buffer = []
+                deadline = None
+    
+    def _flush(self, buffer: List[Dict[str, Any]]) -> None:
+        """
+        Write buffered records to a new Parquet file.
+        """
+        if not buffer:
+            return
+        
+        import polars as pl
+        
+        try:
+            df = pl.DataFrame(buffer, infer_schema_length=None)
+            timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+            file_name = f"audit-{timestamp}-{os.getpid()}-{self.files_written}.parquet"
+            temp_path = os.path.join(self.directory, f".{file_name}.tmp")
+            df.write_parquet(temp_path, compression=self.compression)
+            os.replace(temp_path, os.path.join(self.directory, file_name))
+            self.files_written += 1
+        except Exception as e:
+            logger.error(f"Error writing {len(buffer)} audit records: {str(e)}")
+
+
+def build_audit_record(
+    quote: Dict[str, Any],
+    result: Dict[str, Any],
+    audited_at: Optional[datetime] = None,
+    rating_version: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Build the audit record of a rated quote.
+    
+    The raw inputs are kept as JSON so the quote can be reconstructed exactly; the
+    factors and premiums are stored as columns for analysis.
+    
+    Args:
+        quote: Raw quote data as received
+        result: Result of process_quote
+        audited_at: Time the quote was rated (default: now)
+        rating_version: Version of the rating configuration that rated the quote
+                        (default: the current version)
+        
+    Returns:
+        Flat dictionary with the audit metadata, inputs and rating columns
+    """
+    primary_id = get_primary_id()
+    record = {
+        "quote_id": result.get(primary_id),
+        "audited_at": audited_at or datetime.now(timezone.utc),
+        "rating_version": rating_version or get_rating_version(),
+        "inputs": json.dumps(quote, default=str),
+    }
+    record.update(result["premium_details"])
+    return record
+
+
+def start_audit_sink() -> Optional[AuditSink]:
+    """
+    Start the audit sink if PYPRICER_AUDIT_DIR is set.
+    
+    Returns:
+        The audit sink or None if the audit trail is disabled
+    """
+    directory = os.environ.get(AUDIT_DIR_ENV)
+    if directory and _audit_sink["sink"] is None:
+        _audit_sink["sink"] = AuditSink(
+            directory,
+            max_rows=int(os.environ.get(AUDIT_MAX_ROWS_ENV, 10_000)),
+            max_seconds=float(os.environ.get(AUDIT_MAX_SECONDS_ENV, 60))
+        )
+        logger.info(f"Auditing quotes to {directory}")
+    return _audit_sink["sink"]
+
+
+def stop_audit_sink() -> None:
+    """
+    Flush and stop the audit sink, if running.
+    """
+    sink = _audit_sink["sink"]
+    if sink is not None:
+        sink.close()
+        _audit_sink["sink"] = None
+
+
+def is_audit_enabled() -> bool:
+    """
+    Check whether the audit trail is running.
+    
+    Returns:
+        True if quotes are being audited
+    """
+    return _audit_sink["sink"] is not None
+
+
+def audit_quote(quote: Dict[str, Any], result: Dict[str, Any]) -> None:
+    """
+    Record a rated quote in the audit trail, if enabled.
+    
+    Args:
+        quote: Raw quote data as received
+        result: Result of process_quote
+    """
+    sink = _audit_sink["sink"]
+    if sink is not None:
+        sink.record(quote, result)
+
+
+def load_audited_quotes(quote_id: str, audit_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Reconstruct every audited rating of a quote.
+    
+    Args:
+        quote_id: ID of the quote
+        audit_dir: Directory of the audit files (default: PYPRICER_AUDIT_DIR)
+        
+    Returns:
+        List of dictionaries, oldest first, each with the quote_id, audited_at,
+        rating_version, the original inputs and the premium_details
+    """
+    import polars as pl
+    
+    audit_dir = audit_dir or os.environ.get(AUDIT_DIR_ENV)
+    files = sorted(
+        os.path.join(audit_dir, name) for name in os.listdir(audit_dir or ".")
+        if name.startswith("audit-") and name.endswith(".parquet")
+    ) if audit_dir else []
+    if not files:
+        return []
+    
+    # Files written under different rating versions may have different rating columns
+    rows = (
+        pl.concat([pl.scan_parquet(path) for path in files], how="diagonal_relaxed")
+        .filter(pl.col("quote_id") == str(quote_id))
+        .sort("audited_at")
+        .collect()
+        .to_dicts()
+    )
+    
+    metadata_columns = ("quote_id", "audited_at", "rating_version", "inputs")
+    return [
+        {
+            "quote_id": row["quote_id"],
+            "audited_at": row["audited_at"],
+            "rating_version": row["rating_version"],
+            "inputs": json.loads(row["inputs"]),
+            "premium_details": {k: v for k, v in row.items() if k not in metadata_columns and v is not None},
+        }
+        for row in rows
+    ]
@@ -0,0 +1,385 @@
+"""
+Binary pricing service for internal callers.
+
+This module provides a TCP server that prices quotes sent as Arrow IPC streams,
+avoiding the HTTP, JSON and pydantic overhead of the FastAPI application. It uses
+the same pipeline and rating engine as the API.
+
+Protocol:
+    Every message is a frame: a 4-byte big-endian length followed by the payload.
+    A request payload is an Arrow IPC stream of raw quotes (one or more rows).
+    A response payload is a 1-byte status followed by either an Arrow IPC stream of
+    the rated quotes (status 0) or a UTF-8 error message (status 1). Quotes that
+    fail validation are returned after the rated quotes with their position in
+    the request ("row") and their error messages ("errors"); "errors" is null for
+    rated quotes.
+    Clients may send several request frames without waiting for the responses,
+    which are returned in order. A zero-length frame closes the connection, and the
+    server closes connections that announce a frame larger than its maximum size.
+"""
+
+import io
+import os
+import queue
+import socket
+import socketserver
+import struct
+import sys
+import logging
+import threading
+import polars as pl
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.utils import process_quote, process_quote_batch
+from algorithms.config import get_primary_id
+from algorithms.pipeline.validation import split_valid_quotes, ROW_COLUMN
+
+logger = logging.getLogger(__name__)
+
+# Frame header: payload length as a 4-byte big-endian unsigned integer
+FRAME_HEADER = struct.Struct(">I")
+
+# Largest request frame the server accepts (64 MiB)
+DEFAULT_MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# Response status codes
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+
+class FrameTooLargeError(ValueError):
+    """
+    Raised when a peer announces a frame larger than the maximum frame size.
+    """
+
+
+def encode_frame(df: pl.DataFrame) -> bytes:
+    """
+    Serialize a DataFrame to an Arrow IPC stream payload.
+    
+    Args:
+        df: DataFrame to serialize
+        
+    Returns:
+        Arrow IPC stream bytes
+    """
+    buffer = io.BytesIO()
+    df.write_ipc_stream(buffer)
+    return buffer.getvalue()
+
+
+def decode_frame(payload: bytes) -> pl.DataFrame:
+    """
+    Deserialize an Arrow IPC stream payload to a DataFrame.
+    
+    Args:
+        payload: Arrow IPC stream bytes
+        
+    Returns:
+        DataFrame contained in the payload
+    """
+    return pl.read_ipc_stream(io.BytesIO(payload))
+
+
+def send_frame(sock: socket.socket, payload: bytes) -> None:
+    """
+    Send a length-prefixed frame.
+    
+    Args:
+        sock: Connected socket
+        payload: Frame payload
+    """
+    sock.sendall(FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    """
+    Receive exactly size bytes from a socket.
+    
+    Args:
+        sock: Connected socket
+        size: Number of bytes to receive
+        
+    Returns:
+        The received bytes or None if the connection was closed
+    """
+    chunks = []
+    remaining = size
+    while remaining:
+        chunk = sock.recv(min(remaining, 1024 * 1024))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_frame(sock: socket.socket, max_size: Optional[int] = None) -> Optional[bytes]:
+    """
+    Receive a length-prefixed frame.
+    
+    Args:
+        sock: Connected socket
+        max_size: Largest payload to accept in bytes (None for no limit)
+        
+    Returns:
+        Frame payload, or None if the connection was closed or an empty frame was received
+        
+    Raises:
+        FrameTooLargeError: If the frame header announces more than max_size bytes;
+                            the payload is not read
+    """
+    header = _recv_exact(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    
+    (length,) = FRAME_HEADER.unpack(header)
+    if length == 0:
+        return None
+    if max_size is not None and length > max_size:
+        raise FrameTooLargeError(f"Frame of {length} bytes exceeds the maximum of {max_size} bytes")
+    return _recv_exact(sock, length)
+
+
+def rate_frame(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Rate the quotes of a request frame.
+    
+    The quotes are validated first. A single valid quote goes through
+    process_quote (including the premium cube when it is enabled); more valid
+    quotes are rated as a batch.
+    
+    Args:
+        df: DataFrame of raw quotes
+        
+    Returns:
+        DataFrame with the primary ID and rating columns of each rated quote,
+        followed by the primary ID, position ("row") and error messages
+        ("errors") of each rejected quote
+    """
+    primary_id = get_primary_id()
+    valid, invalid = split_valid_quotes(df)
+    
+    if valid.height == 1:
+        result = process_quote(valid.row(0, named=True))
+        row = {primary_id: valid[0, primary_id]} if primary_id in valid.columns else {}
+        row.update(result["premium_details"])
+        rated = pl.DataFrame([row])
+    else:
+        rated = process_quote_batch(valid)
+    
+    if invalid.height == 0:
+        return rated
+    
+    # Report the rejected quotes by their ID and position in the request
+    rejected = invalid
+    if primary_id in df.columns:
+        rejected = invalid.select(df[primary_id].gather(invalid[ROW_COLUMN]), ROW_COLUMN, "errors")
+    return pl.concat([rated, rejected], how="diagonal_relaxed")
+
+
+class PricingRequestHandler(socketserver.BaseRequestHandler):
+    """
+    Handle one client connection, answering request frames until it closes.
+    """
+    
+    def handle(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        
+        while True:
+            # An oversized frame cannot be skipped without reading it, so the
+            # connection is closed instead
+            try:
+                payload = recv_frame(self.request, self.server.max_frame_size)
+            except FrameTooLargeError as e:
+                logger.warning(f"Closing connection from {self.client_address[0]}: {str(e)}")
+                return
+            if payload is None:
+                return
+            
+            try:
+                response = bytes([STATUS_OK]) + encode_frame(rate_frame(decode_frame(payload)))
+            except Exception as e:
+                logger.error(f"Error rating frame: {str(e)}")
+                response = bytes([STATUS_ERROR]) + str(e).encode("utf-8")
+            
+            send_frame(self.request, response)
+
+
+class PricingServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """
+    Threaded TCP server for the binary pricing protocol.
+    """
+    
+    allow_reuse_address = True
+    daemon_threads = True
+    
+    # Largest request frame accepted; connections sending larger frames are closed
+    max_frame_size = DEFAULT_MAX_FRAME_SIZE
+
+
+def serve(host: str = "127.0.0.1", port: int = 8001, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE) -> None:
+    """
+    Run the binary pricing server until interrupted.
+    
+    Args:
+        host: Host to bind the server to
+        port: Port to bind the server to
+        max_frame_size: Largest request frame to accept in bytes
+    """
+    with PricingServer((host, port), PricingRequestHandler) as server:
+        server.max_frame_size = max_frame_size
+        server.serve_forever()
+
+
+class BinaryPricingClient:
+    """
+    Client for the binary pricing server.
+    
+    Example:
+    
+        with BinaryPricingClient("127.0.0.1", 8001) as client:
+            details = client.quote({"IDpol": 1, "VehPower": 5, ...})
+            for rated in client.rate_stream(batches):
+                ...
+    """
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 8001):
+        self.sock = socket.create_connection((host, port))
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def close(self) -> None:
+        """
+        Close the connection, telling the server with an empty frame.
+        """
+        try:
+            send_frame(self.sock, b"")
+        finally:
+            self.sock.close()
+    
+    def _read_response(self) -> pl.DataFrame:
+        """
+        Read one response frame.
+        
+        Returns:
+            DataFrame of rated quotes
+            
+        Raises:
+            RuntimeError: If the server returned an error or closed the connection
+        """
+        return self._decode_response(recv_frame(self.sock))
+    
+    def _decode_response(self, payload: Optional[bytes]) -> pl.DataFrame:
+        """
+        Decode a response frame payload.
+        
+        Args:
+            payload: Response payload, or None if the connection was closed
+            
+        Returns:
+            DataFrame of rated quotes
+            
+        Raises:
+            RuntimeError: If the server returned an error or closed the connection
+        """
+        if payload is None:
+            raise RuntimeError("Connection closed by the pricing server")
+        if payload[0] != STATUS_OK:
+            raise RuntimeError(f"Pricing server error: {payload[1:].decode('utf-8')}")
+        return decode_frame(payload[1:])
+    
+    def rate(self, df: pl.DataFrame) -> pl.DataFrame:
+        """
+        Rate a batch of quotes in a single request.
+        
+        Args:
+            df: DataFrame of raw quotes
+            
+        Returns:
+            DataFrame with the primary ID and rating columns of each rated quote,
+            followed by the rejected quotes with their "row" and "errors"
+        """
+        send_frame(self.sock, encode_frame(df))
+        return self._read_response()
+    
+    def quote(self, quote: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Rate a single quote.
+        
+        Args:
+            quote: Raw quote data
+            
+        Returns:
+            Dictionary with the primary ID and rating columns of the quote
+            
+        Raises:
+            ValueError: If the quote failed validation
+        """
+        rated = self.rate(pl.DataFrame([quote])).row(0, named=True)
+        if rated.get("errors"):
+            raise ValueError("; ".join(rated["errors"]))
+        return rated
+    
+    def rate_stream(self, batches: Iterable[pl.DataFrame], window: int = 8) -> Iterator[pl.DataFrame]:
+        """
+        Rate a stream of batches, keeping up to window requests in flight.
+        
+        Responses are received by a background thread while requests are sent, so
+        the server is never blocked writing a response while this client is blocked
+        writing a request (which would deadlock once both socket buffers are full).
+        
+        Args:
+            batches: Iterable of DataFrames of raw quotes
+            window: Maximum number of requests sent ahead of their responses
+            
+        Yields:
+            DataFrame of rated quotes for each batch, in order
+        """
+        # One ticket per request sent, then None once all requests are sent
+        tickets: "queue.Queue[Optional[bool]]" = queue.Queue()
+        responses: "queue.Queue[Any]" = queue.Queue()
+        
+        def receive():
+            while tickets.get() is not None:
+                try:
+                    responses.put(recv_frame(self.sock))
+                except Exception as e:
+                    responses.put(e)
+                    return
+        
+        receiver = threading.Thread(target=receive, name="pypricer-binary-client", daemon=True)
+        receiver.start()
+        
+        def next_response() -> pl.DataFrame:
+            response = responses.get()
+            if isinstance(response, Exception):
+                raise response
+            return self._decode_response(response)
+        
+        in_flight = 0
+        try:
+            for batch in batches:
+                if in_flight >= window:
+                    yield next_response()
+                    in_flight -= 1
+                tickets.put(True)
+                send_frame(self.sock, encode_frame(batch))
+                in_flight += 1
+            
+            while in_flight:
+                yield next_response()
+                in_flight -= 1
+        finally:
+            # Responses of abandoned requests are read and dropped, so the
+            # connection stays usable
+            tickets.put(None)
+            receiver.join()
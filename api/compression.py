@@ -0,0 +1,196 @@
+"""
+Response compression middleware for the API.
+
+Responses larger than a size threshold are compressed with the best encoding the
+client accepts: zstd (when the optional zstandard package is installed) or gzip.
+Streaming responses are compressed chunk by chunk and flushed after each chunk,
+so clients receive rows as they are produced. Bodies and chunks larger than a
+second threshold are compressed in the thread pool, so compressing them does not
+block the event loop (zlib and zstandard release the GIL while compressing).
+"""
+
+import os
+import zlib
+from typing import Callable, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Environment variables configuring the compression
+COMPRESSION_MIN_SIZE_ENV = "PYPRICER_COMPRESSION_MIN_SIZE"
+COMPRESSION_THREADPOOL_SIZE_ENV = "PYPRICER_COMPRESSION_THREADPOOL_SIZE"
+COMPRESSION_ENV = "PYPRICER_COMPRESSION"
+
+# Bodies and chunks of at least this many bytes are compressed in the thread pool;
+# smaller ones compress faster than a thread pool round trip
+DEFAULT_THREADPOOL_SIZE = 64 * 1024
+
+
+def available_encodings() -> List[str]:
+    """
+    List the supported content encodings, most preferred first.
+    
+    Returns:
+        List of encodings ("zstd" only if zstandard is installed, and "gzip")
+    """
+    return (["zstd"] if zstandard is not None else []) + ["gzip"]
+
+
+def _gzip_compressor(level: int = 6) -> Tuple[Callable[[bytes], bytes], Callable[[bool], bytes]]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress, lambda final: compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def _zstd_compressor(level: int = 3) -> Tuple[Callable[[bytes], bytes], Callable[[bool], bytes]]:
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    return compressor.compress, lambda final: compressor.flush(
+        zstandard.COMPRESSOBJ_FLUSH_FINISH if final else zstandard.COMPRESSOBJ_FLUSH_BLOCK
+    )
+
+
+COMPRESSORS = {
+    "gzip": _gzip_compressor,
+    "zstd": _zstd_compressor,
+}
+
+
+def negotiate_encoding(accept_encoding: str, encodings: List[str]) -> Optional[str]:
+    """
+    Choose the content encoding for a request.
+    
+    Args:
+        accept_encoding: Value of the Accept-Encoding header
+        encodings: Encodings the server supports, most preferred first
+        
+    Returns:
+        The first supported encoding the client accepts (q > 0), or None
+    """
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    
+    for encoding in encodings:
+        if encoding in accepted or "*" in accepted:
+            return encoding
+    return None
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing responses with a negotiated content encoding.
+    
+    Responses are left as they are when the client accepts no supported encoding,
+    when they are already encoded, or when a complete (non-streaming) body is
+    smaller than minimum_size. Bodies and chunks of at least threadpool_size bytes
+    are compressed in the thread pool instead of on the event loop.
+    """
+    
+    def __init__(
+        self,
+        app,
+        minimum_size: Optional[int] = None,
+        encodings: Optional[List[str]] = None,
+        threadpool_size: Optional[int] = None
+    ):
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else int(
+            os.environ.get(COMPRESSION_MIN_SIZE_ENV, 1024)
+        )
+        self.threadpool_size = threadpool_size if threadpool_size is not None else int(
+            os.environ.get(COMPRESSION_THREADPOOL_SIZE_ENV, DEFAULT_THREADPOOL_SIZE)
+        )
+        if encodings is None:
+            configured = os.environ.get(COMPRESSION_ENV)
+            encodings = configured.split(",") if configured is not None else available_encodings()
+        self.encodings = [encoding.strip() for encoding in encodings if encoding.strip() in available_encodings()]
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        
+        headers = dict((key.lower(), value) for key, value in scope.get("headers", []))
+        encoding = negotiate_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        await self.app(scope, receive, _CompressingSender(send, encoding, self.minimum_size, self.threadpool_size))
+
+
+class _CompressingSender:
+    """
+    Wrap an ASGI send callable to compress the response body.
+    """
+    
+    def __init__(self, send, encoding: str, minimum_size: int, threadpool_size: int = DEFAULT_THREADPOOL_SIZE):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.threadpool_size = threadpool_size
+        self.start_message = None
+        self.compress = None
+        self.flush = None
+        self.passthrough = False
+    
+    def _compress_chunk(self, body: bytes, final: bool) -> bytes:
+        """
+        Compress a body or chunk, flushing the compressor.
+        """
+        return self.compress(body) + self.flush(final)
+    
+    async def _compress_body(self, body: bytes, final: bool) -> bytes:
+        """
+        Compress a body or chunk, in the thread pool if it is large.
+        """
+        if len(body) >= self.threadpool_size:
+            return await run_in_threadpool(self._compress_chunk, body, final)
+        return self._compress_chunk(body, final)
+    
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            # Hold the headers until the first body chunk decides whether to compress
+            self.start_message = message
+            return
+        
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+        
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        
+        if self.start_message is not None:
+            start_message, self.start_message = self.start_message, None
+            headers = [(key, value) for key, value in start_message.get("headers", [])]
+            already_encoded = any(key.lower() == b"content-encoding" for key, _ in headers)
+            
+            if already_encoded or (not more_body and len(body) < self.minimum_size):
+                self.passthrough = True
+                await self.send(start_message)
+                await self.send(message)
+                return
+            
+            self.compress, self.flush = COMPRESSORS[self.encoding]()
+            headers = [(key, value) for key, value in headers if key.lower() != b"content-length"]
+            headers.append((b"content-encoding", self.encoding.encode()))
+            headers.append((b"vary", b"Accept-Encoding"))
+            
+            if not more_body:
+                compressed = await self._compress_body(body, True)
+                headers.append((b"content-length", str(len(compressed)).encode()))
+                await self.send({**start_message, "headers": headers})
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            
+            await self.send({**start_message, "headers": headers})
+        
+        compressed = await self._compress_body(body, not more_body)
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
@@ -0,0 +1,207 @@
+"""
+Load test for the FastAPI application.
+
+This script sends concurrent quote requests to a running API for a fixed duration
+and reports throughput and latency percentiles. It is also used by the launcher's
+autotune mode.
+"""
+
+import os
+import sys
+import time
+import json
+import argparse
+import threading
+import requests
+from typing import Any, Dict, List, Optional
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.test_api import get_individual_dir
+
+
+def load_sample_quotes() -> List[Dict[str, Any]]:
+    """
+    Load all sample quotes from the individual directory.
+    
+    Returns:
+        List of quote dictionaries
+    """
+    individual_dir = get_individual_dir()
+    quotes = []
+    for filename in sorted(os.listdir(individual_dir)):
+        if filename.endswith('.json'):
+            with open(os.path.join(individual_dir, filename), 'r') as f:
+                quotes.append(json.load(f))
+    return quotes
+
+
+def _percentile(sorted_values: List[float], percentile: float) -> float:
+    """
+    Get a percentile of a sorted list of values.
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percentile))
+    return sorted_values[index]
+
+
+def run_load_test(
+    url: str,
+    concurrency: int = 8,
+    duration: float = 10.0,
+    quotes: Optional[List[Dict[str, Any]]] = None,
+    batch_size: int = 0,
+    api_key: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Send quote requests from concurrent clients for a fixed duration.
+    
+    Args:
+        url: URL of the quote endpoint (/quote, or /quotes/batch with batch_size)
+        concurrency: Number of concurrent clients
+        duration: Test duration in seconds
+        quotes: Quotes to send in rotation (default: the sample quotes)
+        batch_size: Quotes per request for the batch endpoint (0 sends single quotes)
+        api_key: API key sent in the X-API-Key header, identifying the client
+        
+    Returns:
+        Dictionary with the request and error counts, the count per HTTP status,
+        throughput (requests per second) and p50/p99 latency in milliseconds
+    """
+    if quotes is None:
+        quotes = load_sample_quotes()
+    headers = {"X-API-Key": api_key} if api_key else {}
+    
+    latencies = []
+    errors = [0]
+    statuses = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    
+    def client(offset: int):
+        session = requests.Session()
+        local_latencies = []
+        local_errors = 0
+        local_statuses = {}
+        i = offset
+        while time.perf_counter() < deadline:
+            if batch_size:
+                payload = {"data": [quotes[(i + j) % len(quotes)] for j in range(batch_size)]}
+            else:
+                payload = {"data": quotes[i % len(quotes)]}
+            i += 1
+            start = time.perf_counter()
+            try:
+                response = session.post(url, json=payload, headers=headers)
+                status = str(response.status_code)
+                if response.status_code != 200:
+                    local_errors += 1
+            except requests.RequestException:
+                status = "error"
+                local_errors += 1
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+            local_latencies.append(time.perf_counter() - start)
+        
+        with lock:
+            latencies.extend(local_latencies)
+            errors[0] += local_errors
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+    
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "statuses": statuses,
+        "throughput": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 2)
+    }
+
+
+def main():
+    """
+    Main entry point for the load test script.
+    """
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description="Load test the Insurance Pricing API")
+    parser.add_argument(
+        "--host", 
+        type=str, 
+        default="127.0.0.1", 
+        help="API host"
+    )
+    parser.add_argument(
+        "--port", 
+        type=int, 
+        default=8000, 
+        help="API port"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Number of concurrent clients"
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=10.0,
+        help="Test duration in seconds"
+    )
+    parser.add_argument(
+        "--batch-clients",
+        type=int,
+        default=0,
+        help="Number of concurrent batch clients running alongside the single-quote clients"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=100,
+        help="Quotes per batch request"
+    )
+    parser.add_argument(
+        "--api-key",
+        type=str,
+        default=None,
+        help="API key identifying the single-quote clients (batch clients use '<key>-batch')"
+    )
+    args = parser.parse_args()
+    
+    base_url = f"http://{args.host}:{args.port}"
+    quotes = load_sample_quotes()
+    results = {}
+    
+    def run(name, *run_args, **run_kwargs):
+        results[name] = run_load_test(*run_args, **run_kwargs)
+    
+    # Run the single-quote clients, and the batch clients alongside them if requested
+    threads = [threading.Thread(target=run, args=(
+        "single", f"{base_url}/quote", args.concurrency, args.duration, quotes
+    ), kwargs={"api_key": args.api_key})]
+    if args.batch_clients:
+        threads.append(threading.Thread(target=run, args=(
+            "batch", f"{base_url}/quotes/batch", args.batch_clients, args.duration, quotes
+        ), kwargs={"batch_size": args.batch_size, "api_key": f"{args.api_key or 'load-test'}-batch"}))
+    
+    print(f"Load testing {base_url} with {args.concurrency} single-quote and "
+          f"{args.batch_clients} batch clients for {args.duration}s...")
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
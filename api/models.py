@@ -4,18 +4,62 @@ Pydantic models for the API.
 This module defines the data models used for API requests and responses.
 """
 
-from typing import Dict, Any, List, Optional
-from pydantic import BaseModel, Field
+from typing import Dict, Any, List, Optional, Type, Union
+from typing_extensions import Annotated
+from pydantic import BaseModel, ConfigDict, Field, create_model
+
+from algorithms.config import get_primary_id
+from algorithms.pipeline.validation import get_quote_schema
+
+
+def build_quote_data_model(schema: Dict[str, Dict[str, Any]]) -> Type[BaseModel]:
+    """
+    Generate the typed model of the quote data from the quote schema.
+    
+    Banded columns become numbers constrained to the range of their bands and
+    indexed columns become strings, with their configured levels as examples
+    (the pipeline gives other levels a null index). Only the columns the rating
+    plan reads are required. Fields that are not in the schema are accepted and
+    passed through to the pipeline.
+    
+    Args:
+        schema: Quote schema from algorithms.pipeline.validation
+        
+    Returns:
+        Pydantic model class for the quote data
+    """
+    fields = {get_primary_id(): (Optional[Union[int, str]], Field(None, description="Identifier for the quote"))}
+    
+    for column, spec in schema.items():
+        if spec["type"] == "number":
+            bounds = {"ge" if spec["min_inclusive"] else "gt": spec["min"], "lt" if spec["max_exclusive"] else "le": spec["max"]}
+            field_type = Annotated[Union[int, float], Field(**bounds)]
+            examples = None
+        else:
+            field_type = str
+            examples = spec["levels"]
+        
+        if spec["required"]:
+            fields[column] = (field_type, Field(..., examples=examples))
+        else:
+            fields[column] = (Optional[field_type], Field(None, examples=examples))
+    
+    return create_model("QuoteData", __config__=ConfigDict(extra="allow"), **fields)
+
+
+# Typed quote data, generated from the transformation configurations at startup
+QuoteData = build_quote_data_model(get_quote_schema())
 
 
 class QuoteRequest(BaseModel):
     """
     Model for a quote request.
     
-    This is a flexible model that can accept any JSON data structure.
-    The validation is minimal to allow for different data formats.
+    The quote data is validated against the quote schema, so missing rating
+    factors, values of the wrong type and out-of-range values are rejected with a
+    422 response naming the field.
     """
-    data: Dict[str, Any] = Field(
+    data: QuoteData = Field(
         ..., 
         description="Quote data in JSON format"
     )
@@ -37,6 +81,82 @@ class QuoteResponse(BaseModel):
     )
     
     
+class QuoteBatchRequest(BaseModel):
+    """
+    Model for a batch quote request.
+    """
+    data: List[Dict[str, Any]] = Field(
+        ..., 
+        description="List of quotes in JSON format"
+    )
+
+
+class QuoteRejection(BaseModel):
+    """
+    Model for a quote of a batch that failed validation.
+    """
+    index: int = Field(
+        ..., 
+        description="Position of the quote in the request"
+    )
+    quote_id: Optional[str] = Field(
+        None, 
+        description="Identifier for the quote"
+    )
+    errors: List[str] = Field(
+        ..., 
+        description="Validation error messages"
+    )
+
+
+class QuoteBatchResponse(BaseModel):
+    """
+    Model for a batch quote response.
+    
+    Quotes that fail validation are listed in rejected; other quotes that could
+    not be rated are left out.
+    """
+    quotes: List[QuoteResponse] = Field(
+        ..., 
+        description="Premium details of each rated quote"
+    )
+    rejected: List[QuoteRejection] = Field(
+        default_factory=list,
+        description="Quotes that failed validation"
+    )
+
+
+class RollupQuery(BaseModel):
+    """
+    Model for a slice-and-dice query of the premium rollup cube.
+    """
+    by: List[str] = Field(
+        default_factory=list,
+        description="Rating factors to group by, e.g. [\"Area\", \"DrivAgeBand\"]; empty for a total"
+    )
+    filters: Dict[str, Union[str, List[str]]] = Field(
+        default_factory=dict,
+        description="Rating factors mapped to a level or a list of levels, e.g. {\"Region\": \"Centre\"}"
+    )
+
+
+class RollupResponse(BaseModel):
+    """
+    Model for the answer to a rollup query.
+    
+    Each row has the levels of the by factors and the policies, premium,
+    average_premium, premium_std, premium_min and premium_max of the group.
+    """
+    rows: List[Dict[str, Any]] = Field(
+        ..., 
+        description="One row per combination of the by factors"
+    )
+    cells: int = Field(
+        ..., 
+        description="Number of cells in the cube"
+    )
+
+
 class ErrorResponse(BaseModel):
     """
     Model for error responses.
@@ -4,7 +4,6 @@ Script to run the FastAPI application.
 This script starts the FastAPI application using Uvicorn.
 """
 
-import uvicorn
 import os
 import sys
 import argparse
@@ -12,6 +11,8 @@ import argparse
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+from py_pricer.concurrency import add_concurrency_arguments, resolve_concurrency, apply_concurrency_settings
+
 def main():
     """
     Main entry point for running the API server.
@@ -35,17 +36,44 @@ def main():
         action="store_true", 
         help="Enable auto-reload for development"
     )
+    add_concurrency_arguments(parser)
+    parser.add_argument(
+        "--timeout-keep-alive",
+        type=int,
+        default=5,
+        help="Seconds to keep idle connections open for reuse (default: 5)"
+    )
+    parser.add_argument(
+        "--http",
+        type=str,
+        choices=["auto", "h11", "httptools"],
+        default="auto",
+        help="HTTP implementation; httptools is faster but must be installed (default: auto)"
+    )
     args = parser.parse_args()
     
     # Ensure the logs directory exists
     os.makedirs("logs", exist_ok=True)
     
+    # Apply the concurrency settings before the API (and Polars) is imported
+    settings = resolve_concurrency(args)
+    if args.reload and settings["workers"] > 1:
+        print("Error: --reload cannot be combined with more than one worker")
+        sys.exit(1)
+    apply_concurrency_settings(settings)
+    
+    # Import the server only when launching it, so --help starts quickly
+    import uvicorn
+    
     # Start the server
     uvicorn.run(
         "api.api:app",
         host=args.host,
         port=args.port,
         reload=args.reload,
+        workers=settings["workers"],
+        timeout_keep_alive=args.timeout_keep_alive,
+        http=args.http,
         log_level="info"
     )
 
@@ -0,0 +1,76 @@
+"""
+Single-flight execution for identical concurrent requests.
+
+Clients often retry the exact same quote within milliseconds. Requests whose
+canonical payload matches one that is already being priced wait for that
+computation's result instead of starting their own.
+"""
+
+import json
+import asyncio
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+def canonical_key(payload: Dict[str, Any]) -> str:
+    """
+    Build a key identifying a payload regardless of its key order and whitespace.
+    
+    Args:
+        payload: JSON-compatible request payload
+        
+    Returns:
+        SHA-256 hex digest of the canonical JSON encoding of the payload
+    """
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class SingleFlight:
+    """
+    Share one in-flight computation between concurrent calls with the same key.
+    
+    The computation runs as a task of its own, so a caller that is cancelled (for
+    example when its client disconnects) does not cancel the computation for the
+    other callers. Keys are forgotten as soon as the computation finishes, so
+    results are never cached.
+    """
+    
+    def __init__(self):
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.counters = {"calls": 0, "executed": 0, "collapsed": 0}
+    
+    async def run(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """
+        Await func(*args) unless a call with the same key is in flight.
+        
+        Args:
+            key: Key identifying the computation
+            func: Coroutine function performing the computation
+            *args: Arguments passed to func
+            
+        Returns:
+            The result of the computation, shared by all callers with the key
+        """
+        self.counters["calls"] += 1
+        
+        task = self._in_flight.get(key)
+        if task is None:
+            self.counters["executed"] += 1
+            task = asyncio.ensure_future(func(*args))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.counters["collapsed"] += 1
+        
+        return await asyncio.shield(task)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the call counters.
+        
+        Returns:
+            Dictionary with the number of calls, computations executed, calls
+            collapsed into an in-flight computation and computations in flight
+        """
+        return {**self.counters, "in_flight": len(self._in_flight)}
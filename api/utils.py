@@ -2,17 +2,34 @@
 Utility functions for the API.
 
 This module provides helper functions for processing quote data.
+
+Polars and the pricing pipeline are imported on first use, so importing this module
+(and the launchers that depend on it) stays fast; call warm_up() to load them early.
 """
 
-import polars as pl
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, TYPE_CHECKING
 import json
-from algorithms.pipeline.data_processor import process_data
-from algorithms.rating.rating_engine import rate_policies
-from algorithms.config import get_primary_id
+import logging
+import threading
+import time
+from algorithms.config import get_primary_id, get_rating_config
+
+if TYPE_CHECKING:
+    import polars as pl
+
+logger = logging.getLogger(__name__)
+
+# Premium cube state: the (rating version, cube, time the version was checked)
+# triple, built on first use when precompute mode is enabled and rebuilt when the
+# rating version changes
+_premium_cube = {"state": (None, None, 0.0)}
+_premium_cube_lock = threading.Lock()
 
+# Seconds between checks of the rating version (each check stats the rating files)
+CUBE_VERSION_CHECK_SECONDS = 1.0
 
-def json_to_dataframe(json_data: Dict[str, Any]) -> pl.DataFrame:
+
+def json_to_dataframe(json_data: Dict[str, Any]) -> "pl.DataFrame":
     """
     Convert JSON data to a Polars DataFrame.
     
@@ -22,11 +39,13 @@ def json_to_dataframe(json_data: Dict[str, Any]) -> pl.DataFrame:
     Returns:
         Polars DataFrame with the quote data
     """
+    import polars as pl
+    
     # Convert the JSON data to a DataFrame with a single row
     return pl.DataFrame([json_data])
 
 
-def extract_premium_details(df: pl.DataFrame, original_df: pl.DataFrame) -> Dict[str, Any]:
+def extract_premium_details(df: "pl.DataFrame", original_df: "pl.DataFrame") -> Dict[str, Any]:
     """
     Extract premium calculation details from the rated DataFrame.
     
@@ -41,11 +60,233 @@ def extract_premium_details(df: pl.DataFrame, original_df: pl.DataFrame) -> Dict
     rating_columns = [col for col in df.columns if col not in original_df.columns]
     
     # Extract the values from the first row (since we're processing a single quote)
-    premium_details = {}
-    for col in rating_columns:
-        premium_details[col] = df[0, col]
+    return df.select(rating_columns).row(0, named=True)
+
+
+def process_quote_batch(df: "pl.DataFrame") -> "pl.DataFrame":
+    """
+    Process a batch of quotes through the transformation pipeline and rating engine.
+    
+    Args:
+        df: DataFrame with one raw quote per row
+        
+    Returns:
+        DataFrame with the primary ID (if present) and the columns added by the
+        rating engine, one row per quote that could be rated
+    """
+    from algorithms.pipeline.data_processor import process_data
+    from algorithms.rating.rating_engine import rate_policies, get_rating_key_columns
+    
+    # Process the data through the pipeline stages the rating plan needs
+    transformed_df = process_data(df, required_columns=get_rating_key_columns())
+    
+    # Apply rating to the unique rating cells and join the premiums back
+    rated_df = rate_policies(transformed_df, by_cell=True)
+    
+    # Keep the primary ID and the rating columns
+    primary_id = get_primary_id()
+    rating_columns = [col for col in rated_df.columns if col not in transformed_df.columns]
+    if primary_id in rated_df.columns:
+        rating_columns = [primary_id] + rating_columns
+    
+    return rated_df.select(rating_columns)
+
+
+def rate_quote_list(quotes: List[Dict[str, Any]], rejected: Optional[List[Dict[str, Any]]] = None) -> "pl.DataFrame":
+    """
+    Rate a list of quotes as one batch.
+    
+    The quotes are validated in one vectorized pass first and only the valid
+    quotes are rated.
+    
+    Args:
+        quotes: List of dictionaries containing quote data
+        rejected: Optional list extended with the "index", "quote_id" and "errors"
+                  of each quote that failed validation
+        
+    Returns:
+        DataFrame with the primary ID and rating columns of each rated quote
+    """
+    import polars as pl
+    from algorithms.pipeline.validation import split_valid_quotes
+    
+    valid_df, invalid = split_valid_quotes(pl.DataFrame(quotes, infer_schema_length=None))
+    
+    if rejected is not None:
+        primary_id = get_primary_id()
+        for row in invalid.iter_rows(named=True):
+            quote_id = quotes[row["row"]].get(primary_id)
+            rejected.append({
+                "index": row["row"],
+                "quote_id": str(quote_id) if quote_id is not None else None,
+                "errors": row["errors"]
+            })
+    
+    return process_quote_batch(valid_df)
+
+
+def rated_frame_to_results(rated_df: "pl.DataFrame") -> List[Dict[str, Any]]:
+    """
+    Convert rated quotes to the result form of process_quote.
+    
+    Args:
+        rated_df: DataFrame from process_quote_batch
+        
+    Returns:
+        List of dictionaries containing the quote ID and premium details of each quote
+    """
+    primary_id = get_primary_id()
+    
+    results = []
+    for row in rated_df.iter_rows(named=True):
+        quote_id = row.pop(primary_id, None)
+        results.append({
+            primary_id: str(quote_id) if quote_id is not None else None,
+            "premium_details": row
+        })
+    return results
+
+
+def process_quote_list(quotes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Process a list of quotes as one batch.
+    
+    Args:
+        quotes: List of dictionaries containing quote data
+        
+    Returns:
+        List of dictionaries containing the quote ID and premium details of each
+        rated quote, in the same form as process_quote
+    """
+    return rated_frame_to_results(rate_quote_list(quotes))
+
+
+def iter_ndjson_results(rated_df: "pl.DataFrame", chunk_rows: int = 1000) -> Iterator[bytes]:
+    """
+    Encode rated quotes as NDJSON in chunks of rows, for streaming responses.
+    
+    Each line has the same quote_id and premium_details fields as a /quote response.
+    
+    Args:
+        rated_df: DataFrame from process_quote_batch
+        chunk_rows: Number of quotes per chunk
+        
+    Yields:
+        NDJSON bytes for each chunk of quotes
+    """
+    import polars as pl
+    
+    primary_id = get_primary_id()
+    rating_columns = [col for col in rated_df.columns if col != primary_id]
+    quote_id = pl.col(primary_id).cast(pl.String) if primary_id in rated_df.columns else pl.lit(None, pl.String)
+    responses = rated_df.select(
+        quote_id.alias("quote_id"),
+        pl.struct(rating_columns).alias("premium_details")
+    )
+    
+    for offset in range(0, responses.height, chunk_rows):
+        yield responses.slice(offset, chunk_rows).write_ndjson().encode()
+
+
+def iter_arrow_results(rated_df: "pl.DataFrame", chunk_rows: int = 10_000) -> Iterator[bytes]:
+    """
+    Encode rated quotes as an Arrow IPC stream in record batches, for streaming responses.
+    
+    Args:
+        rated_df: DataFrame from process_quote_batch
+        chunk_rows: Number of quotes per record batch
+        
+    Yields:
+        Arrow IPC stream bytes: the schema with the first batch, then one message per batch
+    """
+    import io
+    import pyarrow as pa
+    
+    table = rated_df.to_arrow()
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        for batch in table.to_batches(max_chunksize=chunk_rows):
+            writer.write_batch(batch)
+            yield sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+    yield sink.getvalue()
+
+
+def get_premium_cube() -> Optional[Dict[str, Any]]:
+    """
+    Get the precomputed premium cube if precompute mode is enabled.
+    
+    The cube is built on first use, and rebuilt when the rating version (the
+    content hash of the pipeline configuration, rating engine and rating tables)
+    changes; the version is checked at most every CUBE_VERSION_CHECK_SECONDS.
+    Quotes are rated by the normal engine if the rating plan cannot be
+    precomputed, if a custom transform may change the rating inputs (the cube
+    would bypass it), or if the cube's check against the rating engine fails.
+    
+    Returns:
+        Premium cube dictionary or None if quotes should use the rating engine
+    """
+    if not get_rating_config().get("precompute_cube", False):
+        return None
     
-    return premium_details
+    from api.audit import get_rating_version
+    
+    built_version, cube, checked = _premium_cube["state"]
+    now = time.monotonic()
+    if built_version is not None and now - checked < CUBE_VERSION_CHECK_SECONDS:
+        return cube
+    
+    version = get_rating_version()
+    if built_version == version:
+        _premium_cube["state"] = (version, cube, now)
+        return cube
+    
+    # Only one thread builds the cube; the others wait for it
+    with _premium_cube_lock:
+        built_version, cube, _ = _premium_cube["state"]
+        if built_version != version:
+            cube = _build_premium_cube()
+        _premium_cube["state"] = (version, cube, time.monotonic())
+    return cube
+
+
+def _build_premium_cube() -> Optional[Dict[str, Any]]:
+    """
+    Build the premium cube and check it against the rating engine on the sample quotes.
+    
+    Returns:
+        Premium cube dictionary or None if the cube cannot be used
+    """
+    from algorithms.pipeline.data_processor import process_data
+    from algorithms.pipeline.utils import load_individual_data
+    from algorithms.rating.rating_engine import rate_policies
+    from algorithms.rating.premium_cube import build_premium_cube, check_premium_cube, find_bypassed_stages
+    
+    bypassed = find_bypassed_stages()
+    if bypassed:
+        logger.warning(
+            f"Pipeline stages {', '.join(bypassed)} may change the rating inputs and "
+            f"would be bypassed by the premium cube; premium cube disabled"
+        )
+        return None
+    
+    cube = build_premium_cube()
+    if cube is None:
+        logger.warning("Rating plan has continuous terms; premium cube disabled")
+        return None
+    
+    sample_df = load_individual_data()
+    if sample_df is not None:
+        check = check_premium_cube(cube, sample_df, rate_policies(process_data(sample_df)))
+        if check["mismatches"]:
+            logger.warning(
+                f"Premium cube disagrees with the rating engine on "
+                f"{len(check['mismatches'])} sample quotes; premium cube disabled"
+            )
+            return None
+    
+    return cube
 
 
 def process_quote(json_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -58,22 +299,38 @@ def process_quote(json_data: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dictionary containing the quote ID and premium details
     """
-    # Convert JSON to DataFrame
-    df = json_to_dataframe(json_data)
-    
     # Get the primary ID field
     primary_id = get_primary_id()
     
     # Extract the quote ID if available
     primary_id_value = None
-    if primary_id in df.columns:
-        primary_id_value = str(df[0, primary_id])
+    if json_data.get(primary_id) is not None:
+        primary_id_value = str(json_data[primary_id])
+    
+    # Answer from the premium cube when precompute mode is enabled
+    cube = get_premium_cube()
+    if cube is not None:
+        from algorithms.rating.premium_cube import lookup_quote
+        premium_details = lookup_quote(cube, json_data)
+        if premium_details is not None:
+            return {
+                primary_id: primary_id_value,
+                "premium_details": premium_details
+            }
+    
+    from algorithms.pipeline.data_processor import process_data
+    from algorithms.rating.rating_engine import rate_policies, get_rating_key_columns
+    
+    # Convert JSON to DataFrame
+    df = json_to_dataframe(json_data)
     
-    # Process the data through the transformation pipeline
-    transformed_df = process_data(df)
+    # Process the data through the pipeline stages the rating plan needs
+    transformed_df = process_data(df, required_columns=get_rating_key_columns())
     
     # Apply rating
     rated_df = rate_policies(transformed_df)
+    if rated_df.height == 0:
+        raise ValueError("No rating table entry matches the quote")
     
     # Extract premium details
     premium_details = extract_premium_details(rated_df, transformed_df)
@@ -82,4 +339,13 @@ def process_quote(json_data: Dict[str, Any]) -> Dict[str, Any]:
     return {
         primary_id: primary_id_value,
         "premium_details": premium_details
-    } 
\ No newline at end of file
+    } 
+
+
+def warm_up() -> None:
+    """
+    Load the pricing pipeline and build the premium cube ahead of the first quote.
+    """
+    import algorithms.pipeline.data_processor
+    import algorithms.rating.rating_engine
+    get_premium_cube()
@@ -0,0 +1,108 @@
+"""
+Benchmark the binary pricing server against the HTTP API.
+
+Both servers are started in-process on free local ports. The benchmark measures
+single-quote latency over each transport and batch throughput with the binary
+server's pipelined streaming.
+
+Usage:
+    python benchmarks/bench_binary_server.py --quotes 500 --batch-size 1000 --batches 20
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import threading
+import statistics
+import polars as pl
+
+# Add the project root to the Python path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+os.chdir(PROJECT_ROOT)
+os.makedirs("logs", exist_ok=True)
+
+import requests
+import uvicorn
+
+from algorithms.pipeline.synthetic import generate_portfolio
+from api.utils import process_quote_batch
+from api.binary_server import PricingServer, PricingRequestHandler, BinaryPricingClient
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_http_server(port: int) -> uvicorn.Server:
+    from api.api import app
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def start_binary_server(port: int) -> PricingServer:
+    server = PricingServer(("127.0.0.1", port), PricingRequestHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def summarize(name: str, timings: list) -> None:
+    timings = sorted(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"{name:<24} p50 {statistics.median(timings) * 1000:8.2f} ms   "
+          f"p99 {p99 * 1000:8.2f} ms   {len(timings) / sum(timings):8.0f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the binary pricing server against the HTTP API")
+    parser.add_argument("--quotes", type=int, default=500, help="Number of single quotes per transport")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per streamed batch")
+    parser.add_argument("--batches", type=int, default=20, help="Number of streamed batches")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic quotes")
+    args = parser.parse_args()
+    
+    # Synthetic quotes, keeping those the rating tables can price
+    sample = generate_portfolio(2 * max(args.quotes, args.batch_size), seed=args.seed)
+    sample = sample.filter(pl.col("IDpol").is_in(process_quote_batch(sample)["IDpol"].implode()))
+    quotes = sample.head(args.quotes).to_dicts()
+    
+    http_port, binary_port = _free_port(), _free_port()
+    start_http_server(http_port)
+    start_binary_server(binary_port)
+    
+    # Single-quote latency over HTTP/JSON
+    session = requests.Session()
+    url = f"http://127.0.0.1:{http_port}/quote"
+    timings = []
+    for quote in quotes:
+        start = time.perf_counter()
+        session.post(url, json={"data": quote}).raise_for_status()
+        timings.append(time.perf_counter() - start)
+    summarize("HTTP /quote", timings)
+    
+    # Single-quote latency over the binary protocol
+    with BinaryPricingClient("127.0.0.1", binary_port) as client:
+        timings = []
+        for quote in quotes:
+            start = time.perf_counter()
+            client.quote(quote)
+            timings.append(time.perf_counter() - start)
+        summarize("binary quote", timings)
+        
+        # Pipelined batch throughput
+        batch = sample.head(args.batch_size)
+        start = time.perf_counter()
+        rows = sum(rated.height for rated in client.rate_stream(batch for _ in range(args.batches)))
+        elapsed = time.perf_counter() - start
+        print(f"{'binary stream':<24} {rows} rows in {elapsed:.2f} s   {rows / elapsed:8.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark batch response formats and compression.
+
+Starts the API in-process and posts a batch of quotes to /quotes/batch with each
+response format (JSON, streamed NDJSON, streamed Arrow IPC) and content encoding
+(none, gzip and, if zstandard is installed, zstd), reporting the bytes on the wire
+and the latency.
+
+Usage:
+    python benchmarks/bench_compression.py --quotes 10000 --runs 5
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import threading
+import statistics
+
+# Add the project root to the Python path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+os.chdir(PROJECT_ROOT)
+os.makedirs("logs", exist_ok=True)
+
+import requests
+import uvicorn
+
+from algorithms.pipeline.synthetic import generate_portfolio
+from api.compression import available_encodings
+
+FORMATS = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_http_server(port: int) -> uvicorn.Server:
+    from api.api import app
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch response formats and compression")
+    parser.add_argument("--quotes", type=int, default=10_000, help="Quotes per batch")
+    parser.add_argument("--runs", type=int, default=5, help="Requests per format and encoding")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic quotes")
+    args = parser.parse_args()
+    
+    quotes = generate_portfolio(args.quotes, seed=args.seed).to_dicts()
+    
+    port = _free_port()
+    start_http_server(port)
+    url = f"http://127.0.0.1:{port}/quotes/batch"
+    session = requests.Session()
+    
+    print(f"{'format':<8} {'encoding':<9} {'bytes':>12} {'p50 ms':>9}")
+    for format_name, media_type in FORMATS.items():
+        for encoding in ["identity"] + available_encodings():
+            timings = []
+            wire_bytes = 0
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                response = session.post(
+                    url,
+                    json={"data": quotes},
+                    headers={"Accept": media_type, "Accept-Encoding": encoding},
+                    stream=True
+                )
+                response.raise_for_status()
+                # Read the body as sent, without decompressing it
+                wire_bytes = len(response.raw.read(decode_content=False))
+                timings.append(time.perf_counter() - start)
+            print(f"{format_name:<8} {encoding:<9} {wire_bytes:>12,} {statistics.median(timings) * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
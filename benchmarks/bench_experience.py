@@ -0,0 +1,109 @@
+"""
+Benchmark the claims experience analytics on a large synthetic book.
+
+Rates a synthetic portfolio and generates claims (partitioned by claim year, with
+extra columns the analytics do not need), then compares an eager read-join-aggregate with the lazy
+experience_by query, which pushes the column selection and year filter into the scan.
+
+Usage:
+    python benchmarks/bench_experience.py --policies 10000000 --claims 1000000
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import polars as pl
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.analytics.experience import experience_by, scan_claims
+from algorithms.pipeline.synthetic import iter_portfolio_batches
+from algorithms.rating.batch_rating import rate_batches, write_rated_batches
+
+
+def _choice(index: pl.Expr, levels: list, seed: int) -> pl.Expr:
+    """
+    Pick a level for each row from a hash of the row index.
+    """
+    return pl.lit(pl.Series(levels)).gather(index.hash(seed) % len(levels))
+
+
+def generate_book(directory: str, policies: int, claims: int) -> None:
+    """
+    Write a rated synthetic portfolio and year-partitioned claims to a directory.
+    """
+    # Rate the synthetic portfolio chunk by chunk (quotes with levels missing
+    # from the rating tables are dropped, as in production)
+    write_rated_batches(
+        rate_batches(iter_portfolio_batches(policies, seed=0)),
+        os.path.join(directory, "policies.parquet")
+    )
+    
+    claims_dir = os.path.join(directory, "claims")
+    per_year = claims // 3
+    for offset, year in enumerate((2022, 2023, 2024)):
+        index = pl.int_range(0, per_year, dtype=pl.Int64)
+        partition_dir = os.path.join(claims_dir, f"year={year}")
+        os.makedirs(partition_dir)
+        (
+            pl.LazyFrame()
+            .select(
+                (1 + index.hash(10 + offset) % policies).cast(pl.Int64).alias("IDpol"),
+                pl.lit(1, dtype=pl.Int32).alias("ClaimNb"),
+                (index.hash(20 + offset) % 5000).cast(pl.Float64).alias("ClaimAmount"),
+                # Columns the analytics never read
+                *[(index.hash(30 + i) % 100000).alias(f"detail_{i}") for i in range(8)],
+                _choice(index, ["open", "closed", "reopened"], 40).alias("status"),
+            )
+            .sink_parquet(os.path.join(partition_dir, "claims.parquet"))
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the claims experience analytics")
+    parser.add_argument("--policies", type=int, default=10_000_000, help="Number of rated policies")
+    parser.add_argument("--claims", type=int, default=1_000_000, help="Number of claims")
+    args = parser.parse_args()
+    
+    directory = tempfile.mkdtemp(prefix="pypricer_bench_")
+    try:
+        start = time.perf_counter()
+        generate_book(directory, args.policies, args.claims)
+        print(f"Generated {args.policies} policies and {args.claims} claims in {time.perf_counter() - start:.1f}s")
+        
+        policies_path = os.path.join(directory, "policies.parquet")
+        claims_dir = os.path.join(directory, "claims")
+        by = ["Area", "DrivAgeBand"]
+        
+        # Eager: read everything, then join and aggregate
+        start = time.perf_counter()
+        rated = pl.read_parquet(policies_path)
+        claims = pl.read_parquet(os.path.join(claims_dir, "**", "*.parquet"), hive_partitioning=True)
+        claims = claims.filter(pl.col("year") == 2024)
+        eager = experience_by(rated, by, claims=claims)
+        eager_seconds = time.perf_counter() - start
+        print(f"{'eager read + join':<28} {eager_seconds:6.2f}s")
+        
+        # Lazy: projection and partition filter pushed into the scans
+        start = time.perf_counter()
+        lazy = experience_by(
+            pl.scan_parquet(policies_path),
+            by,
+            claims_path=claims_dir,
+            claims_filter=pl.col("year") == 2024
+        )
+        lazy_seconds = time.perf_counter() - start
+        print(f"{'lazy experience_by':<28} {lazy_seconds:6.2f}s  ({eager_seconds / lazy_seconds:.1f}x)")
+        
+        assert eager.equals(lazy), "Eager and lazy results differ"
+        print(lazy)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
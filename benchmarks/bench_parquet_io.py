@@ -0,0 +1,128 @@
+"""
+Benchmark Parquet loading with column projection and filter pushdown.
+
+Writes a wide synthetic production extract (the pipeline's input columns plus many
+columns rating never reads), sorted by Region so row-group statistics are selective,
+both as one file and as a Region-partitioned dataset. Then compares a full read with
+scans that read only the pipeline's columns and push a Region filter into the reader.
+
+Usage:
+    python benchmarks/bench_parquet_io.py --rows 2000000 --extra-columns 90
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import polars as pl
+import pyarrow.parquet as pq
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.pipeline.synthetic import generate_portfolio
+from algorithms.pipeline.data_processor import get_input_columns
+from algorithms.pipeline.utils import load_parquet, hive_partition_path
+
+
+def write_extract(directory: str, rows: int, extra_columns: int) -> str:
+    """
+    Write a wide extract as one file and as a Region-partitioned dataset.
+    """
+    index = pl.int_range(0, pl.len(), dtype=pl.Int64)
+    extract = generate_portfolio(rows, seed=1).sort("Region").with_columns(
+        *[(index.hash(i) % 1_000_000).cast(pl.Float64).alias(f"metric_{i}") for i in range(extra_columns // 2)],
+        *[(index.hash(1000 + i) % 1000).cast(pl.String).alias(f"code_{i}") for i in range(extra_columns - extra_columns // 2)],
+    )
+    
+    file_path = os.path.join(directory, "extract.parquet")
+    extract.write_parquet(file_path, row_group_size=100_000, statistics=True)
+    
+    for key, part in extract.partition_by("Region", as_dict=True, include_key=False).items():
+        partition_dir = os.path.join(directory, "dataset", hive_partition_path(["Region"], key))
+        os.makedirs(partition_dir)
+        part.write_parquet(os.path.join(partition_dir, "part-00000.parquet"), row_group_size=100_000)
+    
+    return file_path
+
+
+def estimate_bytes_read(file_path: str, columns=None, region=None) -> int:
+    """
+    Estimate the compressed bytes a reader needs from a file's column chunk sizes,
+    skipping row groups whose Region statistics exclude the filter.
+    """
+    metadata = pq.ParquetFile(file_path).metadata
+    names = [metadata.schema.column(i).name for i in range(metadata.num_columns)]
+    region_index = names.index("Region")
+    
+    total = 0
+    for group in range(metadata.num_row_groups):
+        row_group = metadata.row_group(group)
+        stats = row_group.column(region_index).statistics
+        if region is not None and stats is not None and stats.has_min_max and not (stats.min <= region <= stats.max):
+            continue
+        for i, name in enumerate(names):
+            if columns is None or name in columns:
+                total += row_group.column(i).total_compressed_size
+    return total
+
+
+def timed(func):
+    """
+    Run a function and return its result with the elapsed seconds.
+    """
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Parquet projection and filter pushdown")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="Rows in the extract")
+    parser.add_argument("--extra-columns", type=int, default=90, help="Columns the pipeline does not read")
+    parser.add_argument("--region", type=str, default="Bretagne", help="Region to filter on")
+    args = parser.parse_args()
+    
+    directory = tempfile.mkdtemp(prefix="pypricer_bench_")
+    try:
+        start = time.perf_counter()
+        file_path = write_extract(directory, args.rows, args.extra_columns)
+        dataset_dir = os.path.join(directory, "dataset")
+        print(f"Wrote {args.rows} rows x {len(pq.ParquetFile(file_path).schema_arrow)} columns "
+              f"({os.path.getsize(file_path) / 1e6:.0f} MB) in {time.perf_counter() - start:.1f}s")
+        
+        # The columns the loaders read by default (None if the pipeline may read any column)
+        columns = get_input_columns()
+        print(f"Pipeline columns: {', '.join(columns) if columns is not None else 'all (TRANSFORM_INPUTS is None)'}")
+        region_filter = {"Region": args.region}
+        
+        cases = [
+            ("full read, filter in memory",
+             lambda: pl.read_parquet(file_path).filter(pl.col("Region") == args.region).select(columns or pl.all()),
+             estimate_bytes_read(file_path)),
+            ("pipeline columns",
+             lambda: load_parquet(file_path, columns),
+             estimate_bytes_read(file_path, columns)),
+            ("pipeline columns + filter",
+             lambda: load_parquet(file_path, columns, region_filter),
+             estimate_bytes_read(file_path, columns, args.region)),
+            ("partitioned dataset + filter",
+             lambda: load_parquet(dataset_dir, columns, region_filter),
+             None),
+        ]
+        
+        print(f"{'case':<30} {'rows':>10} {'seconds':>8} {'MB read (est.)':>15}")
+        baseline = None
+        for name, func, bytes_read in cases:
+            result, seconds = timed(func)
+            baseline = baseline or seconds
+            estimate = f"{bytes_read / 1e6:15.1f}" if bytes_read is not None else f"{'-':>15}"
+            print(f"{name:<30} {result.height:>10} {seconds:8.2f} {estimate}  ({baseline / seconds:.1f}x)")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
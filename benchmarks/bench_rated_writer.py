@@ -0,0 +1,98 @@
+"""
+Benchmark writing rated books: compression codecs and levels, partitioning and row-group sizes.
+
+Rates a synthetic portfolio once, then writes the rated rows with each configuration
+through write_rated_batches and reports the write throughput, the size on disk and the
+time a downstream scan of one Area takes.
+
+Usage:
+    python benchmarks/bench_rated_writer.py --rows 1000000 --chunk-size 100000
+"""
+
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+import polars as pl
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.pipeline.synthetic import iter_portfolio_batches
+from algorithms.rating.batch_rating import rate_batches, write_rated_batches
+
+# (label, compression, compression level, partition columns, row group size)
+CONFIGURATIONS = [
+    ("snappy", "snappy", None, [], 131_072),
+    ("lz4", "lz4", None, [], 131_072),
+    ("zstd-1", "zstd", 1, [], 131_072),
+    ("zstd-3", "zstd", 3, [], 131_072),
+    ("zstd-9", "zstd", 9, [], 131_072),
+    ("gzip-6", "gzip", 6, [], 131_072),
+    ("zstd-3 rg=16k", "zstd", 3, [], 16_384),
+    ("zstd-3 rg=1M", "zstd", 3, [], 1_048_576),
+    ("zstd-3 by Area", "zstd", 3, ["Area"], 131_072),
+    ("zstd-3 by Region", "zstd", 3, ["Region"], 131_072),
+]
+
+
+def directory_bytes(path: str) -> int:
+    """
+    Total size of a file or of the files in a directory tree.
+    """
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rated output writing")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Quotes in the portfolio")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Rows per rated batch")
+    parser.add_argument("--seed", type=int, default=0, help="Portfolio seed")
+    parser.add_argument("--area", type=str, default="C", help="Area scanned downstream")
+    args = parser.parse_args()
+    
+    rated = list(rate_batches(iter_portfolio_batches(args.rows, seed=args.seed, chunk_size=args.chunk_size)))
+    rows = sum(batch.height for batch in rated)
+    memory_mb = sum(batch.estimated_size() for batch in rated) / 1e6
+    print(f"Rated {rows} quotes ({memory_mb:.0f} MB in memory, {len(rated)} batches)")
+    
+    directory = tempfile.mkdtemp(prefix="pypricer_bench_")
+    try:
+        print(f"{'configuration':<18} {'seconds':>8} {'MB/s':>7} {'rows/s':>10} {'MB on disk':>11} {'scan (ms)':>10}")
+        for label, compression, level, partition_by, row_group_size in CONFIGURATIONS:
+            output = os.path.join(directory, "rated" if partition_by else "rated.parquet")
+            
+            start = time.perf_counter()
+            write_rated_batches(
+                iter(rated),
+                output,
+                partition_by=partition_by,
+                compression=compression,
+                compression_level=level,
+                row_group_size=row_group_size
+            )
+            seconds = time.perf_counter() - start
+            
+            # Downstream scan of one Area: partition pruning or row-group statistics
+            start = time.perf_counter()
+            scan = pl.scan_parquet(output, hive_partitioning=bool(partition_by))
+            scan.filter(pl.col("Area") == args.area).select(pl.col("final_premium").sum()).collect()
+            scan_ms = (time.perf_counter() - start) * 1000
+            
+            print(f"{label:<18} {seconds:8.2f} {memory_mb / seconds:7.0f} {rows / seconds:10.0f} "
+                  f"{directory_bytes(output) / 1e6:11.1f} {scan_ms:10.1f}")
+            
+            if os.path.isdir(output):
+                shutil.rmtree(output)
+            else:
+                os.remove(output)
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
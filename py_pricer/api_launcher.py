@@ -6,9 +6,10 @@ This module provides a command-line entry point for launching the FastAPI server
 
 import os
 import sys
-import importlib.util
-import uvicorn
 import argparse
+from py_pricer.concurrency import (
+    add_concurrency_arguments, resolve_concurrency, apply_concurrency_settings, DEFAULT_SETTINGS_FILE
+)
 
 
 def main():
@@ -36,6 +37,31 @@ def main():
         action="store_true", 
         help="Enable auto-reload for development"
     )
+    add_concurrency_arguments(parser)
+    parser.add_argument(
+        "--timeout-keep-alive",
+        type=int,
+        default=5,
+        help="Seconds to keep idle connections open for reuse (default: 5)"
+    )
+    parser.add_argument(
+        "--http",
+        type=str,
+        choices=["auto", "h11", "httptools"],
+        default="auto",
+        help="HTTP implementation; httptools is faster but must be installed (default: auto)"
+    )
+    parser.add_argument(
+        "--autotune",
+        action="store_true",
+        help="Load test several concurrency settings on this machine and write the best to --settings"
+    )
+    parser.add_argument(
+        "--autotune-duration",
+        type=float,
+        default=10.0,
+        help="Load test duration per configuration in seconds (default: 10)"
+    )
     args = parser.parse_args()
     
     # Get the path to the api.py file
@@ -59,8 +85,31 @@ def main():
     # Ensure the logs directory exists
     os.makedirs("logs", exist_ok=True)
     
+    # Run the autotuner instead of the server if requested
+    if args.autotune:
+        from py_pricer.autotune import autotune
+        settings_path = args.settings or DEFAULT_SETTINGS_FILE
+        print("Autotuning API concurrency settings...")
+        best = autotune(settings_path, duration=args.autotune_duration)
+        print(f"Best settings: workers={best['workers']}, threads={best['threads']}, "
+              f"polars_threads={best['polars_threads']}")
+        print(f"Settings written to {settings_path}; launch with --settings {settings_path}")
+        return
+    
+    # Import the server only when launching it, so --help starts quickly
+    import uvicorn
+    
+    # Apply the concurrency settings before the API (and Polars) is imported
+    settings = resolve_concurrency(args)
+    if args.reload and settings["workers"] > 1:
+        print("Error: --reload cannot be combined with more than one worker")
+        sys.exit(1)
+    apply_concurrency_settings(settings)
+    
     # Print startup message
     print(f"Starting Insurance Pricing API on {args.host}:{args.port}...")
+    print(f"Workers: {settings['workers']}, threads: {settings['threads'] or 'default'}, "
+          f"Polars threads: {settings['polars_threads'] or 'default'}")
     print(f"API documentation will be available at http://{args.host}:{args.port}/docs")
     
     try:
@@ -70,6 +119,9 @@ def main():
             host=args.host,
             port=args.port,
             reload=args.reload,
+            workers=settings["workers"],
+            timeout_keep_alive=args.timeout_keep_alive,
+            http=args.http,
             log_level="info"
         )
     except KeyboardInterrupt:
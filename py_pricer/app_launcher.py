@@ -8,7 +8,6 @@ import os
 import sys
 import subprocess
 import argparse
-import streamlit.web.cli as stcli
 
 
 def main():
@@ -54,6 +53,9 @@ def main():
     print(f"Starting Insurance Pricing UI on port {args.port}...")
     print(f"You can access the app at http://localhost:{args.port}")
     
+    # Import Streamlit only when launching the app, so --help starts quickly
+    import streamlit.web.cli as stcli
+    
     # Set up Streamlit arguments
     sys.argv = ["streamlit", "run", app_script]
     
@@ -0,0 +1,166 @@
+"""
+Concurrency autotuning for the API.
+
+This module runs the built-in load test against the API at several worker,
+thread-pool and Polars thread-count configurations on the current machine and
+writes the best settings to a JSON file that the launchers can read with --settings.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import subprocess
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from py_pricer.concurrency import concurrency_environment, DEFAULT_SETTINGS_FILE
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def candidate_configurations(cores: Optional[int] = None) -> List[Dict[str, int]]:
+    """
+    Build the configurations to try on a machine.
+    
+    Worker counts are powers of two up to the core count. Each worker count is
+    tried with single-threaded Polars and with the cores shared between workers,
+    and with a small and the default thread pool.
+    
+    Args:
+        cores: Number of cores (default: os.cpu_count())
+        
+    Returns:
+        List of settings dictionaries with workers, threads and polars_threads
+    """
+    cores = cores or os.cpu_count() or 1
+    
+    workers = [1]
+    while workers[-1] * 2 <= cores:
+        workers.append(workers[-1] * 2)
+    
+    configurations = []
+    for worker_count in workers:
+        for polars_threads in sorted({1, max(1, cores // worker_count)}):
+            for threads in (8, 40):
+                configurations.append({
+                    "workers": worker_count,
+                    "threads": threads,
+                    "polars_threads": polars_threads
+                })
+    return configurations
+
+
+def _free_port() -> int:
+    """
+    Get a free local port.
+    """
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_api(settings: Dict[str, int], port: int) -> subprocess.Popen:
+    """
+    Start the API in a subprocess with the given settings.
+    """
+    env = dict(os.environ)
+    env.update(concurrency_environment(settings))
+    os.makedirs(os.path.join(PROJECT_ROOT, "logs"), exist_ok=True)
+    
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "api.api:app",
+            "--host", "127.0.0.1",
+            "--port", str(port),
+            "--workers", str(settings["workers"]),
+            "--log-level", "warning"
+        ],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+
+def _wait_until_healthy(port: int, timeout: float = 60.0) -> bool:
+    """
+    Wait for the API health check to respond.
+    """
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            if requests.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    return False
+
+
+def autotune(
+    output_path: str = DEFAULT_SETTINGS_FILE,
+    duration: float = 10.0,
+    concurrency: int = 16,
+    configurations: Optional[List[Dict[str, int]]] = None
+) -> Dict[str, Any]:
+    """
+    Load test the API at each configuration and write the best settings.
+    
+    The best configuration is the one with the highest throughput among those
+    that served every request without errors.
+    
+    Args:
+        output_path: Path of the JSON settings file to write
+        duration: Load test duration per configuration in seconds
+        concurrency: Number of concurrent load test clients
+        configurations: Configurations to try (default: candidate_configurations())
+        
+    Returns:
+        Dictionary with the best settings and the results of every configuration
+    """
+    from api.load_test import run_load_test, load_sample_quotes
+    
+    if configurations is None:
+        configurations = candidate_configurations()
+    
+    quotes = load_sample_quotes()
+    results = []
+    
+    for settings in configurations:
+        port = _free_port()
+        process = _start_api(settings, port)
+        try:
+            if not _wait_until_healthy(port):
+                print(f"  {settings}: API did not start, skipping")
+                continue
+            
+            url = f"http://127.0.0.1:{port}/quote"
+            # Warm up the caches before measuring
+            run_load_test(url, concurrency, min(2.0, duration), quotes)
+            result = run_load_test(url, concurrency, duration, quotes)
+            results.append({**settings, **result})
+            print(f"  {settings}: {result['throughput']} req/s, p99 {result['p99_ms']} ms, {result['errors']} errors")
+        finally:
+            process.terminate()
+            process.wait()
+    
+    if not results:
+        raise RuntimeError("No configuration could be load tested")
+    
+    successful = [result for result in results if result["errors"] == 0] or results
+    best = max(successful, key=lambda result: result["throughput"])
+    
+    summary = {
+        "workers": best["workers"],
+        "threads": best["threads"],
+        "polars_threads": best["polars_threads"],
+        "cpu_count": os.cpu_count(),
+        "results": results
+    }
+    with open(output_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    
+    return summary
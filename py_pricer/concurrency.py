@@ -0,0 +1,135 @@
+"""
+Concurrency settings for the API launchers.
+
+This module provides the worker, thread-pool and Polars thread-count options shared
+by `pypricer-api`, `api/run_api.py` and the autotuner. Settings are passed to the
+API processes through environment variables, so they apply to every worker.
+"""
+
+import os
+import json
+import argparse
+from typing import Any, Dict, Optional
+
+# Environment variables read by the API processes
+API_THREADS_ENV = "PYPRICER_API_THREADS"
+POLARS_THREADS_ENV = "POLARS_MAX_THREADS"
+
+# Default file written by the autotuner
+DEFAULT_SETTINGS_FILE = "api_settings.json"
+
+
+def add_concurrency_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the concurrency options to a launcher's argument parser.
+    
+    Args:
+        parser: Argument parser of the launcher
+    """
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: 1)"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="Size of each worker's thread pool for quote processing (default: 40)"
+    )
+    parser.add_argument(
+        "--polars-threads",
+        type=int,
+        default=None,
+        help=f"Polars threads per worker, sets {POLARS_THREADS_ENV} (default: all cores)"
+    )
+    parser.add_argument(
+        "--settings",
+        type=str,
+        default=None,
+        help=f"JSON file with tuned settings, e.g. written by --autotune ({DEFAULT_SETTINGS_FILE})"
+    )
+
+
+def load_settings(path: str) -> Dict[str, Any]:
+    """
+    Load concurrency settings from a JSON file.
+    
+    Args:
+        path: Path to the settings file
+        
+    Returns:
+        Dictionary with the workers, threads and polars_threads settings
+    """
+    with open(path, 'r') as f:
+        settings = json.load(f)
+    return {key: settings.get(key) for key in ("workers", "threads", "polars_threads")}
+
+
+def resolve_concurrency(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Resolve the concurrency settings from the command line and settings file.
+    
+    Command-line options take precedence over the settings file.
+    
+    Args:
+        args: Parsed launcher arguments
+        
+    Returns:
+        Dictionary with the workers, threads and polars_threads settings
+    """
+    settings = {"workers": 1, "threads": None, "polars_threads": None}
+    if args.settings:
+        settings.update({k: v for k, v in load_settings(args.settings).items() if v is not None})
+    
+    for key in ("workers", "threads", "polars_threads"):
+        value = getattr(args, key)
+        if value is not None:
+            settings[key] = value
+    
+    return settings
+
+
+def concurrency_environment(settings: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Build the environment variables for the API processes.
+    
+    Args:
+        settings: Concurrency settings
+        
+    Returns:
+        Dictionary of environment variables to set
+    """
+    env = {}
+    if settings.get("threads"):
+        env[API_THREADS_ENV] = str(settings["threads"])
+    if settings.get("polars_threads"):
+        env[POLARS_THREADS_ENV] = str(settings["polars_threads"])
+    return env
+
+
+def apply_concurrency_settings(settings: Dict[str, Any]) -> None:
+    """
+    Apply the concurrency settings to this process's environment.
+    
+    This must run before Polars is imported by the API, which is why the launchers
+    call it before starting uvicorn.
+    
+    Args:
+        settings: Concurrency settings
+    """
+    os.environ.update(concurrency_environment(settings))
+
+
+def get_api_threads(default: int = 40) -> int:
+    """
+    Get the thread pool size for the API process.
+    
+    Args:
+        default: Thread pool size when the environment variable is not set
+        
+    Returns:
+        Number of threads for quote processing
+    """
+    return int(os.environ.get(API_THREADS_ENV, default))
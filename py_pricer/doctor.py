@@ -0,0 +1,217 @@
+"""
+Startup diagnostics for the py_pricer command-line tools.
+
+This module provides the `pypricer-doctor` command, which summarizes
+`python -X importtime` output for the entry points (or any module) and, with
+--check, verifies that every command's --help starts within a time budget.
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+from typing import Dict, List, Tuple
+
+# Entry point commands and the modules that implement them
+ENTRY_POINTS = {
+    "pypricer-init": "py_pricer.init_env",
+    "pypricer-api": "py_pricer.api_launcher",
+    "pypricer-serve": "py_pricer.serve_launcher",
+    "pypricer-rate": "py_pricer.rate_cli",
+    "pypricer-generate": "py_pricer.generate_cli",
+    "pypricer-ui": "py_pricer.app_launcher",
+    "pypricer-deploy": "py_pricer.deploy",
+    "pypricer-doctor": "py_pricer.doctor",
+}
+
+# Startup budget for --help and non-pricing commands
+DEFAULT_BUDGET_MS = 100
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def _run_python(code: str, *options: str) -> subprocess.CompletedProcess:
+    """
+    Run Python code in a fresh interpreter from the project root.
+    """
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True
+    )
+
+
+def profile_imports(module: str) -> List[Tuple[str, int, int]]:
+    """
+    Profile the imports of a module with `python -X importtime`.
+    
+    Args:
+        module: Dotted name of the module to import
+        
+    Returns:
+        List of (module name, self time in us, cumulative time in us) in import order
+    """
+    result = _run_python(f"import {module}", "-X", "importtime")
+    
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def summarize_imports(imports: List[Tuple[str, int, int]], top: int = 10) -> Dict[str, List[Tuple[str, int]]]:
+    """
+    Summarize an import profile by module and by top-level package.
+    
+    Args:
+        imports: Import profile from profile_imports
+        top: Number of entries to keep in each list
+        
+    Returns:
+        Dictionary with the slowest "modules" and "packages" as (name, self time in us)
+    """
+    packages = {}
+    for name, self_us, _ in imports:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+    
+    modules = sorted(((name, self_us) for name, self_us, _ in imports), key=lambda item: -item[1])
+    return {
+        "modules": modules[:top],
+        "packages": sorted(packages.items(), key=lambda item: -item[1])[:top]
+    }
+
+
+def measure_startup(code: str, runs: int = 5) -> float:
+    """
+    Measure the wall time of running Python code in a fresh interpreter.
+    
+    Args:
+        code: Python code to run
+        runs: Number of runs; the fastest is reported to reduce noise
+        
+    Returns:
+        Startup time in milliseconds
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        _run_python(code)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def _help_code(module: str) -> str:
+    """
+    Get the Python code running a command's --help.
+    """
+    return f"import sys; sys.argv = ['{module}', '--help']; from {module} import main; main()"
+
+
+def measure_help_startup(module: str, runs: int = 5) -> float:
+    """
+    Measure the wall time of running a command's --help in a fresh interpreter.
+    
+    Args:
+        module: Module implementing the command's main()
+        runs: Number of runs; the fastest is reported to reduce noise
+        
+    Returns:
+        Startup time in milliseconds
+    """
+    return measure_startup(_help_code(module), runs)
+
+
+def check_startup(budget_ms: float = DEFAULT_BUDGET_MS) -> bool:
+    """
+    Check that every entry point's --help succeeds and starts within the budget.
+    
+    Args:
+        budget_ms: Startup budget in milliseconds
+        
+    Returns:
+        True if every command succeeds within the budget
+    """
+    baseline_ms = measure_startup("pass")
+    print(f"Interpreter baseline: {baseline_ms:.0f} ms")
+    
+    ok = True
+    for command, module in ENTRY_POINTS.items():
+        # A command that fails to import would otherwise look fast
+        result = _run_python(_help_code(module))
+        if result.returncode != 0:
+            ok = False
+            error = (result.stderr.strip().splitlines() or ["no output"])[-1]
+            print(f"  {command:<18} FAILED   {error}")
+            continue
+        
+        elapsed_ms = measure_help_startup(module)
+        status = "ok" if elapsed_ms <= budget_ms else "SLOW"
+        ok = ok and elapsed_ms <= budget_ms
+        print(f"  {command:<18} {elapsed_ms:6.0f} ms  {status}")
+    
+    return ok
+
+
+def main():
+    """
+    Main entry point for the startup diagnostics.
+    """
+    # Parse command-line arguments
+    parser = argparse.ArgumentParser(description="Diagnose py_pricer startup time")
+    parser.add_argument(
+        "modules",
+        nargs="*",
+        help="Modules to profile (default: the entry point modules)"
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=10,
+        help="Number of slowest modules and packages to show (default: 10)"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Check that every command's --help starts within the budget; exits 1 if not"
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"Startup budget in milliseconds for --check (default: {DEFAULT_BUDGET_MS})"
+    )
+    args = parser.parse_args()
+    
+    if args.check:
+        print(f"Checking --help startup against a {args.budget_ms:.0f} ms budget...")
+        if not check_startup(args.budget_ms):
+            print("Some commands exceed the startup budget; profile them with pypricer-doctor <module>")
+            sys.exit(1)
+        return
+    
+    for module in args.modules or ENTRY_POINTS.values():
+        imports = profile_imports(module)
+        if not imports:
+            print(f"{module}: could not be imported")
+            continue
+        
+        total_ms = sum(self_us for _, self_us, _ in imports) / 1000
+        summary = summarize_imports(imports, args.top)
+        
+        print(f"\n{module}: {total_ms:.1f} ms in {len(imports)} imports")
+        print("  Slowest packages:")
+        for name, self_us in summary["packages"]:
+            print(f"    {name:<40} {self_us / 1000:8.1f} ms")
+        print("  Slowest modules:")
+        for name, self_us in summary["modules"]:
+            print(f"    {name:<40} {self_us / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Synthetic portfolio command for the insurance pricing library.
+
+This module provides a command-line entry point for generating reproducible synthetic
+quote portfolios of any size as partitioned Parquet, for scale testing and benchmarks.
+"""
+
+import os
+import sys
+import argparse
+
+
+def main():
+    """
+    Main entry point for the synthetic portfolio command.
+    
+    This function parses command-line arguments and streams the generated portfolio to disk.
+    """
+    # Parse command-line arguments
+    parser = argparse.ArgumentParser(description="Generate a synthetic quote portfolio as partitioned Parquet")
+    parser.add_argument(
+        "--rows",
+        type=int,
+        required=True,
+        help="Number of quotes to generate"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        required=True,
+        help="Output dataset directory"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed; the same seed always generates the same portfolio (default: 0)"
+    )
+    parser.add_argument(
+        "--partition-by",
+        type=str,
+        default="Region",
+        help="Comma-separated hive partition columns, or an empty string for none (default: Region)"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=1_000_000,
+        help="Number of quotes generated and written at a time (default: 1000000)"
+    )
+    parser.add_argument(
+        "--compression",
+        type=str,
+        default="zstd",
+        help="Parquet compression codec (default: zstd)"
+    )
+    parser.add_argument(
+        "--overwrite",
+        action="store_true",
+        help="Replace the output directory if it is not empty"
+    )
+    args = parser.parse_args()
+    
+    if args.rows < 1:
+        print("Error: --rows must be at least 1")
+        sys.exit(1)
+    
+    # Add the project root to the Python path
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    
+    from algorithms.pipeline.synthetic import write_portfolio
+    
+    partition_by = [column.strip() for column in args.partition_by.split(",") if column.strip()]
+    print(f"Generating {args.rows} quotes (seed {args.seed}) into {args.output}...")
+    
+    try:
+        stats = write_portfolio(
+            args.output,
+            args.rows,
+            seed=args.seed,
+            chunk_size=args.chunk_size,
+            partition_by=partition_by,
+            compression=args.compression,
+            overwrite=args.overwrite
+        )
+    except Exception as e:
+        print(f"Error generating the portfolio: {str(e)}")
+        sys.exit(1)
+    
+    rate = stats["rows"] / stats["seconds"] if stats["seconds"] else 0
+    print(f"Wrote {stats['rows']} quotes to {stats['files']} files ({stats['bytes'] / 1e6:.1f} MB) "
+          f"in {stats['seconds']:.1f}s ({rate:.0f} quotes/s)")
+
+
+if __name__ == "__main__":
+    main()
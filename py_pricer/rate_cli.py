@@ -0,0 +1,216 @@
+"""
+Batch rating command for the insurance pricing library.
+
+This module provides a command-line entry point for rating quote files (such as
+nightly NDJSON quote logs) in chunks, streaming the rated rows to Parquet or NDJSON.
+"""
+
+import os
+import sys
+import argparse
+from typing import Any, Dict, List, Optional
+
+
+def _parse_value(value: str):
+    """
+    Read a filter value as an integer, a number or a string.
+    """
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def parse_filters(specs: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    Parse --filter options into a filter dictionary.
+    
+    Args:
+        specs: Filter options of the form COLUMN=VALUE or COLUMN=VALUE1,VALUE2
+        
+    Returns:
+        Dictionary mapping columns to a value or a list of allowed values, or None
+        if there are no filters
+        
+    Raises:
+        ValueError: If an option is not of the form COLUMN=VALUE
+    """
+    filters = {}
+    for spec in specs:
+        column, separator, values = spec.partition("=")
+        if not separator or not column or not values:
+            raise ValueError(f"Invalid filter {spec!r} (use COLUMN=VALUE[,VALUE...])")
+        parsed = [_parse_value(value) for value in values.split(",")]
+        filters[column] = parsed[0] if len(parsed) == 1 else parsed
+    return filters or None
+
+
+def main():
+    """
+    Main entry point for the batch rating command.
+    
+    This function parses command-line arguments and rates the input file chunk by chunk.
+    """
+    # Parse command-line arguments
+    parser = argparse.ArgumentParser(description="Rate a quote file in chunks with bounded memory")
+    parser.add_argument(
+        "--input",
+        type=str,
+        required=True,
+        help="Quote file to rate (.ndjson, .jsonl or .parquet) or directory of Parquet files"
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        required=True,
+        help="Output file for the rated quotes (.parquet, .ndjson or .jsonl), or a directory "
+             "for a Parquet dataset"
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=100_000,
+        help="Number of quotes rated at a time (default: 100000)"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        default=None,
+        help="Number of Polars threads, sets POLARS_MAX_THREADS (default: all cores)"
+    )
+    parser.add_argument(
+        "--filter",
+        type=str,
+        action="append",
+        default=[],
+        metavar="COLUMN=VALUE[,VALUE...]",
+        help="Only rate quotes with one of these values (repeatable); Parquet partitions "
+             "and row groups that cannot match are skipped"
+    )
+    parser.add_argument(
+        "--all-columns",
+        action="store_true",
+        help="Read every input column and pass the extra columns through to the output "
+             "(default: read only the columns the pipeline uses)"
+    )
+    parser.add_argument(
+        "--partition-by",
+        type=str,
+        default="",
+        help="Comma-separated columns to hive-partition the output dataset by, e.g. Area or Region"
+    )
+    parser.add_argument(
+        "--compression",
+        type=str,
+        default="zstd",
+        choices=["zstd", "snappy", "gzip", "lz4", "brotli", "uncompressed"],
+        help="Parquet compression codec (default: zstd)"
+    )
+    parser.add_argument(
+        "--compression-level",
+        type=int,
+        default=None,
+        help="Parquet compression level, for zstd, gzip and brotli (default: the codec's default)"
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=131_072,
+        help="Rows per Parquet row group (default: 131072)"
+    )
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="Add the rated quotes to an existing output dataset instead of replacing it"
+    )
+    parser.add_argument(
+        "--rollup",
+        type=str,
+        default=None,
+        metavar="CUBE",
+        help="Parquet file of the premium rollup cube to bring up to date with the output "
+             "(appended files are merged into it; otherwise it is rebuilt)"
+    )
+    parser.add_argument(
+        "--profile",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Sample the run's stacks and write a profile: speedscope JSON (.json, open at "
+             "https://www.speedscope.app) or folded stacks for flame graphs (.folded)"
+    )
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.input):
+        print(f"Error: Could not find the input file at {args.input}")
+        sys.exit(1)
+    
+    try:
+        filters = parse_filters(args.filter)
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+        sys.exit(1)
+    
+    # Set the Polars thread count before Polars is imported
+    if args.threads:
+        os.environ["POLARS_MAX_THREADS"] = str(args.threads)
+    
+    # Add the project root to the Python path
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    
+    from algorithms.rating.batch_rating import rate_file
+    from algorithms.pipeline.profiling import profile_to
+    
+    partition_by = [column.strip() for column in args.partition_by.split(",") if column.strip()]
+    print(f"Rating {args.input} in chunks of {args.chunk_size} quotes...")
+    
+    try:
+        with profile_to(args.profile):
+            stats = rate_file(
+                args.input,
+                args.output,
+                args.chunk_size,
+                filters=filters,
+                all_columns=args.all_columns,
+                partition_by=partition_by,
+                compression=args.compression,
+                compression_level=args.compression_level,
+                row_group_size=args.row_group_size,
+                append=args.append
+            )
+    except Exception as e:
+        print(f"Error rating {args.input}: {str(e)}")
+        sys.exit(1)
+    
+    rate = stats["rows_read"] / stats["seconds"] if stats["seconds"] else 0
+    print(f"Rated {stats['rows_rated']} of {stats['rows_read']} quotes in {stats['batches']} chunks "
+          f"({stats['seconds']:.1f}s, {rate:.0f} quotes/s)")
+    if stats["rows_invalid"]:
+        print(f"Warning: {stats['rows_invalid']} quotes failed validation and were skipped")
+    unmatched = stats["rows_read"] - stats["rows_invalid"] - stats["rows_rated"]
+    if unmatched > 0:
+        print(f"Warning: {unmatched} quotes had no matching rating table entries")
+    print(f"Rated quotes written to {args.output}")
+    if args.profile:
+        print(f"Profile written to {args.profile}")
+    
+    if args.rollup:
+        from algorithms.analytics.rollups import update_rollup
+        
+        try:
+            rollup_stats = update_rollup(args.rollup, args.output)
+        except Exception as e:
+            print(f"Error updating the rollup cube {args.rollup}: {str(e)}")
+            sys.exit(1)
+        
+        action = "Rebuilt" if rollup_stats["rebuilt"] else f"Merged {rollup_stats['files_added']} new files into"
+        print(f"{action} the rollup cube {args.rollup}: {rollup_stats['cells']} cells, "
+              f"{rollup_stats['policies']} policies ({rollup_stats['bytes'] / 1e6:.1f} MB, {rollup_stats['seconds']:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
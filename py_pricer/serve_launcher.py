@@ -0,0 +1,61 @@
+"""
+Binary pricing server launcher for the insurance pricing library.
+
+This module provides a command-line entry point for launching the Arrow IPC
+socket server for internal callers.
+"""
+
+import os
+import sys
+import argparse
+
+
+def main():
+    """
+    Main entry point for the binary pricing server launcher.
+    
+    This function parses command-line arguments and launches the binary pricing server.
+    """
+    # Parse command-line arguments
+    parser = argparse.ArgumentParser(description="Launch the Insurance Pricing binary (Arrow IPC) server")
+    parser.add_argument(
+        "--host", 
+        type=str, 
+        default="127.0.0.1", 
+        help="Host to bind the server to (default: 127.0.0.1)"
+    )
+    parser.add_argument(
+        "--port", 
+        type=int, 
+        default=8001, 
+        help="Port to bind the server to (default: 8001)"
+    )
+    parser.add_argument(
+        "--max-frame-mb",
+        type=int,
+        default=64,
+        help="Largest request frame in MiB; connections sending larger frames are closed (default: 64)"
+    )
+    args = parser.parse_args()
+    
+    # Add the project root to the Python path
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
+    
+    from api.binary_server import serve
+    
+    # Print startup message
+    print(f"Starting Insurance Pricing binary server on {args.host}:{args.port}...")
+    
+    try:
+        serve(args.host, args.port, max_frame_size=args.max_frame_mb * 1024 * 1024)
+    except KeyboardInterrupt:
+        print("\nShutting down Insurance Pricing binary server...")
+    except Exception as e:
+        print(f"Error launching the binary server: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,51 +9,28 @@ import streamlit as st
 import polars as pl
 import sys
 import os
-import json
 
 # Add the project root to the Python path if not already there
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from algorithms.config import get_primary_id
+from streamlit.table_view import show_paginated_dataframe
+from streamlit.data_layer import get_transformed_data, get_banding_config
 
-def load_banding_config():
-    """
-    Load the continuous banding configuration from JSON file.
-    
-    Returns:
-        Dictionary containing the banding configuration or empty dict if loading fails
-    """
-    try:
-        # Get the path to the continuous-banding.json file
-        config_path = os.path.abspath(os.path.join(
-            os.path.dirname(__file__), 
-            '..', 
-            'algorithms', 
-            'pipeline', 
-            'continuous-banding.json'
-        ))
-        
-        # Load the configuration
-        with open(config_path, 'r') as f:
-            config = json.load(f)
-        
-        return config
-    except Exception as e:
-        st.warning(f"Could not load banding configuration: {e}")
-        return {}
-
-def show_transformed_data_tab(df=None, data_source=None):
+def show_transformed_data_tab(data_source=None):
     """
     Display the banded data tab in the Streamlit application.
     
     Args:
-        df: Pre-transformed Polars DataFrame (if None, will show an error)
         data_source: The source of the data ("Batch" or "Individual")
     """
     # Tab title
     st.title("Banded Categories")
 
-    # Early return if no data is provided
+    # Get the transformed data from the shared cache
+    df = get_transformed_data(data_source)
+    
+    # Early return if no data is available
     if df is None:
         st.error("No transformed data available to display.")
         return
@@ -62,7 +39,7 @@ def show_transformed_data_tab(df=None, data_source=None):
     primary_id = get_primary_id()
     
     # Load the banding configuration to identify the expected band columns
-    banding_config = load_banding_config()
+    banding_config = get_banding_config()
     
     # Early return if no configuration is available
     if not banding_config:
@@ -88,8 +65,5 @@ def show_transformed_data_tab(df=None, data_source=None):
     if primary_id in df.columns:
         columns_to_show = [primary_id] + actual_band_columns
     
-    # Create a new dataframe with only the selected columns
-    banded_df = df.select(columns_to_show)
-    
-    # Display the dataframe with the primary ID as the key
-    st.dataframe(banded_df, use_container_width=True, key=primary_id) 
\ No newline at end of file
+    # Display one page of the selected columns with the primary ID first
+    show_paginated_dataframe(df, columns_to_show, key="banded")
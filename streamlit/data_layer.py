@@ -0,0 +1,355 @@
+"""
+Data layer for the Streamlit application.
+
+This module loads, transforms and rates the data once per unique set of input files
+and shares the resulting frames across all user sessions. Cache keys are fingerprints
+of the data files, the pipeline configuration and the rating tables, so editing any of
+them invalidates exactly the frames that depend on it.
+"""
+
+import streamlit as st
+import polars as pl
+import sys
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.pipeline.utils import (
+    load_batch_data,
+    load_individual_data,
+    load_config_json,
+    get_data_directory,
+    find_files_by_extension,
+    hash_files
+)
+from algorithms.pipeline.data_processor import process_data
+from algorithms.rating.rating_engine import rate_policies, rerate_policies
+from algorithms.rating.scenarios import build_rating_cells
+from algorithms.analytics.experience import experience_by, get_claims_path
+from algorithms.analytics.rollups import build_rollup
+from algorithms.rating.utils.table_loader import get_rating_table_hashes, find_changed_tables
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+PIPELINE_DIR = os.path.join(PROJECT_ROOT, 'algorithms', 'pipeline')
+RATING_DIR = os.path.join(PROJECT_ROOT, 'algorithms', 'rating')
+TABLES_DIR = os.path.join(RATING_DIR, 'tables')
+
+# Data source settings: loader function, data directory and file extension. The
+# raw data tab shows every column, so batch data is not projected onto the
+# pipeline's input columns.
+DATA_SOURCES = {
+    "Batch": (lambda: load_batch_data(all_columns=True), 'batch', '.parquet'),
+    "Individual": (load_individual_data, 'individual', '.json'),
+}
+
+# Guards the shared store of rated frames, which is updated in place
+_RATED_STORE_LOCK = threading.Lock()
+
+def get_data_key(data_source: str) -> str:
+    """
+    Fingerprint the data files of a data source.
+    
+    Data files can be very large, so they are fingerprinted by path, size and
+    modification time instead of by content.
+    
+    Args:
+        data_source: The source of the data ("Batch" or "Individual")
+        
+    Returns:
+        Fingerprint of the data files
+    """
+    _, data_type, file_extension = DATA_SOURCES[data_source]
+    files = find_files_by_extension(get_data_directory(data_type), [file_extension])
+    return hash_files(files, content=False)
+
+def get_pipeline_key() -> str:
+    """
+    Fingerprint the transformation configuration and custom transformations.
+    
+    Returns:
+        Content hash of the pipeline configuration files
+    """
+    return hash_files([
+        os.path.join(PIPELINE_DIR, 'category-index.json'),
+        os.path.join(PIPELINE_DIR, 'continuous-banding.json'),
+        os.path.join(PIPELINE_DIR, 'additional_transforms.py'),
+        os.path.join(RATING_DIR, 'rating_engine.py'),
+    ])
+
+@st.cache_data(show_spinner=False)
+def _load_pipeline_config(file_name: str, config_key: str) -> Dict[str, Any]:
+    """
+    Load a pipeline configuration file, cached by its content hash.
+    
+    Args:
+        file_name: Name of the JSON file in algorithms/pipeline
+        config_key: Content hash of the file (only used as the cache key)
+        
+    Returns:
+        The configuration dictionary or empty dict if loading fails
+    """
+    return load_config_json(os.path.join(PIPELINE_DIR, file_name)) or {}
+
+def get_banding_config() -> Dict[str, Any]:
+    """
+    Get the continuous banding configuration.
+    
+    Returns:
+        Dictionary containing the banding configuration or empty dict if loading fails
+    """
+    config_path = os.path.join(PIPELINE_DIR, 'continuous-banding.json')
+    return _load_pipeline_config('continuous-banding.json', hash_files([config_path]))
+
+def get_index_config() -> Dict[str, Any]:
+    """
+    Get the category index configuration.
+    
+    Returns:
+        Dictionary containing the category index configuration or empty dict if loading fails
+    """
+    config_path = os.path.join(PIPELINE_DIR, 'category-index.json')
+    return _load_pipeline_config('category-index.json', hash_files([config_path]))
+
+@st.cache_resource(show_spinner="Loading data...", max_entries=4)
+def _load_raw_data(data_source: str, data_key: str) -> Optional[pl.DataFrame]:
+    """
+    Load the raw data of a data source, shared across sessions.
+    
+    Args:
+        data_source: The source of the data ("Batch" or "Individual")
+        data_key: Fingerprint of the data files (only used as the cache key)
+        
+    Returns:
+        DataFrame containing the raw data or None if loading fails
+    """
+    loader = DATA_SOURCES[data_source][0]
+    return loader()
+
+@st.cache_resource(show_spinner="Transforming data...", max_entries=4)
+def _transform_data(data_source: str, data_key: str, pipeline_key: str) -> Optional[pl.DataFrame]:
+    """
+    Transform the raw data of a data source, shared across sessions.
+    
+    The tabs show every transformed column, so all stages are run. Stage outputs
+    are cached by a hash of their inputs, so a change to one configuration file
+    only re-runs the stages that depend on it.
+    
+    Args:
+        data_source: The source of the data ("Batch" or "Individual")
+        data_key: Fingerprint of the data files
+        pipeline_key: Fingerprint of the pipeline configuration (only used as the cache key)
+        
+    Returns:
+        Transformed DataFrame or None if the raw data is not available
+    """
+    raw_df = _load_raw_data(data_source, data_key)
+    if raw_df is None:
+        return None
+    return process_data(raw_df, use_cache=True)
+
+@st.cache_resource(show_spinner="Building rating cells...", max_entries=8)
+def _build_rating_cells(
+    data_source: str,
+    data_key: str,
+    pipeline_key: str,
+    rating_key: str,
+    by: Tuple[str, ...]
+) -> Optional[pl.DataFrame]:
+    """
+    Collapse the transformed data to rated cells, shared across sessions.
+    
+    Args:
+        data_source: The source of the data ("Batch" or "Individual")
+        data_key: Fingerprint of the data files
+        pipeline_key: Fingerprint of the pipeline configuration
+        rating_key: Fingerprint of the rating tables (only used as the cache key)
+        by: Extra columns to keep in the cells
+        
+    Returns:
+        Rated cells DataFrame or None if the transformed data is not available
+    """
+    transformed_df = _transform_data(data_source, data_key, pipeline_key)
+    if transformed_df is None:
+        return None
+    return build_rating_cells(transformed_df, by=list(by))
+
+@st.cache_resource
+def _get_rated_store() -> Dict[str, Dict[str, Any]]:
+    """
+    Get the store of rated frames shared across sessions.
+    
+    The store keeps the latest rated frame per data source together with the keys
+    and rating table hashes it was computed from, so that a change to a single
+    rating table can be applied incrementally instead of re-rating from scratch.
+    
+    Returns:
+        Dictionary mapping data sources to their latest rated frame and its keys
+    """
+    return {}
+
+def get_raw_data(data_source: str) -> Optional[pl.DataFrame]:
+    """
+    Get the raw data of a data source.
+    
+    Args:
+        data_source: The source of the data ("Batch" or "Individual")
+        
+    Returns:
+        DataFrame containing the raw data or None if loading fails
+    """
+    return _load_raw_data(data_source, get_data_key(data_source))
+
+def get_transformed_data(data_source: str) -> Optional[pl.DataFrame]:
+    """
+    Get the transformed (banded and indexed) data of a data source.
+    
+    Args:
+        data_source: The source of the data ("Batch" or "Individual")
+        
+    Returns:
+        Transformed DataFrame or None if the raw data is not available
+    """
+    return _transform_data(data_source, get_data_key(data_source), get_pipeline_key())
+
+def get_rating_cells(data_source: str, by: Tuple[str, ...] = ()) -> Optional[pl.DataFrame]:
+    """
+    Get the rated cells of a data source for scenario analysis.
+    
+    Args:
+        data_source: The source of the data ("Batch" or "Individual")
+        by: Extra columns to keep in the cells for breaking down results
+        
+    Returns:
+        Rated cells DataFrame or None if the transformed data is not available
+    """
+    rating_key = hash_files(
+        [os.path.join(TABLES_DIR, name) for name in os.listdir(TABLES_DIR)]
+    )
+    return _build_rating_cells(
+        data_source, get_data_key(data_source), get_pipeline_key(), rating_key, tuple(by)
+    )
+
+def get_rated_data(data_source: str) -> Optional[pl.DataFrame]:
+    """
+    Get the rated data of a data source.
+    
+    If only rating tables changed since the data was last rated, the cached rated
+    frame is re-rated incrementally for the changed tables.
+    
+    Args:
+        data_source: The source of the data ("Batch" or "Individual")
+        
+    Returns:
+        Rated DataFrame or None if the transformed data is not available
+    """
+    data_key = get_data_key(data_source)
+    pipeline_key = get_pipeline_key()
+    
+    transformed_df = _transform_data(data_source, data_key, pipeline_key)
+    if transformed_df is None:
+        return None
+    
+    table_hashes = get_rating_table_hashes(TABLES_DIR)
+    store = _get_rated_store()
+    
+    with _RATED_STORE_LOCK:
+        entry = store.get(data_source)
+        
+        # Reuse the rated frame if nothing it depends on has changed
+        same_inputs = entry is not None and entry["keys"] == (data_key, pipeline_key)
+        if same_inputs and entry["table_hashes"] == table_hashes:
+            return entry["rated_df"]
+        
+        with st.spinner("Rating data..."):
+            if same_inputs:
+                changed_tables = find_changed_tables(entry["table_hashes"], table_hashes)
+                rated_df = rerate_policies(entry["rated_df"], changed_tables, TABLES_DIR)
+            else:
+                rated_df = rate_policies(transformed_df, by_cell=True)
+        
+        store[data_source] = {
+            "keys": (data_key, pipeline_key),
+            "table_hashes": table_hashes,
+            "rated_df": rated_df,
+        }
+        return rated_df
+
+def get_claims_key() -> str:
+    """
+    Fingerprint the claims data by path, size and modification time.
+    
+    Returns:
+        Fingerprint of the claims file
+    """
+    return hash_files([get_claims_path()], content=False)
+
+@st.cache_data(show_spinner="Joining claims...", max_entries=32)
+def _compute_experience(
+    data_source: str,
+    rated_key: Tuple[Any, ...],
+    claims_key: str,
+    by: Tuple[str, ...]
+) -> Optional[pl.DataFrame]:
+    """
+    Aggregate the claims experience of a data source, cached across sessions.
+    
+    Args:
+        data_source: The source of the data ("Batch" or "Individual")
+        rated_key: Fingerprint of the rated data (only used as the cache key)
+        claims_key: Fingerprint of the claims data (only used as the cache key)
+        by: Columns to group by
+        
+    Returns:
+        Experience DataFrame or None if the rated data is not available
+    """
+    rated_df = get_rated_data(data_source)
+    if rated_df is None:
+        return None
+    return experience_by(rated_df, list(by))
+
+def get_experience(data_source: str, by: List[str]) -> Optional[pl.DataFrame]:
+    """
+    Get the loss ratio experience of a data source by rating factors.
+    
+    Args:
+        data_source: The source of the data ("Batch" or "Individual")
+        by: Columns to group by
+        
+    Returns:
+        Experience DataFrame or None if the rated data is not available
+    """
+    rated_key = (get_data_key(data_source), get_pipeline_key(), tuple(sorted(get_rating_table_hashes(TABLES_DIR).items())))
+    return _compute_experience(data_source, rated_key, get_claims_key(), tuple(by))
+
+@st.cache_data(show_spinner="Building rollup cube...", max_entries=4)
+def _compute_rollup(data_source: str, rated_key: Tuple[Any, ...]) -> Optional[pl.DataFrame]:
+    """
+    Build the premium rollup cube of a data source, cached across sessions.
+    
+    Args:
+        data_source: The source of the data ("Batch" or "Individual")
+        rated_key: Fingerprint of the rated data (only used as the cache key)
+        
+    Returns:
+        Cube DataFrame or None if the rated data is not available
+    """
+    rated_df = get_rated_data(data_source)
+    if rated_df is None:
+        return None
+    return build_rollup(rated_df)
+
+def get_rollup(data_source: str) -> Optional[pl.DataFrame]:
+    """
+    Get the premium rollup cube of a data source.
+    
+    Args:
+        data_source: The source of the data ("Batch" or "Individual")
+        
+    Returns:
+        Cube DataFrame or None if the rated data is not available
+    """
+    rated_key = (get_data_key(data_source), get_pipeline_key(), tuple(sorted(get_rating_table_hashes(TABLES_DIR).items())))
+    return _compute_rollup(data_source, rated_key)
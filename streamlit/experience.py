@@ -0,0 +1,65 @@
+"""
+Claims experience module for the Streamlit application.
+
+This module provides functionality for comparing rated premium with claims
+(loss ratios and claim frequency) by any combination of rating factors.
+"""
+
+import streamlit as st
+import sys
+import os
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from streamlit.data_layer import get_rated_data, get_experience, get_banding_config, get_index_config
+
+def show_experience_tab(data_source=None):
+    """
+    Display the claims experience tab in the Streamlit application.
+    
+    Args:
+        data_source: The source of the data ("Batch" or "Individual")
+    """
+    # Tab title
+    st.title("Claims Experience")
+    
+    # Get the rated data to offer its rating factors for grouping
+    df = get_rated_data(data_source)
+    
+    # Early return if no data is available
+    if df is None:
+        st.error("No rated data available to compare with claims.")
+        return
+    
+    # Offer the area, band and category columns as rating factors
+    band_columns = [
+        config.get("column_name", f"{column}Band")
+        for column, config in get_banding_config().items()
+    ]
+    factor_columns = [
+        col for col in ["Area"] + band_columns + list(get_index_config().keys())
+        if col in df.columns
+    ]
+    by = st.multiselect("Group by", factor_columns, default=factor_columns[:1], key="experience_group_by")
+    
+    try:
+        experience_df = get_experience(data_source, by)
+    except Exception as e:
+        st.error(f"Could not load the claims data: {str(e)}")
+        return
+    
+    # Overall experience
+    total_df = get_experience(data_source, [])
+    if total_df is not None and total_df.height:
+        total = total_df.row(0, named=True)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Policies", f"{total['policies']:,}")
+        col2.metric("Loss ratio", f"{total['loss_ratio']:.1%}" if total['loss_ratio'] is not None else "n/a")
+        col3.metric("Claim frequency", f"{total['frequency']:.1%}")
+    
+    # Experience by the selected rating factors
+    if by and experience_df is not None:
+        st.dataframe(experience_df, use_container_width=True, hide_index=True)
+        if len(by) == 1:
+            st.bar_chart(experience_df.to_pandas(), x=by[0], y="loss_ratio")
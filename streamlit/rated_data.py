@@ -14,20 +14,54 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from algorithms.config import get_primary_id
+from streamlit.data_layer import get_transformed_data, get_rated_data, get_banding_config
+from streamlit.table_view import show_paginated_dataframe
 
-def show_rated_data_tab(df=None, data_source=None, original_df=None):
+def summarize_premium_by(df: pl.DataFrame, column: str, premium_column: str = "final_premium") -> pl.DataFrame:
+    """
+    Summarize the premium distribution for each level of a column.
+    
+    Args:
+        df: Rated DataFrame
+        column: Column to group by (for example a band column)
+        premium_column: Premium column to summarize
+        
+    Returns:
+        DataFrame with one row per level and premium distribution statistics
+    """
+    premium = pl.col(premium_column)
+    return (
+        df.lazy()
+        .group_by(column)
+        .agg(
+            pl.len().alias("policies"),
+            premium.sum().alias("total_premium"),
+            premium.mean().alias("mean_premium"),
+            premium.min().alias("min_premium"),
+            premium.quantile(0.25).alias("p25_premium"),
+            premium.median().alias("median_premium"),
+            premium.quantile(0.75).alias("p75_premium"),
+            premium.max().alias("max_premium"),
+        )
+        .sort(column, nulls_last=True)
+        .collect()
+    )
+
+def show_rated_data_tab(data_source=None):
     """
     Display the rated data tab in the Streamlit application.
     
     Args:
-        df: Rated Polars DataFrame (if None, will show an error)
         data_source: The source of the data ("Batch" or "Individual")
-        original_df: The original transformed DataFrame before rating was applied
     """
     # Tab title
     st.title("Rating Results")
 
-    # Early return if no data is provided
+    # Get the rated data and the transformed data it was rated from
+    df = get_rated_data(data_source)
+    original_df = get_transformed_data(data_source)
+    
+    # Early return if no data is available
     if df is None:
         st.error("No rated data available to display.")
         return
@@ -55,8 +89,20 @@ def show_rated_data_tab(df=None, data_source=None, original_df=None):
     if primary_id in df.columns:
         columns_to_show = [primary_id] + columns_to_show
     
-    # Create a new dataframe with only the selected columns
-    rated_df = df.select(columns_to_show)
+    # Summarize the premium distribution per band from an aggregation
+    if "final_premium" in df.columns:
+        st.subheader("Premium Distribution")
+        band_columns = [
+            config.get("column_name", f"{column}Band")
+            for column, config in get_banding_config().items()
+        ]
+        group_columns = [col for col in ["Area"] + band_columns if col in df.columns]
+        if group_columns:
+            group_column = st.selectbox("Group by", group_columns, key="rated_group_by")
+            summary_df = summarize_premium_by(df, group_column)
+            st.dataframe(summary_df, use_container_width=True, hide_index=True)
+            st.bar_chart(summary_df.to_pandas(), x=group_column, y="mean_premium")
     
-    # Display the dataframe with the primary ID as the key
-    st.dataframe(rated_df, use_container_width=True, key=primary_id) 
\ No newline at end of file
+    # Display one page of the rating columns with the primary ID first
+    st.subheader("Rated Policies")
+    show_paginated_dataframe(df, columns_to_show, key="rated")
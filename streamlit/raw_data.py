@@ -13,14 +13,14 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from algorithms.config import get_primary_id
-from algorithms.pipeline.utils import load_batch_data, load_individual_data
+from streamlit.table_view import show_paginated_dataframe
+from streamlit.data_layer import get_raw_data
 
-def show_raw_data_tab(df=None, data_source=None, on_data_source_change=None):
+def show_raw_data_tab(data_source=None, on_data_source_change=None):
     """
     Display the raw data tab in the Streamlit application.
     
     Args:
-        df: Pre-loaded Polars DataFrame (if None, will show an error)
         data_source: The source of the data ("Batch" or "Individual")
         on_data_source_change: Callback function to handle data source changes
     """
@@ -43,10 +43,8 @@ def show_raw_data_tab(df=None, data_source=None, on_data_source_change=None):
         on_data_source_change(new_data_source)
         return  # Return early as we'll reload with the new data source
     
-    # Show loading status
-    if df is None:
-        status = st.empty()
-        status.info(f"Loading {new_data_source.lower()} data...")
+    # Load the raw data from the shared cache
+    df = get_raw_data(data_source)
     
     # Display data if provided
     if df is not None:
@@ -56,8 +54,11 @@ def show_raw_data_tab(df=None, data_source=None, on_data_source_change=None):
         # Get the primary ID field
         primary_id = get_primary_id()
         
-        # Display the dataframe with the primary ID as the index
+        # Display one page of the data with the primary ID first
         st.subheader("Data Viewer")
-        st.dataframe(df, use_container_width=True, key=primary_id)
+        columns = df.columns
+        if primary_id in columns:
+            columns = [primary_id] + [col for col in columns if col != primary_id]
+        show_paginated_dataframe(df, columns, key="raw")
     else:
         st.error("No data available to display. Please check your data files.") 
\ No newline at end of file
@@ -0,0 +1,76 @@
+"""
+Premium rollups module for the Streamlit application.
+
+This module provides functionality for slicing and dicing premium by rating factors
+from a precomputed rollup cube, without re-running the pipeline over the book.
+"""
+
+import streamlit as st
+import sys
+import os
+import time
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from streamlit.data_layer import get_rollup
+from algorithms.analytics.rollups import get_rollup_path, load_rollup, query_rollup, get_cube_dimensions
+
+def show_rollups_tab(data_source=None):
+    """
+    Display the premium rollups tab in the Streamlit application.
+    
+    Args:
+        data_source: The source of the data ("Batch" or "Individual")
+    """
+    # Tab title
+    st.title("Premium Rollups")
+    
+    # Use the stored cube of a batch rating run if one is configured
+    cube_path = get_rollup_path()
+    sources = [f"{data_source} data"]
+    if cube_path and os.path.isfile(cube_path):
+        sources.append(f"Stored cube ({os.path.basename(cube_path)})")
+    source = st.radio("Cube", sources, horizontal=True, key="rollup_source")
+    
+    try:
+        cube = get_rollup(data_source) if source == sources[0] else load_rollup(cube_path)
+    except Exception as e:
+        st.error(f"Could not load the rollup cube: {str(e)}")
+        return
+    
+    # Early return if no data is available
+    if cube is None or cube.height == 0:
+        st.error("No rated data available to roll up.")
+        return
+    
+    # Group by and filter on any rating factors
+    dimensions = get_cube_dimensions(cube)
+    by = st.multiselect("Group by", dimensions, default=dimensions[:1], key="rollup_group_by")
+    
+    filters = {}
+    with st.expander("Filters"):
+        columns = st.columns(3)
+        for i, dimension in enumerate(dimensions):
+            levels = columns[i % 3].multiselect(dimension, cube[dimension].dtype.categories.to_list(), key=f"rollup_filter_{dimension}")
+            if levels:
+                filters[dimension] = levels
+    
+    start = time.perf_counter()
+    total_df = query_rollup(cube, [], filters)
+    rollup_df = query_rollup(cube, by, filters) if by else None
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    # Totals of the selection
+    total = total_df.row(0, named=True)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Policies", f"{total['policies']:,}")
+    col2.metric("Total premium", f"{total['premium']:,.0f}")
+    col3.metric("Average premium", f"{total['average_premium']:,.2f}" if total['policies'] else "n/a")
+    st.caption(f"Answered from {cube.height:,} cube cells in {elapsed_ms:.1f} ms")
+    
+    # Premium by the selected rating factors
+    if rollup_df is not None:
+        st.dataframe(rollup_df, use_container_width=True, hide_index=True)
+        if len(by) == 1:
+            st.bar_chart(rollup_df.to_pandas(), x=by[0], y="average_premium")
@@ -0,0 +1,173 @@
+"""
+Paginated table view for the Streamlit application.
+
+This module provides a table component for large frames. Filtering, sorting and
+column projection are done lazily in Polars, and only the visible page is sent
+to the browser.
+"""
+
+import streamlit as st
+import polars as pl
+import sys
+import os
+from typing import Any, List, Optional
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Page sizes offered to the user
+PAGE_SIZES = [50, 100, 500, 1000]
+
+# Maximum number of distinct values offered in a categorical filter
+MAX_FILTER_LEVELS = 1000
+
+def build_filter_expression(column: str, value: Any) -> Optional[pl.Expr]:
+    """
+    Build a Polars filter expression for a column.
+    
+    Args:
+        column: Name of the column to filter on
+        value: Either a (min, max) tuple for numeric columns or a list of
+               allowed values for categorical columns
+        
+    Returns:
+        Filter expression or None if the value does not restrict the column
+    """
+    if isinstance(value, tuple):
+        min_val, max_val = value
+        return pl.col(column).is_between(min_val, max_val)
+    
+    if value:
+        return pl.col(column).is_in(list(value))
+    
+    return None
+
+def count_rows(df: pl.DataFrame, filters: Optional[List[pl.Expr]] = None) -> int:
+    """
+    Count the rows of a DataFrame matching a set of filters without materializing them.
+    
+    Args:
+        df: DataFrame to query
+        filters: Filter expressions to apply (combined with AND)
+        
+    Returns:
+        Number of matching rows
+    """
+    lf = df.lazy()
+    for expr in filters or []:
+        lf = lf.filter(expr)
+    return lf.select(pl.len()).collect().item()
+
+def query_page(
+    df: pl.DataFrame,
+    columns: List[str],
+    filters: Optional[List[pl.Expr]] = None,
+    sort_by: Optional[str] = None,
+    descending: bool = False,
+    page: int = 0,
+    page_size: int = 100
+) -> pl.DataFrame:
+    """
+    Filter, sort and slice a DataFrame lazily and collect a single page.
+    
+    Args:
+        df: DataFrame to query
+        columns: Columns to include in the page
+        filters: Filter expressions to apply (combined with AND)
+        sort_by: Column to sort by (default: keep the frame order)
+        descending: Whether to sort in descending order
+        page: Zero-based page number
+        page_size: Number of rows per page
+        
+    Returns:
+        DataFrame containing only the requested page and columns
+    """
+    lf = df.lazy()
+    for expr in filters or []:
+        lf = lf.filter(expr)
+    
+    if sort_by is not None:
+        lf = lf.sort(sort_by, descending=descending, nulls_last=True)
+    
+    return lf.select(columns).slice(page * page_size, page_size).collect()
+
+def _filter_widget(df: pl.DataFrame, column: str, key: str) -> Any:
+    """
+    Show a filter widget suited to the type of a column.
+    
+    Args:
+        df: DataFrame containing the column
+        column: Name of the column to filter on
+        key: Unique key prefix for the widgets
+        
+    Returns:
+        Filter value for build_filter_expression
+    """
+    dtype = df.schema[column]
+    
+    if dtype.is_numeric():
+        stats = df.select(
+            pl.col(column).min().alias("min"),
+            pl.col(column).max().alias("max")
+        ).row(0)
+        if stats[0] is None:
+            return None
+        
+        min_col, max_col = st.columns(2)
+        min_val = min_col.number_input(f"Min {column}", value=float(stats[0]), key=f"{key}_min")
+        max_val = max_col.number_input(f"Max {column}", value=float(stats[1]), key=f"{key}_max")
+        return (min_val, max_val)
+    
+    levels = df.select(pl.col(column).unique().drop_nulls().sort().head(MAX_FILTER_LEVELS)).to_series()
+    return st.multiselect(f"{column} values", levels.to_list(), key=f"{key}_levels")
+
+def show_paginated_dataframe(df: pl.DataFrame, columns: List[str], key: str):
+    """
+    Display a DataFrame one page at a time with server-side filtering and sorting.
+    
+    Args:
+        df: DataFrame to display (typically a cached frame from the data layer)
+        columns: Columns to display
+        key: Unique key prefix for the widgets of this view
+    """
+    with st.expander("Filter and sort"):
+        filter_col, sort_col, order_col = st.columns(3)
+        filter_column = filter_col.selectbox(
+            "Filter column", ["(none)"] + columns, key=f"{key}_filter_column"
+        )
+        sort_by = sort_col.selectbox(
+            "Sort by", ["(none)"] + columns, key=f"{key}_sort_by"
+        )
+        descending = order_col.checkbox("Descending", key=f"{key}_descending")
+        
+        filters = []
+        if filter_column != "(none)":
+            expr = build_filter_expression(
+                filter_column, _filter_widget(df, filter_column, f"{key}_filter")
+            )
+            if expr is not None:
+                filters.append(expr)
+    
+    size_col, page_col = st.columns(2)
+    page_size = size_col.selectbox("Rows per page", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    
+    # Count the matching rows first to bound the page number
+    total_rows = count_rows(df, filters)
+    page_count = max(1, -(-total_rows // page_size))
+    page = page_col.number_input(
+        f"Page (of {page_count})", min_value=1, max_value=page_count, value=1, key=f"{key}_page"
+    )
+    
+    page_df = query_page(
+        df,
+        columns,
+        filters,
+        sort_by=None if sort_by == "(none)" else sort_by,
+        descending=descending,
+        page=page - 1,
+        page_size=page_size
+    )
+    
+    first_row = (page - 1) * page_size
+    st.caption(f"Showing rows {first_row + min(1, page_df.height)}-{first_row + page_df.height} of {total_rows}")
+    st.dataframe(page_df, use_container_width=True, key=f"{key}_table")
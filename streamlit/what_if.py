@@ -0,0 +1,99 @@
+"""
+What-if analysis module for the Streamlit application.
+
+This module lets analysts perturb rating table factors and see the impact on
+the book's premium without editing the rating tables or re-running the pipeline.
+"""
+
+import streamlit as st
+import polars as pl
+import sys
+import os
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.rating.rating_engine import RATING_PLAN, get_rating_key_columns
+from algorithms.rating.scenarios import evaluate_scenarios
+from streamlit.data_layer import get_rating_cells
+
+def parse_percentages(text):
+    """
+    Parse a comma-separated list of percentage changes.
+    
+    Args:
+        text: Text such as "-10, -5, 5, 10"
+        
+    Returns:
+        List of percentage changes as floats (invalid entries are skipped)
+    """
+    percentages = []
+    for part in text.split(","):
+        try:
+            percentages.append(float(part.strip()))
+        except ValueError:
+            continue
+    return percentages
+
+def show_what_if_tab(data_source=None):
+    """
+    Display the what-if analysis tab in the Streamlit application.
+    
+    Args:
+        data_source: The source of the data ("Batch" or "Individual")
+    """
+    # Tab title
+    st.title("What-If Analysis")
+    
+    # Choose the rating table and the factor cells to perturb
+    table_names = [step["table"] for step in RATING_PLAN]
+    table_col, column_col = st.columns(2)
+    table = table_col.selectbox("Rating table", table_names, key="what_if_table")
+    step = RATING_PLAN[table_names.index(table)]
+    condition_column = column_col.selectbox(
+        "Apply to levels of", ["(all levels)"] + step["join_columns"], key="what_if_column"
+    )
+    
+    # Choose how to break down the results
+    by = st.multiselect("Break down by", get_rating_key_columns(), key="what_if_by")
+    
+    # Get the cached rated cells (the book collapsed to its rating cells)
+    cells = get_rating_cells(data_source)
+    
+    # Early return if no data is available
+    if cells is None:
+        st.error("No transformed data available for what-if analysis.")
+        return
+    
+    levels = []
+    if condition_column != "(all levels)":
+        available_levels = cells.select(pl.col(condition_column).unique().drop_nulls().sort()).to_series()
+        levels = st.multiselect("Levels", available_levels.to_list(), key="what_if_levels")
+        
+        # Early return until at least one level is selected
+        if not levels:
+            st.info("Select the levels to perturb.")
+            return
+    
+    percentages = parse_percentages(
+        st.text_input("Factor changes (%)", value="-10, -5, 5, 10", key="what_if_changes")
+    )
+    
+    # Early return if no valid changes are given
+    if not percentages:
+        st.warning("Enter at least one percentage change.")
+        return
+    
+    # Build one scenario per percentage change
+    where = {condition_column: levels} if levels else {}
+    scenarios = [
+        {
+            "name": f"{table} {pct:+g}%",
+            "adjustments": [{"table": table, "where": where, "factor": 1 + pct / 100}],
+        }
+        for pct in percentages
+    ]
+    
+    # Evaluate all scenarios at once and display the impact table
+    impact = evaluate_scenarios(cells, scenarios, by=by)
+    st.dataframe(impact, use_container_width=True, hide_index=True)
@@ -0,0 +1,108 @@
+"""
+Tests for the API's admission control.
+"""
+
+import sys
+import os
+import asyncio
+import pytest
+from starlette.testclient import TestClient
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import api.admission
+from api.admission import AdmissionController, AdmissionRejected, PriorityLimiter, RateLimiter, get_admission_config
+
+QUOTE = {"data": {"IDpol": 1, "Area": "C", "VehPower": 6, "VehAge": 2, "DrivAge": 40}}
+
+def test_token_bucket_refills_at_the_rate(monkeypatch):
+    now = {"value": 100.0}
+    monkeypatch.setattr(api.admission.time, "monotonic", lambda: now["value"])
+    limiter = RateLimiter(rate=2.0, burst=2.0)
+    
+    assert limiter.acquire("client") == 0.0
+    assert limiter.acquire("client") == 0.0
+    assert limiter.acquire("client") == pytest.approx(0.5)
+    assert limiter.acquire("other") == 0.0
+    
+    now["value"] += 0.5
+    assert limiter.acquire("client") == 0.0
+    assert limiter.acquire("client") == pytest.approx(0.5)
+
+def test_waiting_single_quotes_are_served_before_batches():
+    async def scenario():
+        limiter = PriorityLimiter(1, 1, max_queue=10, target_ms=10_000, interval_ms=10_000)
+        served = []
+        
+        async def work(priority, name):
+            await limiter.acquire(priority)
+            served.append(name)
+            await asyncio.sleep(0)
+            limiter.release(priority)
+        
+        await limiter.acquire("single")
+        waiters = [asyncio.ensure_future(work("batch", "batch")), asyncio.ensure_future(work("single", "single"))]
+        await asyncio.sleep(0)
+        limiter.release("single")
+        await asyncio.gather(*waiters)
+        return served
+    
+    assert asyncio.run(scenario()) == ["single", "batch"]
+
+def test_full_or_overloaded_queues_shed_requests():
+    async def scenario():
+        limiter = PriorityLimiter(1, 1, max_queue=1, target_ms=10, interval_ms=100)
+        await limiter.acquire("single")
+        queued = asyncio.ensure_future(limiter.acquire("single"))
+        await asyncio.sleep(0)
+        
+        with pytest.raises(AdmissionRejected) as full:
+            await limiter.acquire("single")
+        
+        limiter.dropping = True
+        with pytest.raises(AdmissionRejected) as overloaded:
+            await limiter.acquire("batch")
+        
+        queued.cancel()
+        return full.value, overloaded.value
+    
+    full, overloaded = asyncio.run(scenario())
+    assert (full.status_code, full.reason) == (503, "Too many queued requests")
+    assert (overloaded.status_code, overloaded.reason) == (503, "Server overloaded")
+    assert overloaded.retry_after == pytest.approx(0.1)
+
+@pytest.fixture
+def quote_api(monkeypatch, tmp_path):
+    """
+    Import the API with its log file in a temporary directory.
+    """
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("logs", exist_ok=True)
+    import api.api
+    return api.api
+
+def test_rate_limited_clients_get_429_with_retry_after(monkeypatch, quote_api):
+    monkeypatch.setenv("PYPRICER_RATE_LIMIT", "0.1")
+    monkeypatch.setenv("PYPRICER_RATE_BURST", "1")
+    admission = AdmissionController(get_admission_config())
+    monkeypatch.setattr(quote_api, "admission", admission)
+    
+    # Spend the client's burst
+    admission.check_rate("key:client")
+    response = TestClient(quote_api.app).post("/quote", json=QUOTE, headers={"X-API-Key": "client"})
+    
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "10"
+
+def test_overloaded_workers_shed_quotes_with_503(monkeypatch, quote_api):
+    admission = AdmissionController(get_admission_config(default_concurrency=1))
+    admission.limiter.in_use["single"] = 1
+    admission.limiter.dropping = True
+    monkeypatch.setattr(quote_api, "admission", admission)
+    
+    response = TestClient(quote_api.app).post("/quote", json=QUOTE)
+    
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert admission.get_stats()["shed"] == 1
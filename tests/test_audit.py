@@ -0,0 +1,25 @@
+"""
+Tests for the audit trail of production quotes.
+"""
+
+import sys
+import os
+import polars as pl
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import api.audit
+from api.audit import AuditSink
+
+def test_records_keep_the_rating_version_they_were_rated_with(monkeypatch, tmp_path):
+    version = {"value": "v1"}
+    monkeypatch.setattr(api.audit, "get_rating_version", lambda max_age=0.0: version["value"])
+    sink = AuditSink(str(tmp_path), max_rows=100, max_seconds=60)
+    
+    sink.record({"IDpol": 1}, {"IDpol": "1", "premium_details": {"final_premium": 100.0}})
+    version["value"] = "v2"
+    sink.close()
+    
+    audited = pl.read_parquet(str(tmp_path / "*.parquet"))
+    assert audited["rating_version"].to_list() == ["v1"]
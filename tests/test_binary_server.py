@@ -0,0 +1,78 @@
+"""
+Tests for the binary pricing server and client.
+"""
+
+import sys
+import os
+import socket
+import threading
+import polars as pl
+import pytest
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import api.binary_server
+from api.binary_server import PricingServer, PricingRequestHandler, BinaryPricingClient, FRAME_HEADER, recv_frame
+
+def _start_server(max_frame_size=None):
+    """
+    Start a pricing server on a free port in a background thread.
+    """
+    server = PricingServer(("127.0.0.1", 0), PricingRequestHandler)
+    if max_frame_size is not None:
+        server.max_frame_size = max_frame_size
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_oversized_frames_close_the_connection():
+    server = _start_server(max_frame_size=1024)
+    try:
+        with socket.create_connection(server.server_address) as sock:
+            sock.sendall(FRAME_HEADER.pack(1024 * 1024))
+            sock.settimeout(10)
+            assert recv_frame(sock) is None
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_pipelined_large_frames_do_not_deadlock(monkeypatch):
+    # Echo the frames back, so responses are as large as requests
+    monkeypatch.setattr(api.binary_server, "rate_frame", lambda df: df)
+    server = _start_server()
+    batch = pl.DataFrame({"IDpol": range(500_000), "value": [1.5] * 500_000})
+    results = []
+    
+    def stream():
+        with BinaryPricingClient(*server.server_address) as client:
+            results.extend(rated.height for rated in client.rate_stream([batch] * 8, window=8))
+    
+    try:
+        thread = threading.Thread(target=stream, daemon=True)
+        thread.start()
+        thread.join(timeout=60)
+        assert not thread.is_alive(), "rate_stream deadlocked"
+        assert results == [batch.height] * 8
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_rejected_quotes_are_reported():
+    quote = {"IDpol": 1, "Area": "C", "VehPower": 6, "VehAge": 2, "DrivAge": 40}
+    server = _start_server()
+    try:
+        with BinaryPricingClient(*server.server_address) as client:
+            rated = client.rate(pl.DataFrame([quote, {**quote, "IDpol": 2, "DrivAge": 1000}, {**quote, "IDpol": 3}]))
+            
+            with pytest.raises(ValueError, match="DrivAge"):
+                client.quote({**quote, "DrivAge": 1000})
+            single = client.quote(quote)
+    finally:
+        server.shutdown()
+        server.server_close()
+    
+    assert rated["IDpol"].to_list() == [1, 3, 2]
+    assert rated["final_premium"].is_null().to_list() == [False, False, True]
+    assert rated["row"].to_list() == [None, None, 1]
+    assert rated["errors"].to_list() == [None, None, ["DrivAge: 1000 is outside [0, 999)"]]
+    assert single["final_premium"] == rated["final_premium"][0]
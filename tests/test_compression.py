@@ -0,0 +1,61 @@
+"""
+Tests for the response compression middleware.
+"""
+
+import sys
+import os
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import api.compression
+from api.compression import CompressionMiddleware
+
+BODY = b"IDpol,final_premium\n" + b"".join(b"%d,%d.25\n" % (i, i % 500) for i in range(20_000))
+
+def _client(threadpool_size):
+    async def whole(request):
+        return Response(BODY)
+    
+    async def stream(request):
+        async def chunks():
+            for start in range(0, len(BODY), 100_000):
+                yield BODY[start:start + 100_000]
+        return StreamingResponse(chunks())
+    
+    app = Starlette(routes=[Route("/whole", whole), Route("/stream", stream)])
+    app.add_middleware(CompressionMiddleware, encodings=["gzip"], threadpool_size=threadpool_size)
+    return TestClient(app)
+
+def test_large_bodies_are_compressed_in_the_thread_pool(monkeypatch):
+    offloaded = []
+    run_in_threadpool = api.compression.run_in_threadpool
+    
+    async def record(func, *args):
+        offloaded.append(len(args[0]))
+        return await run_in_threadpool(func, *args)
+    
+    monkeypatch.setattr(api.compression, "run_in_threadpool", record)
+    client = _client(threadpool_size=64 * 1024)
+    
+    for path in ("/whole", "/stream"):
+        response = client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.content == BODY
+    
+    assert offloaded[0] == len(BODY)
+    assert all(size >= 64 * 1024 for size in offloaded[1:])
+
+def test_small_bodies_are_compressed_on_the_event_loop(monkeypatch):
+    async def fail(func, *args):
+        raise AssertionError("compressed in the thread pool")
+    
+    monkeypatch.setattr(api.compression, "run_in_threadpool", fail)
+    response = _client(threadpool_size=len(BODY) + 1).get("/whole", headers={"Accept-Encoding": "gzip"})
+    
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == BODY
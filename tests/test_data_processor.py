@@ -0,0 +1,68 @@
+"""
+Tests for the pipeline's input column declarations and stage selection.
+"""
+
+import sys
+import os
+import polars as pl
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.pipeline import data_processor, stages
+from algorithms.config import get_primary_id
+from algorithms.rating.rating_engine import rate_policies, get_rating_key_columns
+
+def test_loaders_project_onto_the_pipeline_columns_by_default():
+    columns = data_processor.get_input_columns()
+    
+    assert columns is not None
+    assert {"DrivAge", "VehPower", "VehAge", "Area"} <= set(columns)
+
+def test_undeclared_transform_inputs_read_every_column(monkeypatch):
+    monkeypatch.setattr(data_processor, "TRANSFORM_INPUTS", None)
+    assert data_processor.get_input_columns() is None
+
+def test_declared_transform_inputs_are_projected(monkeypatch):
+    monkeypatch.setattr(data_processor, "TRANSFORM_INPUTS", ["VehAge"])
+    columns = data_processor.get_input_columns()
+    
+    assert columns[0] == get_primary_id()
+    assert "VehAge" in columns
+
+def test_rating_columns_skip_stages_the_rating_plan_does_not_need(monkeypatch):
+    calls = []
+    
+    def unused_stage(df):
+        calls.append("unused")
+        return df.with_columns(pl.lit(1).alias("Unused"))
+    
+    monkeypatch.setattr(data_processor, "TRANSFORM_INPUTS", [])
+    monkeypatch.setattr(stages, "_REGISTERED_STAGES", [{
+        "name": "unused",
+        "func": unused_stage,
+        "inputs": ["VehAge"],
+        "outputs": ["Unused"],
+        "after_builtin": False,
+        "config_key": "unused",
+    }])
+    df = pl.DataFrame({
+        get_primary_id(): [1, 2],
+        "Area": ["A", "B"],
+        "VehPower": [5, 7],
+        "VehAge": [3, 10],
+        "DrivAge": [30, 55],
+        "BonusMalus": [50, 80],
+        "Density": [100, 2000],
+        "VehBrand": ["B1", "B2"],
+        "VehGas": ["Regular", "Diesel"],
+        "Region": ["R11", "R24"],
+    })
+    
+    transformed = data_processor.process_data(df, required_columns=data_processor.get_rating_columns())
+    
+    assert calls == []
+    assert "Unused" not in transformed.columns
+    assert not [column for column in transformed.columns if column.endswith("_Index")]
+    assert set(get_rating_key_columns()) <= set(transformed.columns)
+    assert rate_policies(transformed).height == 2
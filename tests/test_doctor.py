@@ -0,0 +1,24 @@
+"""
+Tests for the startup diagnostics of the command-line tools.
+"""
+
+import sys
+import os
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from py_pricer import doctor
+
+def test_every_command_starts_within_the_budget():
+    # Wall-clock timings depend on the machine and its load, so the budget is a
+    # generous multiple of a bare interpreter's startup here. That still catches a
+    # command importing Polars or FastAPI before parsing its arguments.
+    baseline_ms = doctor.measure_startup("pass")
+    assert doctor.check_startup(budget_ms=max(doctor.DEFAULT_BUDGET_MS, 3 * baseline_ms))
+
+def test_commands_that_fail_to_start_fail_the_check(monkeypatch, capsys):
+    monkeypatch.setattr(doctor, "ENTRY_POINTS", {"pypricer-missing": "py_pricer.missing_command"})
+    
+    assert not doctor.check_startup()
+    assert "FAILED" in capsys.readouterr().out
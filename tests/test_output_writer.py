@@ -0,0 +1,34 @@
+"""
+Tests for the rated dataset writer.
+"""
+
+import sys
+import os
+import polars as pl
+import pytest
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.rating.output_writer import RatedDatasetWriter
+
+def test_failed_overwrite_keeps_the_previous_dataset(monkeypatch, tmp_path):
+    output_dir = str(tmp_path / "rated")
+    with RatedDatasetWriter(output_dir) as writer:
+        writer.write(pl.DataFrame({"IDpol": [1, 2], "final_premium": [100.0, 200.0]}))
+    
+    replace = os.replace
+    
+    def failing_replace(src, dst):
+        if dst == output_dir and not str(src).endswith(".previous"):
+            raise OSError("disk full")
+        replace(src, dst)
+    
+    monkeypatch.setattr(os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        with RatedDatasetWriter(output_dir) as writer:
+            writer.write(pl.DataFrame({"IDpol": [3], "final_premium": [300.0]}))
+    monkeypatch.undo()
+    
+    assert pl.read_parquet(output_dir)["IDpol"].sort().to_list() == [1, 2]
+    assert os.listdir(tmp_path) == ["rated"]
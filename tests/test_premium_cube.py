@@ -0,0 +1,72 @@
+"""
+Tests for the API's precomputed premium cube.
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import api.audit
+import api.utils
+from algorithms.rating import premium_cube
+
+def _patch(monkeypatch, version):
+    """
+    Enable precompute mode with a fake rating version and a counting cube builder.
+    """
+    builds = []
+    
+    def build():
+        time.sleep(0.01)
+        builds.append(version["value"])
+        return {"version": version["value"]}
+    
+    monkeypatch.setitem(api.utils.get_rating_config(), "precompute_cube", True)
+    monkeypatch.setattr(api.audit, "get_rating_version", lambda: version["value"])
+    monkeypatch.setattr(api.utils, "_build_premium_cube", build)
+    monkeypatch.setitem(api.utils._premium_cube, "state", (None, None, 0.0))
+    monkeypatch.setattr(api.utils, "CUBE_VERSION_CHECK_SECONDS", 0.0)
+    return builds
+
+def test_cube_is_rebuilt_when_the_rating_version_changes(monkeypatch):
+    version = {"value": "a"}
+    builds = _patch(monkeypatch, version)
+    
+    assert api.utils.get_premium_cube() == {"version": "a"}
+    assert api.utils.get_premium_cube() == {"version": "a"}
+    
+    version["value"] = "b"
+    assert api.utils.get_premium_cube() == {"version": "b"}
+    assert builds == ["a", "b"]
+
+def test_cube_is_built_once_by_concurrent_requests(monkeypatch):
+    builds = _patch(monkeypatch, {"value": "a"})
+    
+    threads = [threading.Thread(target=api.utils.get_premium_cube) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert builds == ["a"]
+
+def test_cube_is_disabled_without_precompute_mode(monkeypatch):
+    builds = _patch(monkeypatch, {"value": "a"})
+    monkeypatch.setitem(api.utils.get_rating_config(), "precompute_cube", False)
+    
+    assert api.utils.get_premium_cube() is None
+    assert builds == []
+
+def test_cube_is_disabled_when_the_transform_hook_may_change_rating_inputs(monkeypatch):
+    monkeypatch.setattr(premium_cube, "TRANSFORM_INPUTS", None)
+    assert premium_cube.find_bypassed_stages() == ["additional_transforms"]
+    
+    monkeypatch.setattr(premium_cube, "TRANSFORM_INPUTS", ["DrivAge"])
+    assert premium_cube.find_bypassed_stages() == ["additional_transforms"]
+    
+    monkeypatch.setattr(premium_cube, "TRANSFORM_INPUTS", ["Region"])
+    assert premium_cube.find_bypassed_stages() == []
@@ -0,0 +1,93 @@
+"""
+Tests for the sampling profiler and the admin profiling endpoint.
+"""
+
+import sys
+import os
+import json
+import threading
+import pytest
+from starlette.testclient import TestClient
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.pipeline.profiling import SamplingProfiler
+
+def _busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+def _profile_busy_thread():
+    """
+    Profile a thread spinning in _busy_loop for a short while.
+    """
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_loop, args=(stop,), name="busy")
+    with SamplingProfiler(interval=0.001) as profiler:
+        worker.start()
+        while profiler.samples < 20:
+            stop.wait(0.01)
+    stop.set()
+    worker.join()
+    return profiler
+
+def test_folded_stacks_name_the_thread_and_its_frames():
+    lines = _profile_busy_thread().to_folded().splitlines()
+    busy = [line for line in lines if line.startswith("busy;")]
+    
+    assert busy
+    stack, count = busy[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert "_busy_loop (" in stack.split(";")[-1]
+
+def test_speedscope_profile_references_shared_frames():
+    profiler = _profile_busy_thread()
+    profile = json.loads(profiler.render("speedscope"))
+    frames = profile["shared"]["frames"]
+    busy = next(thread for thread in profile["profiles"] if thread["name"] == "busy")
+    
+    assert busy["type"] == "sampled"
+    assert len(busy["samples"]) == len(busy["weights"])
+    assert all(0 <= index < len(frames) for sample in busy["samples"] for index in sample)
+    assert any(frames[sample[-1]]["name"] == "_busy_loop" for sample in busy["samples"])
+    
+    with pytest.raises(ValueError):
+        profiler.render("pstats")
+
+@pytest.fixture
+def admin_api(monkeypatch, tmp_path):
+    """
+    Import the API with its log file in a temporary directory.
+    """
+    monkeypatch.chdir(tmp_path)
+    os.makedirs("logs", exist_ok=True)
+    import api.api
+    return api.api
+
+def test_profile_endpoint_is_hidden_without_an_admin_token(monkeypatch, admin_api):
+    monkeypatch.delenv(admin_api.ADMIN_TOKEN_ENV, raising=False)
+    response = TestClient(admin_api.app).post("/admin/profile?seconds=0.01", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 404
+
+def test_profile_endpoint_rejects_a_wrong_token(monkeypatch, admin_api):
+    monkeypatch.setenv(admin_api.ADMIN_TOKEN_ENV, "secret")
+    response = TestClient(admin_api.app).post("/admin/profile?seconds=0.01", headers={"X-Admin-Token": "guess"})
+    assert response.status_code == 403
+
+def test_profile_endpoint_records_one_profile_at_a_time(monkeypatch, admin_api):
+    monkeypatch.setenv(admin_api.ADMIN_TOKEN_ENV, "secret")
+    client = TestClient(admin_api.app)
+    
+    response = client.post("/admin/profile?seconds=0.05&format=folded", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "attachment" in response.headers["content-disposition"]
+    
+    class HeldLock:
+        def locked(self):
+            return True
+    
+    monkeypatch.setattr(admin_api, "profile_lock", HeldLock())
+    response = client.post("/admin/profile?seconds=0.01", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 409
@@ -0,0 +1,44 @@
+"""
+Tests for incremental re-rating after rating table changes.
+"""
+
+import sys
+import os
+import shutil
+import polars as pl
+from polars.testing import assert_frame_equal
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.config import get_primary_id
+from algorithms.pipeline.data_processor import process_data
+from algorithms.pipeline.synthetic import generate_portfolio
+from algorithms.rating.rating_engine import rate_policies, rerate_policies
+from algorithms.rating.utils.table_loader import get_rating_table_hashes, find_changed_tables
+
+TABLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'algorithms', 'rating', 'tables'))
+
+def test_rerating_one_changed_table_matches_a_full_rating(monkeypatch, tmp_path):
+    # The rating engine reads algorithms/rating/tables from the working directory
+    tables_dir = tmp_path / "algorithms" / "rating" / "tables"
+    shutil.copytree(TABLES_DIR, tables_dir)
+    monkeypatch.chdir(tmp_path)
+    
+    transformed = process_data(generate_portfolio(2000, seed=5))
+    rated = rate_policies(transformed)
+    hashes = get_rating_table_hashes(str(tables_dir))
+    
+    # Change one table
+    table = pl.read_csv(tables_dir / "VehAge_rating.csv")
+    table.with_columns(pl.col("VehAge_rating") * 1.2).write_csv(tables_dir / "VehAge_rating.csv")
+    
+    changed = find_changed_tables(hashes, get_rating_table_hashes(str(tables_dir)))
+    assert changed == ["VehAge_rating"]
+    
+    primary_id = get_primary_id()
+    rerated = rerate_policies(rated, changed, str(tables_dir)).sort(primary_id)
+    expected = rate_policies(transformed).select(rated.columns).sort(primary_id)
+    
+    assert not rerated["final_premium"].equals(rated.sort(primary_id)["final_premium"])
+    assert_frame_equal(rerated, expected)
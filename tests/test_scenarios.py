@@ -0,0 +1,69 @@
+"""
+Tests for the what-if scenario engine.
+"""
+
+import sys
+import os
+import shutil
+import polars as pl
+import pytest
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.pipeline.data_processor import process_data
+from algorithms.pipeline.synthetic import generate_portfolio
+from algorithms.rating.rating_engine import rate_policies
+from algorithms.rating.scenarios import build_rating_cells, evaluate_scenarios
+
+TABLES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'algorithms', 'rating', 'tables'))
+
+SCENARIO = {
+    "name": "Under25 +10%",
+    "adjustments": [
+        {"table": "VehPower_x_DrivAge", "where": {"DrivAgeBand": ["Under25"]}, "factor": 1.1},
+        {"table": "Area", "factor": 0.95},
+    ],
+}
+
+def _copy_tables(tmp_path):
+    """
+    Copy the rating tables to where the rating engine looks for them when run in tmp_path.
+    """
+    tables_dir = tmp_path / "algorithms" / "rating" / "tables"
+    shutil.copytree(TABLES_DIR, tables_dir)
+    return tables_dir
+
+def _adjust_table(tables_dir, table, factor_column, factor, where=None):
+    """
+    Multiply the factor column of a rating table file, for the rows matching where.
+    """
+    path = tables_dir / f"{table}.csv"
+    df = pl.read_csv(path)
+    condition = pl.lit(True)
+    for column, levels in (where or {}).items():
+        condition = condition & pl.col(column).is_in(levels)
+    df.with_columns(pl.when(condition).then(pl.col(factor_column) * factor).otherwise(pl.col(factor_column)).alias(factor_column)).write_csv(path)
+
+def test_scenarios_match_a_full_re_rate(monkeypatch, tmp_path):
+    transformed = process_data(generate_portfolio(2000, seed=3))
+    impact = evaluate_scenarios(build_rating_cells(transformed, by=["Area"]), [SCENARIO], by=["Area"])
+    assert (impact["premium_change"] != 0).all()
+    
+    # Re-rate the whole book with the adjusted tables
+    tables_dir = _copy_tables(tmp_path)
+    _adjust_table(tables_dir, "VehPower_x_DrivAge", "VehPower_x_DrivAge_rating", 1.1, {"DrivAgeBand": ["Under25"]})
+    _adjust_table(tables_dir, "Area", "Area_base", 0.95)
+    monkeypatch.chdir(tmp_path)
+    expected = rate_policies(transformed, by_cell=True).group_by("Area").agg(pl.col("final_premium").sum())
+    
+    joined = impact.join(expected, on="Area")
+    assert joined.height == expected.height
+    assert joined["scenario_premium"].to_list() == pytest.approx(joined["final_premium"].to_list())
+
+def test_no_scenarios_give_an_empty_impact_table():
+    cells = build_rating_cells(process_data(generate_portfolio(100, seed=1)))
+    impact = evaluate_scenarios(cells, [])
+    
+    assert impact.height == 0
+    assert impact.columns == ["scenario", "policies", "base_premium", "scenario_premium", "premium_change", "pct_change"]
@@ -0,0 +1,59 @@
+"""
+Tests for single-flight execution of identical concurrent requests.
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.single_flight import SingleFlight, canonical_key
+
+def test_identical_calls_share_one_computation():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+        
+        async def price(quote):
+            calls.append(quote)
+            await release.wait()
+            return {"final_premium": 100.0}
+        
+        key = canonical_key({"IDpol": 1, "Area": "C"})
+        callers = [asyncio.ensure_future(flight.run(key, price, "quote")) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*callers)
+        return calls, results, flight.get_stats()
+    
+    calls, results, stats = asyncio.run(scenario())
+    
+    assert calls == ["quote"]
+    assert results == [{"final_premium": 100.0}] * 5
+    assert stats == {"calls": 5, "executed": 1, "collapsed": 4, "in_flight": 0}
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        
+        async def price():
+            await release.wait()
+            return 42
+        
+        first = asyncio.ensure_future(flight.run("key", price))
+        second = asyncio.ensure_future(flight.run("key", price))
+        await asyncio.sleep(0)
+        
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return first.cancelled(), await second
+    
+    assert asyncio.run(scenario()) == (True, 42)
+
+def test_keys_ignore_field_order():
+    assert canonical_key({"IDpol": 1, "Area": "C"}) == canonical_key({"Area": "C", "IDpol": 1})
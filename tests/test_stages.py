@@ -0,0 +1,70 @@
+"""
+Tests for the transform stage registry and the stage output cache.
+"""
+
+import sys
+import os
+import polars as pl
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.pipeline import stages as stage_registry
+from algorithms.pipeline.stages import clear_stage_cache, run_stages
+
+def _stage(name, func, inputs, outputs):
+    """
+    Build a stage dictionary for a test.
+    """
+    return {"name": name, "func": func, "inputs": inputs, "outputs": outputs, "config_key": name}
+
+def test_cache_hit_keeps_the_current_frame():
+    clear_stage_cache()
+    stages = [_stage("double", lambda df: df.with_columns((pl.col("x") * 2).alias("y")), ["x"], ["y"])]
+    
+    # Same inputs, different other columns
+    first = pl.DataFrame({"x": [1, 2, 3], "name": ["a", "b", "c"]})
+    second = pl.DataFrame({"x": [1, 2, 3], "name": ["d", "e", "f"]})
+    
+    run_stages(first, stages, use_cache=True)
+    result = run_stages(second, stages, use_cache=True)
+    
+    assert result["name"].to_list() == ["d", "e", "f"]
+    assert result["y"].to_list() == [2, 4, 6]
+
+def test_stages_with_unknown_outputs_are_not_cached():
+    clear_stage_cache()
+    calls = []
+    
+    def rename(df):
+        calls.append(df.height)
+        return df.with_columns(pl.col("name").str.to_uppercase())
+    
+    stages = [_stage("rename", rename, ["x"], None)]
+    first = pl.DataFrame({"x": [1, 2], "name": ["a", "b"]})
+    second = pl.DataFrame({"x": [1, 2], "name": ["c", "d"]})
+    
+    run_stages(first, stages, use_cache=True)
+    result = run_stages(second, stages, use_cache=True)
+    
+    assert len(calls) == 2
+    assert result["name"].to_list() == ["C", "D"]
+
+def test_cache_miss_on_changed_inputs():
+    clear_stage_cache()
+    stages = [_stage("double", lambda df: df.with_columns((pl.col("x") * 2).alias("y")), ["x"], ["y"])]
+    
+    run_stages(pl.DataFrame({"x": [1, 2]}), stages, use_cache=True)
+    result = run_stages(pl.DataFrame({"x": [5, 6]}), stages, use_cache=True)
+    
+    assert result["y"].to_list() == [10, 12]
+
+def test_cache_is_bounded_by_memory(monkeypatch):
+    clear_stage_cache()
+    monkeypatch.setattr(stage_registry, "STAGE_CACHE_MAX_BYTES", 1000)
+    stages = [_stage("double", lambda df: df.with_columns((pl.col("x") * 2).alias("y")), ["x"], ["y"])]
+    
+    for start in range(3):
+        run_stages(pl.DataFrame({"x": list(range(start, start + 100))}), stages, use_cache=True)
+    
+    assert len(stage_registry._STAGE_CACHE) == 1
@@ -0,0 +1,64 @@
+"""
+Tests for the pipeline utility functions.
+"""
+
+import sys
+import os
+import copy
+import threading
+import polars as pl
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.pipeline import utils
+from algorithms.pipeline.utils import apply_category_mapping, count_unknown_levels, get_category_expressions
+
+CATEGORY_CONFIG = {"Area": {"A": 1, "B": 2}, "Region": {"Centre": 1}}
+
+def test_unknown_levels_map_to_null_and_are_counted():
+    df = apply_category_mapping(pl.DataFrame({
+        "Area": ["A", "Z", None, "B"],
+        "Region": ["Paris", "Centre", "Nord", None],
+    }), CATEGORY_CONFIG)
+    
+    assert df["Area_Index"].to_list() == [1, None, None, 2]
+    assert df["Region_Index"].to_list() == [None, 1, None, None]
+    assert count_unknown_levels(df, ["Area", "Region"]) == {"Area": 1, "Region": 2}
+
+def test_expression_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(utils, "EXPRESSION_CACHE_SIZE", 4)
+    utils.clear_expression_cache()
+    
+    for i in range(10):
+        get_category_expressions({"Area": {"A": i}})
+    
+    assert len(utils._EXPRESSION_CACHE) == 4
+    assert list(utils._EXPRESSION_CACHE)[-1] == ("category", utils.config_hash({"Area": {"A": 9}}))
+
+def test_expression_cache_is_thread_safe(monkeypatch):
+    monkeypatch.setattr(utils, "EXPRESSION_CACHE_SIZE", 4)
+    utils.clear_expression_cache()
+    errors = []
+    
+    def compile_many():
+        try:
+            for i in range(500):
+                get_category_expressions({"Area": {"A": i % 10}})
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=compile_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert errors == []
+    assert len(utils._EXPRESSION_CACHE) == 4
+
+def test_loaded_configurations_hash_by_content():
+    category_config, banding_config = utils.load_transformation_configs()
+    
+    assert utils.config_hash(category_config) == utils.config_hash(copy.deepcopy(category_config))
+    assert utils.config_hash(banding_config) == utils.config_hash(copy.deepcopy(banding_config))
@@ -0,0 +1,54 @@
+"""
+Tests for quote validation against the quote schema.
+"""
+
+import sys
+import os
+import polars as pl
+
+# Add the project root to the Python path if not already there
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algorithms.pipeline.validation import get_quote_schema, split_valid_quotes
+
+QUOTE = {"IDpol": 1, "DrivAge": 45, "VehPower": 6, "VehAge": 2, "Area": "B"}
+
+def test_only_rating_plan_columns_are_required():
+    required = {column for column, spec in get_quote_schema().items() if spec["required"]}
+    assert required == {"DrivAge", "VehPower", "VehAge", "Area"}
+
+def test_unknown_levels_are_accepted():
+    valid, invalid = split_valid_quotes(pl.DataFrame([{**QUOTE, "Region": "Paris", "VehGas": "Hydrogen"}]))
+    assert invalid.height == 0
+    assert valid.height == 1
+
+def test_types_ranges_and_required_columns_are_checked():
+    quotes = pl.DataFrame([
+        QUOTE,
+        {**QUOTE, "DrivAge": 1000},
+        {**QUOTE, "Area": None},
+        {**QUOTE, "VehAge": "new"},
+    ], infer_schema_length=None)
+    
+    valid, invalid = split_valid_quotes(quotes)
+    
+    assert valid.height == 1
+    assert invalid["row"].to_list() == [1, 2, 3]
+    assert invalid["errors"].to_list() == [
+        ["DrivAge: 1000 is outside [0, 999)"],
+        ["Area: field required"],
+        ["VehAge: new is not a number"],
+    ]
+
+def test_columns_read_as_strings_keep_their_integer_type():
+    quotes = pl.DataFrame([
+        {**QUOTE, "DrivAge": "45"},
+        {**QUOTE, "DrivAge": "old"},
+        {**QUOTE, "DrivAge": "54", "VehPower": "6.5"},
+    ])
+    
+    valid, _ = split_valid_quotes(quotes)
+    
+    assert valid.schema["DrivAge"] == pl.Int64
+    assert valid["DrivAge"].to_list() == [45, 54]
+    assert valid.schema["VehPower"] == pl.Float64